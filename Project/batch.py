@@ -0,0 +1,195 @@
+# Resolución por lotes sin interfaz gráfica
+# Lee trabajos (ver jobs.py) en JSONL o CSV desde un archivo o stdin, los reparte en
+# lotes entre procesos y escribe un resultado JSON por línea a medida que terminan.
+#
+#   python batch.py boards.jsonl --workers 8 > results.jsonl
+#   cat boards.csv | python batch.py --format csv --ordered --algorithm ida_star --heuristic pdb
+#
+# CSV: columnas id, board (fichas separadas por espacios, fila a fila), goal, algorithm,
+# heuristic; para laberintos, maze (filas de 0/1 separadas por "/"), start y goal ("fila columna").
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from jobs import solve_chunk
+
+
+def _square(values):
+    size = int(round(len(values) ** 0.5))
+    if size * size != len(values):
+        raise ValueError(f"El tablero no es cuadrado: {len(values)} fichas")
+    return [values[row * size:(row + 1) * size] for row in range(size)]
+
+
+def _tiles(text):
+    return _square([int(value) for value in text.replace(",", " ").split()])
+
+
+def _cell(text):
+    row, col = text.replace(",", " ").split()
+    return [int(row), int(col)]
+
+
+def job_from_csv(row):
+    job = {}
+    if row.get("maze"):
+        job["maze"] = [[int(cell) for cell in line.strip()] for line in row["maze"].split("/")]
+        job["start"] = _cell(row["start"])
+        job["goal"] = _cell(row["goal"])
+    else:
+        job["board"] = _tiles(row["board"])
+        if row.get("goal"):
+            job["goal"] = _tiles(row["goal"])
+    for field in ("id", "algorithm", "heuristic"):
+        if row.get(field):
+            job[field] = row[field]
+    return job
+
+
+def parse_rows(stream, fmt):
+    # (número de línea, trabajo, error) por entrada: una línea mal formada da su error
+    # en lugar de cortar el lote
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield reader.line_num, None, f"{type(e).__name__}: {e}"
+                continue
+            try:
+                yield reader.line_num, job_from_csv(row), None
+            except Exception as e:
+                yield reader.line_num, None, f"{type(e).__name__}: {e}"
+    else:
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"{type(e).__name__}: {e}"
+                continue
+            if isinstance(job, dict):
+                yield line_number, job, None
+            else:
+                yield line_number, None, f"El trabajo no es un objeto JSON: {line.strip()[:80]}"
+
+
+def read_jobs(stream, fmt, algorithm=None, heuristic=None):
+    # Genera los trabajos de uno en uno; sin id se usa el número de trabajo. Las líneas
+    # que no se pueden leer llegan como {"id": número de línea, "error": ...} y
+    # jobs.solve_job las devuelve tal cual, en su sitio con --ordered.
+    for number, (line_number, job, error) in enumerate(parse_rows(stream, fmt)):
+        if error is not None:
+            yield {"id": line_number, "error": f"Línea {line_number}: {error}"}
+            continue
+        job.setdefault("id", number)
+        if algorithm and "algorithm" not in job:
+            job["algorithm"] = algorithm
+        if heuristic and "heuristic" not in job:
+            job["heuristic"] = heuristic
+        yield job
+
+
+def chunked(jobs, chunk_size):
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(jobs, emit, workers=None, chunk_size=16, max_in_flight=None, ordered=False):
+    # Como mucho max_in_flight lotes enviados y sin escribir (incluye los que esperan
+    # turno con ordered), así que la memoria no crece con el tamaño de la entrada
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    chunks = chunked(jobs, chunk_size)
+    pending = {}     # futuro -> número de lote
+    finished = {}    # número de lote -> resultados que esperan su turno (ordered)
+    next_chunk = 0
+    submitted = 0
+    exhausted = False
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while not exhausted and len(pending) + len(finished) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[executor.submit(solve_chunk, chunk)] = submitted
+                submitted += 1
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                number = pending.pop(future)
+                if ordered:
+                    finished[number] = future.result()
+                else:
+                    for result in future.result():
+                        emit(result)
+            while next_chunk in finished:
+                for result in finished.pop(next_chunk):
+                    emit(result)
+                next_chunk += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve puzzles y laberintos por lotes")
+    parser.add_argument("input", nargs="?", default="-", help="archivo JSONL/CSV (por defecto stdin)")
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="formato de entrada (por defecto según la extensión, o jsonl)")
+    parser.add_argument("--output", default="-", help="archivo de resultados JSONL (por defecto stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="trabajos por lote")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="lotes en curso como máximo (por defecto 4 por proceso)")
+    parser.add_argument("--ordered", action="store_true", help="escribir en el orden de entrada")
+    parser.add_argument("--algorithm", help="algoritmo para los trabajos que no lo indican")
+    parser.add_argument("--heuristic", help="heurística para los trabajos que no la indican")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.endswith(".csv") else "jsonl")
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    counts = {"jobs": 0, "solved": 0, "errors": 0}
+
+    def emit(result):
+        counts["jobs"] += 1
+        if "error" in result:
+            counts["errors"] += 1
+        elif result["solved"]:
+            counts["solved"] += 1
+        target.write(json.dumps(result) + "\n")
+
+    start_time = time.perf_counter()
+    try:
+        run_batch(read_jobs(source, fmt, args.algorithm, args.heuristic), emit,
+                  args.workers, args.chunk_size, args.max_in_flight, args.ordered)
+    finally:
+        target.flush()
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"{counts['jobs']} trabajos ({counts['solved']} resueltos, {counts['errors']} con error) "
+          f"en {elapsed:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+# Benchmarks reproducibles de los algoritmos del puzzle y del laberinto
+# Ejecuta cada par algoritmo/heurística del registro (registry.py) sobre conjuntos fijos
+# de instancias, con calentamiento y repeticiones, y guarda los resultados en JSON. El modo diff
+# compara dos ejecuciones y marca las caídas de nodos/s y las subidas de memoria.
+#
+#   python benchmark.py run --output base.json
+#   python benchmark.py run --sets puzzle8 maze --algorithms a_star ida_star --output new.json
+#   python benchmark.py diff base.json new.json --threshold 0.1
+#   python benchmark.py run --sets depths8 depths15 --algorithms a_star bidirectional_a_star \
+#       --heuristics manhattan --output mm.json && python benchmark.py summary mm.json
+#
+# Conjuntos (los tres primeros se ejecutan por defecto):
+#   puzzle8   un 8-puzzle por cada distancia 0..31 al objetivo (de la tabla de distancias)
+#   korf      instancias del 15-puzzle de Korf (1985), cortadas por el límite de nodos
+#   maze      laberintos generados con semilla, de tamaño creciente
+#   depths8   varios 8-puzzles con semilla a cada distancia par 16..30
+#   depths15  varios 15-puzzles con semilla a distancia 8..16
+# summary promedia los nodos expandidos por distancia: así se ve, por ejemplo, que MM
+# (bidirectional_a_star) solo expande menos que A* en las instancias profundas.
+# Todas las búsquedas llevan un límite de nodos (--max-nodes) para acotar el tiempo; una
+# búsqueda que lo agota cuenta igual para los nodos/s y su resultado lleva "stopped".
+# heuristic_time sale de una pasada aparte con la heurística medida (utils.MeteredHeuristic).
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+import tracemalloc
+from jobs import solve_puzzle, solve_maze
+from registry import PUZZLE, MAZE, solver_pairs
+from utils import SearchBudget
+
+FORMAT_VERSION = 1
+
+# Primeras instancias de Korf (1985) y su solución óptima. Usan el objetivo con el
+# blanco arriba a la izquierda (0 1 2 ... 15); korf_board las pasa al objetivo estándar.
+KORF_INSTANCES = (
+    ((14, 13, 15, 7, 11, 12, 9, 5, 6, 0, 2, 1, 4, 8, 10, 3), 57),
+    ((13, 5, 4, 10, 9, 12, 8, 14, 2, 3, 7, 1, 0, 15, 11, 6), 55),
+    ((14, 7, 8, 2, 13, 11, 10, 4, 9, 12, 5, 0, 3, 6, 1, 15), 59),
+    ((5, 12, 10, 7, 15, 11, 14, 0, 8, 2, 1, 13, 3, 4, 9, 6), 56),
+    ((4, 7, 14, 13, 10, 3, 9, 12, 11, 5, 6, 15, 1, 2, 8, 0), 56),
+    ((14, 7, 1, 9, 12, 3, 6, 15, 8, 11, 2, 5, 10, 0, 4, 13), 52),
+    ((2, 11, 15, 5, 13, 4, 6, 7, 12, 8, 10, 1, 9, 3, 14, 0), 52),
+    ((12, 11, 15, 3, 8, 0, 4, 2, 6, 13, 9, 5, 14, 1, 10, 7), 50),
+    ((3, 14, 9, 11, 5, 4, 8, 2, 13, 12, 6, 7, 10, 1, 15, 0), 46),
+    ((13, 11, 8, 9, 0, 15, 7, 10, 4, 3, 6, 14, 5, 12, 2, 1), 59),
+)
+
+MAZE_SIZES = (21, 41, 81, 161)
+MAZE_SEED = 2024
+SETS = ("puzzle8", "korf", "maze")
+
+# Distancias y tableros por distancia de los conjuntos depths8 y depths15
+DEPTHS = {3: range(16, 31, 2), 4: range(8, 17, 2)}
+DEPTH_BOARDS = 10
+DEPTH_SEED = 2024
+
+
+def korf_board(tiles):
+    # Girar 180° y renombrar cada ficha t como 16 - t lleva el objetivo de Korf al
+    # estándar (blanco abajo a la derecha) sin cambiar la longitud de las soluciones
+    cells = len(tiles)
+    size = int(round(cells ** 0.5))
+    flipped = [cells - tile if tile else 0 for tile in reversed(tiles)]
+    return [flipped[row * size:(row + 1) * size] for row in range(size)]
+
+
+def puzzle8_instances():
+    # El primer estado (por ranking) a cada distancia del objetivo estándar
+    from puzzle.state import PuzzleState, goal_board, unpack_board
+    from puzzle.distance_table import DistanceTable, HEADER
+    from puzzle.ranking import unrank
+
+    table = DistanceTable(PuzzleState(goal_board(3)))
+    try:
+        depth = 0
+        while True:
+            offset = table.data.find(bytes([depth]), HEADER.size)
+            if offset < 0:
+                break
+            packed, _ = unrank(offset - HEADER.size, table.goal_parity)
+            yield {"id": "puzzle8-d%02d" % depth, "optimal": depth, "board": unpack_board(packed)}
+            depth += 1
+    finally:
+        table.close()
+
+
+def depth_instances(size):
+    # DEPTH_BOARDS tableros con semilla a cada distancia de DEPTHS[size] (puzzle/generator.py)
+    from puzzle.generator import BoardGenerator
+
+    generator = BoardGenerator(size, DEPTH_SEED)
+    try:
+        for depth in DEPTHS[size]:
+            for number in range(1, DEPTH_BOARDS + 1):
+                yield {"id": "depths%d-d%02d-%02d" % (size * size - 1, depth, number), "optimal": depth,
+                       "board": generator.at_depth(depth)}
+    finally:
+        generator.close()
+
+
+def korf_instances():
+    for number, (tiles, optimal) in enumerate(KORF_INSTANCES, 1):
+        yield {"id": "korf-%03d" % number, "optimal": optimal, "board": korf_board(tiles)}
+
+
+def generate_maze(size, seed):
+    # Laberinto perfecto por backtracking en las celdas pares, más un 5 % de paredes
+    # derribadas para que haya ciclos y caminos alternativos (0 = camino, 1 = pared)
+    rng = random.Random(seed)
+    maze = [[1] * size for _ in range(size)]
+    maze[0][0] = 0
+    stack = [(0, 0)]
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc, row + dr // 2, col + dc // 2)
+                   for dr, dc in ((-2, 0), (2, 0), (0, -2), (0, 2))
+                   if 0 <= row + dr < size and 0 <= col + dc < size and maze[row + dr][col + dc]]
+        if not options:
+            stack.pop()
+            continue
+        new_row, new_col, wall_row, wall_col = rng.choice(options)
+        maze[wall_row][wall_col] = maze[new_row][new_col] = 0
+        stack.append((new_row, new_col))
+    walls = [(row, col) for row in range(size) for col in range(size) if maze[row][col]]
+    for row, col in rng.sample(walls, len(walls) // 20):
+        maze[row][col] = 0
+    return maze
+
+
+def maze_instances():
+    for size in MAZE_SIZES:
+        yield {"id": "maze-%03d" % size, "optimal": None, "maze": generate_maze(size, MAZE_SEED + size),
+               "start": [0, 0], "goal": [size - 1, size - 1]}
+
+
+INSTANCE_SETS = {
+    "puzzle8": puzzle8_instances,
+    "korf": korf_instances,
+    "maze": maze_instances,
+    "depths8": lambda: depth_instances(3),
+    "depths15": lambda: depth_instances(4),
+}
+
+
+def run_once(job, max_nodes):
+    solver = solve_maze if "maze" in job else solve_puzzle
+    stats, _ = solver(job, SearchBudget(max_nodes=max_nodes))
+    return stats
+
+
+def bench(instance, algorithm, heuristic, warmup=1, repeat=3, max_nodes=200000, memory=True, metered=True):
+    job = {key: value for key, value in instance.items() if key not in ("id", "optimal")}
+    job.update(algorithm=algorithm, cache=False)
+    if heuristic is not None:
+        job["heuristic"] = heuristic
+    result = {"instance": instance["id"], "algorithm": algorithm, "heuristic": heuristic,
+              "optimal": instance["optimal"]}
+    try:
+        # El calentamiento también abre tablas (PDB, distancias) y llena cachés de Python
+        for _ in range(warmup):
+            run_once(job, max_nodes)
+        runs = [run_once(job, max_nodes) for _ in range(max(1, repeat))]
+        peak_memory = None
+        if memory:
+            # Pasada aparte: tracemalloc frena la búsqueda y no debe contar en los tiempos
+            tracemalloc.start()
+            try:
+                peak_memory = run_once(job, max_nodes).peak_memory
+            finally:
+                tracemalloc.stop()
+        heuristic_time = None
+        if metered and heuristic is not None:
+            # Otra pasada: medir cada llamada a la heurística también frena la búsqueda
+            heuristic_time = run_once(dict(job, metered=True), max_nodes).heuristic_time
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    # nodos/s con la mejor repetición: el ruido de la máquina solo alarga los tiempos
+    stats = runs[-1]
+    wall_time_min = min(run.wall_time for run in runs)
+    result.update(
+        solved=stats.path is not None,
+        steps=len(stats.path) - 1 if stats.path else None,
+        stopped=stats.stopped,
+        nodes_expanded=stats.nodes_expanded,
+        nodes_generated=stats.nodes_generated,
+        peak_open=stats.peak_open,
+        peak_closed=stats.peak_closed,
+        wall_time=statistics.median(run.wall_time for run in runs),
+        wall_time_min=wall_time_min,
+        cpu_time=statistics.median(run.cpu_time for run in runs),
+        nodes_per_second=stats.nodes_expanded / wall_time_min if wall_time_min > 0 else None,
+        peak_memory=peak_memory,
+        heuristic_time=heuristic_time,
+    )
+    return result
+
+
+def run_suite(sets=SETS, algorithms=None, heuristics=None, limit=None, warmup=1, repeat=3,
+              max_nodes=200000, memory=True, log=None, metered=True):
+    results = []
+    for name in sets:
+        for number, instance in enumerate(INSTANCE_SETS[name]()):
+            if limit is not None and number >= limit:
+                break
+            kind = MAZE if "maze" in instance else PUZZLE
+            size = len(instance["board"]) if kind == PUZZLE else None
+            for solver, heuristic in solver_pairs(kind, algorithms, heuristics, size):
+                result = bench(instance, solver.name, heuristic and heuristic.name, warmup, repeat,
+                               max_nodes, memory, metered)
+                result["set"] = name
+                results.append(result)
+                if log is not None:
+                    log(result)
+    return results
+
+
+def result_key(result):
+    return (result["set"], result["instance"], result["algorithm"], result["heuristic"] or "")
+
+
+def diff_runs(old, new, threshold=0.1, min_time=0.01, min_memory=65536):
+    # Compara dos ejecuciones por (conjunto, instancia, algoritmo, heurística).
+    # Devuelve (regresiones, cambios): listas de (clave, motivo). Los nodos/s solo se
+    # comparan si ambas búsquedas duran al menos min_time, porque por debajo domina el ruido.
+    old_results = {result_key(result): result for result in old["results"]}
+    regressions, changes = [], []
+    for result in new["results"]:
+        key = result_key(result)
+        before = old_results.get(key)
+        if before is None:
+            changes.append((key, "nueva"))
+            continue
+        if "error" in result or "error" in before:
+            if "error" in result and "error" not in before:
+                regressions.append((key, f"error: {result['error']}"))
+            continue
+        if before["solved"] and not result["solved"]:
+            regressions.append((key, f"ya no se resuelve ({result['stopped']})"))
+        elif before["steps"] != result["steps"]:
+            changes.append((key, f"pasos {before['steps']} -> {result['steps']}"))
+        if before["nodes_expanded"] != result["nodes_expanded"]:
+            changes.append((key, f"nodos {before['nodes_expanded']} -> {result['nodes_expanded']}"))
+        if (before["wall_time_min"] >= min_time and result["wall_time_min"] >= min_time and
+                before["nodes_per_second"] and result["nodes_per_second"]):
+            ratio = result["nodes_per_second"] / before["nodes_per_second"]
+            if ratio < 1 - threshold:
+                regressions.append((key, f"nodos/s {before['nodes_per_second']:.0f} -> "
+                                         f"{result['nodes_per_second']:.0f} ({ratio - 1:+.0%})"))
+        if before["peak_memory"] is not None and result["peak_memory"] is not None:
+            if (max(before["peak_memory"], result["peak_memory"]) >= min_memory and
+                    result["peak_memory"] > before["peak_memory"] * (1 + threshold)):
+                regressions.append((key, f"memoria {before['peak_memory']} -> {result['peak_memory']} B"))
+    new_keys = {result_key(result) for result in new["results"]}
+    for key in old_results:
+        if key not in new_keys:
+            changes.append((key, "ausente"))
+    return regressions, changes
+
+
+def summarize(results):
+    # Media de nodos expandidos por (conjunto, distancia) y par algoritmo/heurística,
+    # solo con búsquedas completas. Devuelve {(conjunto, distancia): {par: media}}.
+    nodes = {}
+    for result in results:
+        if "error" in result or result["stopped"] or result["optimal"] is None:
+            continue
+        pair = result["algorithm"] + (f"/{result['heuristic']}" if result["heuristic"] else "")
+        nodes.setdefault((result["set"], result["optimal"]), {}).setdefault(pair, []).append(
+            result["nodes_expanded"])
+    return {key: {pair: statistics.mean(values) for pair, values in pairs.items()}
+            for key, pairs in sorted(nodes.items())}
+
+
+def _format_key(key):
+    return "/".join(part for part in key if part)
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los algoritmos del puzzle y del laberinto")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="ejecuta los benchmarks y escribe JSON")
+    run.add_argument("--sets", nargs="+", choices=list(INSTANCE_SETS), default=list(SETS),
+                     help="conjuntos de instancias")
+    run.add_argument("--algorithms", nargs="+", help="solo estos algoritmos (por defecto, todos)")
+    run.add_argument("--heuristics", nargs="+", help="solo estas heurísticas (por defecto, todas)")
+    run.add_argument("--limit", type=int, default=None, help="instancias por conjunto como máximo")
+    run.add_argument("--warmup", type=int, default=1, help="ejecuciones de calentamiento")
+    run.add_argument("--repeat", type=int, default=3, help="ejecuciones medidas (mediana y mínimo)")
+    run.add_argument("--max-nodes", type=int, default=200000, help="límite de nodos por búsqueda")
+    run.add_argument("--no-memory", action="store_true", help="no medir el pico de memoria con tracemalloc")
+    run.add_argument("--no-metered", action="store_true", help="no medir el tiempo pasado en la heurística")
+    run.add_argument("--output", default="-", help="archivo JSON (por defecto stdout)")
+
+    diff = commands.add_parser("diff", help="compara dos ejecuciones")
+    diff.add_argument("old", help="JSON de referencia")
+    diff.add_argument("new", help="JSON nuevo")
+    diff.add_argument("--threshold", type=float, default=0.1,
+                      help="caída de nodos/s o subida de memoria tolerada (fracción)")
+    diff.add_argument("--min-time", type=float, default=0.01,
+                      help="no comparar nodos/s en búsquedas más cortas (s)")
+
+    summary = commands.add_parser("summary", help="media de nodos expandidos por distancia")
+    summary.add_argument("run", help="JSON de una ejecución")
+    args = parser.parse_args(argv)
+
+    if args.command == "summary":
+        for (name, depth), pairs in summarize(_load(args.run)["results"]).items():
+            print(f"{name} d{depth}: " + ", ".join(f"{pair} {mean:.0f}" for pair, mean in pairs.items()))
+        return 0
+
+    if args.command == "diff":
+        old, new = _load(args.old), _load(args.new)
+        regressions, changes = diff_runs(old, new, args.threshold, args.min_time)
+        for key, reason in changes:
+            print(f"  {_format_key(key)}: {reason}")
+        for key, reason in regressions:
+            print(f"! {_format_key(key)}: {reason}")
+        print(f"{len(new['results'])} resultados, {len(regressions)} regresiones, {len(changes)} cambios",
+              file=sys.stderr)
+        return 1 if regressions else 0
+
+    def log(result):
+        if "error" in result:
+            status = result["error"]
+        else:
+            status = (f"{result['nodes_expanded']} nodos, {result['wall_time'] * 1000:.1f} ms"
+                      + (f", {result['stopped']}" if result["stopped"] else ""))
+        print(f"{result['set']}/{result['instance']} {result['algorithm']} {result['heuristic'] or ''}: "
+              f"{status}", file=sys.stderr)
+
+    start_time = time.perf_counter()
+    results = run_suite(args.sets, args.algorithms, args.heuristics, args.limit, args.warmup,
+                        args.repeat, args.max_nodes, not args.no_memory, log, not args.no_metered)
+    report = {
+        "version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {"sets": args.sets, "warmup": args.warmup, "repeat": args.repeat,
+                     "max_nodes": args.max_nodes},
+        "elapsed": time.perf_counter() - start_time,
+        "results": results,
+    }
+    text = json.dumps(report, indent=1)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# Comparación de algoritmos en paralelo
+# Cada par algoritmo/heurística (registry.solver_pairs) es un trabajo de jobs.py que se
+# resuelve en un grupo de procesos. Los resultados llegan a on_result a medida que
+# terminan, así que el tiempo total se acerca al de la búsqueda más lenta y no a la suma.
+#
+# Límite por trabajo: cada búsqueda lleva max_seconds=timeout (utils.SearchBudget) y
+# se detiene sola. Si un trabajo no responde timeout + TIMEOUT_GRACE segundos después de
+# empezar (p. ej. construyendo una PDB), se da por agotado: el grupo de procesos se
+# termina y los demás trabajos en curso se relanzan en uno nuevo. Por eso se usa
+# multiprocessing.Pool, que puede matar a sus procesos, y no ProcessPoolExecutor.
+import os
+import time
+import queue
+import itertools
+import threading
+import multiprocessing
+from jobs import solve_job
+from registry import PUZZLE, MAZE, solver_pairs
+
+COMPARE_TIMEOUT = 30
+TIMEOUT_GRACE = 5
+# Cada cuánto se mira si la comparación se canceló o algún trabajo venció (segundos)
+POLL_INTERVAL = 0.1
+
+
+def comparison_jobs(base, algorithms=None, heuristics=None):
+    # Un trabajo por combinación sobre el mismo tablero o laberinto, sin caché de soluciones.
+    # Los procesos de multiprocessing.Pool no pueden lanzar otros: sin algoritmos paralelos.
+    kind = MAZE if "maze" in base else PUZZLE
+    size = len(base["board"]) if kind == PUZZLE else None
+    for solver, heuristic in solver_pairs(kind, algorithms, heuristics, size, parallel=False):
+        job = dict(base, id=f"{solver.name}/{heuristic.name}" if heuristic else solver.name,
+                   algorithm=solver.name, cache=False)
+        if heuristic is not None:
+            job["heuristic"] = heuristic.name
+        yield job
+
+
+def timed_out(job, elapsed):
+    # Resultado de un trabajo que no respondió a tiempo
+    return {"id": job.get("id"), "solved": False, "steps": None, "nodes": None,
+            "time": elapsed, "path": None, "stopped": "time"}
+
+
+class Comparison:
+    # Se ejecuta en un hilo propio: on_result(job, result) y on_done(comparison) se llaman
+    # desde ese hilo (la interfaz los pasa a su hilo con Clock.schedule_once)
+    def __init__(self, jobs, on_result, on_done=None, workers=None, timeout=COMPARE_TIMEOUT):
+        self.jobs = list(jobs)
+        self.on_result = on_result
+        self.on_done = on_done
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.jobs)))
+        self.timeout = timeout
+        self.cancelled = False
+        self.finished = 0
+        self.elapsed = None
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        # Los trabajos en curso se matan y los que faltan no se lanzan
+        self.cancelled = True
+
+    def run(self):
+        start_time = time.perf_counter()
+        queued = iter(self.jobs)
+        exhausted = False
+        replies = queue.Queue()  # (número de envío, resultado) desde los callbacks del grupo
+        pending = {}             # número de envío -> (trabajo, instante de envío)
+        tickets = itertools.count()
+        pool = multiprocessing.Pool(self.workers)
+
+        def submit(job):
+            ticket = next(tickets)
+            limited = dict(job, max_seconds=min(job.get("max_seconds") or self.timeout, self.timeout))
+            pending[ticket] = (job, time.perf_counter())
+            pool.apply_async(solve_job, (limited,),
+                             callback=lambda result: replies.put((ticket, result)),
+                             error_callback=lambda e: replies.put((ticket, {
+                                 "id": job.get("id"), "error": f"{type(e).__name__}: {e}"})))
+
+        try:
+            while not self.cancelled:
+                # Como mucho un trabajo por proceso: así el envío marca su comienzo
+                while len(pending) < self.workers and not exhausted:
+                    job = next(queued, None)
+                    if job is None:
+                        exhausted = True
+                    else:
+                        submit(job)
+                if exhausted and not pending:
+                    break
+                try:
+                    ticket, result = replies.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    pass
+                else:
+                    # Las respuestas de un grupo ya terminado no tienen envío pendiente
+                    if ticket in pending:
+                        job, _ = pending.pop(ticket)
+                        self._report(job, result)
+
+                now = time.perf_counter()
+                expired = [ticket for ticket, (_, submitted) in pending.items()
+                           if now - submitted > self.timeout + TIMEOUT_GRACE]
+                if expired:
+                    for ticket in expired:
+                        job, submitted = pending.pop(ticket)
+                        self._report(job, timed_out(job, now - submitted))
+                    # Matar al proceso atascado obliga a relanzar los demás en curso
+                    pool.terminate()
+                    pool = multiprocessing.Pool(self.workers)
+                    restarted = [job for job, _ in pending.values()]
+                    pending.clear()
+                    for job in restarted:
+                        submit(job)
+        finally:
+            pool.terminate()
+            self.elapsed = time.perf_counter() - start_time
+            if self.on_done is not None:
+                self.on_done(self)
+
+    def _report(self, job, result):
+        self.finished += 1
+        self.on_result(job, result)
@@ -0,0 +1,108 @@
+# Trabajos de resolución sin interfaz gráfica (batch.py y otros clientes)
+# Un trabajo es un dict. Para el puzzle:
+#   {"id": ..., "board": [[1, 2, 3], ...], "goal": [[...]], "algorithm": "a_star", "heuristic": "manhattan"}
+# y para el laberinto (0 = camino, 1 = pared):
+#   {"id": ..., "maze": [[0, 1, ...], ...], "start": [0, 0], "goal": [4, 4], "algorithm": "a_star", "heuristic": "manhattan"}
+# "goal", "algorithm" y "heuristic" son opcionales; "cache": false evita la caché de soluciones
+# y "max_nodes", "max_seconds" y "max_bytes" limitan la búsqueda (utils.SearchBudget).
+# Con "metered": true la heurística se envuelve en utils.MeteredHeuristic y "stats" trae
+# heuristic_time (más lento: solo para perfilar).
+# El resultado también es un dict:
+#   {"id", "solved", "steps", "nodes", "time", "path", "stats"} o {"id", "error"}
+# donde path son los movimientos del blanco ("UDLR") en el puzzle y las celdas [fila, columna] en el laberinto.
+# Si la búsqueda agota su presupuesto, "solved" es false y "stopped" dice el motivo ("nodes", "time", "memory").
+# "stats" son los contadores de utils.SearchStats (generados, duplicados, picos de abiertos y cerrados...).
+from puzzle.state import PuzzleState, goal_board
+from puzzle.solution_cache import SolutionCache
+from maze.state import MazeState
+from utils import SearchBudget, MeteredHeuristic
+from registry import PUZZLE, MAZE, get_solver, get_heuristic
+
+# Caché de soluciones de los algoritmos que la admiten (una por proceso)
+SOLUTION_CACHE = SolutionCache()
+
+DEFAULT_ALGORITHM = "a_star"
+DEFAULT_HEURISTIC = "manhattan"
+
+
+def puzzle_moves(path):
+    # Movimientos del blanco entre estados consecutivos: U, D, L, R
+    moves = []
+    for previous, current in zip(path, path[1:]):
+        delta = current.blank - previous.blank
+        if delta == -previous.size:
+            moves.append("U")
+        elif delta == previous.size:
+            moves.append("D")
+        elif delta == -1:
+            moves.append("L")
+        else:
+            moves.append("R")
+    return "".join(moves)
+
+
+def job_budget(job):
+    # Presupuesto del trabajo, o None si no indica límites
+    limits = {name: job[name] for name in ("max_nodes", "max_seconds", "max_bytes") if job.get(name) is not None}
+    return SearchBudget(**limits) if limits else None
+
+
+def job_heuristic(job, heuristic):
+    # La heurística cargada, medida si el trabajo lo pide
+    return MeteredHeuristic(heuristic) if heuristic is not None and job.get("metered") else heuristic
+
+
+def solve_puzzle(job, budget=None):
+    board = job["board"]
+    initial_state = PuzzleState(board)
+    goal_state = PuzzleState(job.get("goal") or goal_board(len(board)))
+    solver = get_solver(PUZZLE, job.get("algorithm", DEFAULT_ALGORITHM))
+    heuristic = get_heuristic(PUZZLE, job.get("heuristic", DEFAULT_HEURISTIC)) if solver.heuristic else None
+    if not solver.supports(heuristic, len(board)):
+        raise ValueError(f"{solver.label} no admite esta combinación (tablero {len(board)}x{len(board)}"
+                         + (f", heurística {heuristic.name})" if heuristic else ")"))
+    cache = SOLUTION_CACHE if job.get("cache", True) else None
+    loaded = job_heuristic(job, heuristic.load(len(board)) if heuristic else None)
+    stats = solver.solve(initial_state, goal_state, loaded, cache, budget,
+                         heuristic is not None and heuristic.admissible)
+    return stats, (puzzle_moves(stats.path) if stats.path else None)
+
+
+def solve_maze(job, budget=None):
+    maze = job["maze"]
+    initial_state = MazeState(tuple(job["start"]), maze)
+    goal_state = MazeState(tuple(job["goal"]), maze)
+    solver = get_solver(MAZE, job.get("algorithm", DEFAULT_ALGORITHM))
+    heuristic = get_heuristic(MAZE, job.get("heuristic", DEFAULT_HEURISTIC)).load() if solver.heuristic else None
+    stats = solver.solve(initial_state, goal_state, job_heuristic(job, heuristic), budget=budget)
+    return stats, ([list(state.position) for state in stats.path] if stats.path else None)
+
+
+def solve_job(job):
+    # Nunca lanza: los errores del trabajo se devuelven en el resultado
+    result = {"id": job.get("id")}
+    if "error" in job:
+        # Entrada que ya no se pudo leer (batch.read_jobs)
+        result["error"] = job["error"]
+        return result
+    try:
+        solver = solve_maze if "maze" in job else solve_puzzle
+        budget = job_budget(job)
+        stats, encoded = solver(job, budget)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    path = stats.path
+    result["solved"] = path is not None
+    result["steps"] = len(path) - 1 if path else None
+    result["nodes"] = stats.nodes_expanded
+    result["time"] = stats.wall_time
+    result["path"] = encoded
+    if stats.stopped is not None:
+        result["stopped"] = stats.stopped
+    result["stats"] = stats.as_dict()
+    return result
+
+
+def solve_chunk(jobs):
+    return [solve_job(job) for job in jobs]
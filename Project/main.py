@@ -1,11 +1,26 @@
+import sys, traceback
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
+from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import ScreenManager, Screen
 from puzzle.ui import PuzzleApp
 from maze.ui import MazeApp
 
+# Manejo de errores con Popup (solo en la aplicación; la consola usa el de Python)
+def excepthook(exc_type, exc_value, exc_traceback):
+    error_text = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+    popup = Popup(
+        title="Error en la app",
+        content=Label(text=error_text, font_size="12sp"),
+        size_hint=(0.95, 0.95),
+        auto_dismiss=True
+    )
+    popup.open()
+
+sys.excepthook = excepthook
+
 class MainMenuScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
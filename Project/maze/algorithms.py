@@ -1,94 +1,147 @@
-import time
-from utils import Queue, MinHeap
+from utils import Queue, IndexedMinHeap, BucketQueue, SearchStats, make_open_list, budget_checkpoint
 from maze.heuristics import *
 
 # Algoritmos adaptados para laberinto
-def maze_bfs(initial_state, goal_state):
-    queue = Queue()
+# Como en puzzle/algorithms.py, devuelven un SearchStats (se desempaqueta como
+# (path, nodes_expanded, tiempo)) y budget=SearchBudget limita nodos, tiempo y memoria,
+# permite cancelar y recibe el progreso; al agotarse el camino es None.
+def maze_bfs(initial_state, goal_state, open_list="queue", budget=None):
+    # open_list="bucket": buckets por profundidad (utils.BucketQueue) en lugar de la cola FIFO
+    if open_list == "bucket":
+        buckets = BucketQueue(prefer_high_g=False)
+        enqueue = lambda state: buckets.push(state.position, state, state.moves, state.moves)
+        dequeue = lambda: buckets.pop()[1]
+        is_empty, size = buckets.is_empty, buckets.__len__
+    elif open_list == "queue":
+        queue = Queue()
+        enqueue, dequeue, is_empty, size = queue.enqueue, queue.dequeue, queue.is_empty, queue.__len__
+    else:
+        raise ValueError(f"Lista abierta desconocida: {open_list}")
+    stats = SearchStats(budget)
     visited = set()
-    nodes_expanded = 0
+    nodes_expanded = generated = duplicates = peak_open = 0
     
-    queue.enqueue(initial_state)
+    enqueue(initial_state)
     visited.add(initial_state.position)
     
-    start_time = time.time()
+    check_at = budget_checkpoint(budget)
     
-    while not queue.is_empty():
-        current = queue.dequeue()
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_maze_path(current), nodes_expanded, end_time - start_time
+    try:
+        while not is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, size()):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if size() > peak_open:
+                peak_open = size()
+            current = dequeue()
+            nodes_expanded += 1
+            
+            if current == goal_state:
+                return stats.finish(reconstruct_maze_path(current))
+            
+            for neighbor in current.get_neighbors():
+                generated += 1
+                if neighbor.position not in visited:
+                    visited.add(neighbor.position)
+                    enqueue(neighbor)
+                else:
+                    duplicates += 1
         
-        for neighbor in current.get_neighbors():
-            if neighbor.position not in visited:
-                visited.add(neighbor.position)
-                queue.enqueue(neighbor)
-    
-    return None, nodes_expanded, time.time() - start_time
+        return stats.finish(None)
+    finally:
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open, len(visited))
 
-def maze_a_star(initial_state, goal_state, heuristic):
-    heap = MinHeap()
+def maze_a_star(initial_state, goal_state, heuristic, open_list="bucket", budget=None):
+    # Lista abierta indexada por posición: una celda ya abierta solo se actualiza si mejora su g.
+    # Con heurísticas no enteras (euclídea) "bucket" vuelve al montículo.
+    stats = SearchStats(budget, heuristic)
     visited = set()
-    nodes_expanded = 0
+    nodes_expanded = generated = closed_hits = rejected = peak_open = 0
     
     initial_f = heuristic(initial_state, goal_state)
-    heap.push((initial_f, 0, initial_state))
+    heap = make_open_list(open_list, isinstance(initial_f, int))
+    heap.push(initial_state.position, initial_state, initial_f, 0)
+    f_score = best_h = initial_f
     
-    start_time = time.time()
+    check_at = budget_checkpoint(budget)
     
-    while not heap.is_empty():
-        f_score, g_score, current = heap.pop()
-        
-        if current.position in visited:
-            continue
+    try:
+        while not heap.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(heap), f_score, best_h):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(heap) > peak_open:
+                peak_open = len(heap)
+            _, current, f_score, g_score = heap.pop()
+                
+            visited.add(current.position)
+            nodes_expanded += 1
             
-        visited.add(current.position)
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_maze_path(current), nodes_expanded, end_time - start_time
+            if current == goal_state:
+                return stats.finish(reconstruct_maze_path(current))
+            
+            for neighbor in current.get_neighbors():
+                generated += 1
+                if neighbor.position not in visited:
+                    g = current.moves + 1
+                    h = heuristic(neighbor, goal_state)
+                    if h < best_h:
+                        best_h = h
+                    f = g + h
+                    if not heap.push(neighbor.position, neighbor, f, g):
+                        rejected += 1
+                else:
+                    closed_hits += 1
         
-        for neighbor in current.get_neighbors():
-            if neighbor.position not in visited:
-                g = current.moves + 1
-                h = heuristic(neighbor, goal_state)
-                f = g + h
-                heap.push((f, g, neighbor))
-    
-    return None, nodes_expanded, time.time() - start_time
+        return stats.finish(None)
+    finally:
+        # La heurística se evalúa en todo hijo no cerrado, aunque no mejore al abierto
+        stats.count(nodes_expanded, generated, closed_hits + rejected, 0, peak_open, len(visited),
+                    heuristic_calls=generated - closed_hits + 1)
 
-def maze_greedy(initial_state, goal_state, heuristic):
-    heap = MinHeap()
+def maze_greedy(initial_state, goal_state, heuristic, budget=None):
+    stats = SearchStats(budget, heuristic)
+    heap = IndexedMinHeap()
     visited = set()
-    nodes_expanded = 0
+    nodes_expanded = generated = duplicates = peak_open = 0
     
-    h = heuristic(initial_state, goal_state)
-    heap.push((h, initial_state))
+    h = best_h = heuristic(initial_state, goal_state)
+    heap.push(initial_state.position, initial_state, h, 0)
     
-    start_time = time.time()
+    check_at = budget_checkpoint(budget)
     
-    while not heap.is_empty():
-        h, current = heap.pop()
-        
-        if current.position in visited:
-            continue
-        
-        visited.add(current.position)
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_maze_path(current), nodes_expanded, end_time - start_time
+    try:
+        while not heap.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(heap), None, best_h):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(heap) > peak_open:
+                peak_open = len(heap)
+            _, current, h, _ = heap.pop()
+            
+            visited.add(current.position)
+            nodes_expanded += 1
+            
+            if current == goal_state:
+                return stats.finish(reconstruct_maze_path(current))
+            
+            for neighbor in current.get_neighbors():
+                generated += 1
+                if neighbor.position not in visited and neighbor.position not in heap:
+                    h = heuristic(neighbor, goal_state)
+                    if h < best_h:
+                        best_h = h
+                    heap.push(neighbor.position, neighbor, h, neighbor.moves)
+                else:
+                    duplicates += 1
         
-        for neighbor in current.get_neighbors():
-            if neighbor.position not in visited:
-                h = heuristic(neighbor, goal_state)
-                heap.push((h, neighbor))
-    
-    return None, nodes_expanded, time.time() - start_time
+        return stats.finish(None)
+    finally:
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open, len(visited),
+                    heuristic_calls=generated - duplicates + 1)
 
 def reconstruct_maze_path(state):
     path = []
@@ -96,4 +149,4 @@ def reconstruct_maze_path(state):
     while current:
         path.append(current)
         current = current.parent
-    return path[::-1]
\ No newline at end of file
+    return path[::-1]
@@ -11,18 +11,11 @@ from kivy.clock import Clock
 from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
 from maze.state import MazeState
-from puzzle.ui import ResultPopup
-
-# You'll also need to import your maze solving algorithms and classes
-# Assuming they're in separate files:
-from maze.algorithms import (
-    maze_bfs, 
-    maze_a_star, 
-    maze_greedy,
-    maze_manhattan_distance,
-    maze_euclidean_distance,
-    maze_chebyshev_distance
-)
+from puzzle.ui import (ResultPopup, ComparisonView, SOLVE_TIME_LIMIT, STOP_REASONS, PROGRESS_INTERVAL,
+                       progress_text, solver_choices)
+from comparison import Comparison, comparison_jobs
+from registry import MAZE
+from utils import SearchBudget
 
 class MazeCell(Button):
     def __init__(self, cell_type, maze_grid, row, col, **kwargs):
@@ -74,7 +67,12 @@ class MazeGrid(GridLayout):
         self.start_pos = (0, 0)
         self.goal_pos = (9, 9)
         self.edit_mode = 0  # 0=camino, 1=pared
+        self.on_change = None  # se llama cada vez que cambia el laberinto
         self.create_cells()
+    
+    def changed(self):
+        if self.on_change:
+            self.on_change()
         
     def create_cells(self):
         self.clear_widgets()
@@ -95,12 +93,14 @@ class MazeGrid(GridLayout):
                 self.add_widget(cell)
                 row.append(cell)
             self.cells.append(row)
+        self.changed()
     
     def cell_pressed(self, pressed_cell):
         if (pressed_cell.row, pressed_cell.col) not in [self.start_pos, self.goal_pos]:
             self.maze[pressed_cell.row][pressed_cell.col] = self.edit_mode
             pressed_cell.cell_type = self.edit_mode
             pressed_cell.update_appearance()
+            self.changed()
     
     def clear_solution(self):
         for i in range(self.rows):
@@ -140,6 +140,13 @@ class MazeApp(App):
         
         # Grid del laberinto
         self.maze_grid = MazeGrid(size_hint_y=None, height='400dp')
+        # Si el laberinto cambia, la resolución en curso ya no sirve
+        self.maze_grid.on_change = self.cancel_solve
+        self.budget = None
+        self.comparison = None
+        self.latest_progress = None
+        self.progress_scheduled = False
+        self.progress_start_h = None
         
         # Controles
         controls_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None, height='250dp')
@@ -147,17 +154,10 @@ class MazeApp(App):
         # Selector de algoritmo
         algorithm_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint_y=None, height='40dp')
         algorithm_label = Label(text='Algoritmo:', size_hint_x=None, width='100dp')
+        self.solver_choices = solver_choices(MAZE)
         self.maze_algorithm_spinner = Spinner(
             text='BFS',
-            values=[
-                'BFS',
-                'A* Manhattan',
-                'A* Euclidean',
-                'A* Chebyshev',
-                'Greedy Manhattan',
-                'Greedy Euclidean',
-                'Greedy Chebyshev'
-            ],
+            values=list(self.solver_choices),
             size_hint_x=None,
             width='200dp'
         )
@@ -203,6 +203,15 @@ class MazeApp(App):
         )
         reset_btn.bind(on_press=self.reset_maze)
         
+        compare_btn = Button(
+            text='Comparar',
+            background_color=(0.2, 0.4, 0.8, 1),
+            font_size='16sp',
+            size_hint_x=0.6
+        )
+        compare_btn.bind(on_press=self.show_comparison)
+        
+        buttons_layout.add_widget(compare_btn)
         buttons_layout.add_widget(solve_btn)
         buttons_layout.add_widget(clear_btn)
         buttons_layout.add_widget(reset_btn)
@@ -244,44 +253,66 @@ class MazeApp(App):
     def on_edit_mode_change(self, spinner, text):
         self.maze_grid.edit_mode = 0 if text == 'Camino' else 1
     
+    def cancel_solve(self):
+        # Detiene la resolución en curso; su resultado ya no se mostrará
+        if self.budget is not None:
+            self.budget.cancel()
+            self.budget = None
+            self.maze_progress_bar.value = 0
+            self.maze_status_label.text = 'Resolución cancelada'
+    
     def solve_maze(self, instance):
+        self.cancel_solve()
+        self.budget = budget = SearchBudget(max_seconds=SOLVE_TIME_LIMIT)
+        budget.progress = lambda report: self._on_progress(budget, report)
+        self.progress_start_h = None
         self.maze_status_label.text = 'Resolviendo laberinto...'
         self.maze_progress_bar.value = 0
         
-        thread = threading.Thread(target=self._solve_maze_in_background)
+        thread = threading.Thread(target=self._solve_maze_in_background, args=(budget,))
         thread.daemon = True
         thread.start()
     
-    def _solve_maze_in_background(self):
+    def _solve_maze_in_background(self, budget):
         initial_state = MazeState(self.maze_grid.start_pos, self.maze_grid.maze)
         goal_state = MazeState(self.maze_grid.goal_pos, self.maze_grid.maze)
         
         algorithm = self.maze_algorithm_spinner.text
         
-        Clock.schedule_once(lambda dt: setattr(self.maze_progress_bar, 'value', 25), 0.1)
-        
         try:
-            if algorithm == 'BFS':
-                path, nodes, exec_time = maze_bfs(initial_state, goal_state)
-            elif algorithm == 'A* Manhattan':
-                path, nodes, exec_time = maze_a_star(initial_state, goal_state, maze_manhattan_distance)
-            elif algorithm == 'A* Euclidean':
-                path, nodes, exec_time = maze_a_star(initial_state, goal_state, maze_euclidean_distance)
-            elif algorithm == 'A* Chebyshev':
-                path, nodes, exec_time = maze_a_star(initial_state, goal_state, maze_chebyshev_distance)
-            elif algorithm == 'Greedy Manhattan':
-                path, nodes, exec_time = maze_greedy(initial_state, goal_state, maze_manhattan_distance)
-            elif algorithm == 'Greedy Euclidean':
-                path, nodes, exec_time = maze_greedy(initial_state, goal_state, maze_euclidean_distance)
-            elif algorithm == 'Greedy Chebyshev':
-                path, nodes, exec_time = maze_greedy(initial_state, goal_state, maze_chebyshev_distance)
+            solver, heuristic = self.solver_choices[algorithm]
+            path, nodes, exec_time = solver.solve(initial_state, goal_state, heuristic.load() if heuristic else None,
+                                                  budget=budget)
             
-            Clock.schedule_once(lambda dt: self._show_maze_results(algorithm, path, nodes, exec_time), 0.3)
+            Clock.schedule_once(lambda dt: self._show_maze_results(algorithm, path, nodes, exec_time, budget), 0.3)
             
         except Exception as e:
-            Clock.schedule_once(lambda dt: self._show_maze_error(str(e)), 0.1)
+            Clock.schedule_once(lambda dt: self._show_maze_error(str(e), budget), 0.1)
+    
+    def _on_progress(self, budget, report):
+        # Hilo de la búsqueda: como en PuzzleApp, como mucho un redibujado por intervalo
+        if budget is self.budget and report.nodes == 0:
+            self.progress_start_h = report.best_h
+        self.latest_progress = (budget, report)
+        if not self.progress_scheduled:
+            self.progress_scheduled = True
+            Clock.schedule_once(self._draw_progress, PROGRESS_INTERVAL)
+    
+    def _draw_progress(self, dt):
+        self.progress_scheduled = False
+        budget, report = self.latest_progress
+        if budget is not self.budget:
+            return
+        self.maze_status_label.text = 'Resolviendo laberinto... ' + progress_text(report)
+        start_h = self.progress_start_h
+        if start_h and report.best_h is not None:
+            self.maze_progress_bar.value = 100 * (1 - report.best_h / start_h)
     
-    def _show_maze_results(self, algorithm, path, nodes, exec_time):
+    def _show_maze_results(self, algorithm, path, nodes, exec_time, budget):
+        # Resultado de una resolución cancelada o reemplazada por otra
+        if budget is not self.budget:
+            return
+        self.budget = None
         self.maze_progress_bar.value = 0
         
         if path:
@@ -293,6 +324,13 @@ class MazeApp(App):
             
             self.maze_status_label.text = f'Camino encontrado ({len(path) - 1} pasos)'
             self.maze_grid.show_solution(path)
+        elif budget.reason in STOP_REASONS:
+            reason = STOP_REASONS[budget.reason]
+            result_text = f"Búsqueda detenida: {reason}.\n\n"
+            result_text += f"Algoritmo: {algorithm}\n"
+            result_text += f"Nodos expandidos: {nodes}\n"
+            result_text += f"Tiempo: {exec_time:.4f} segundos"
+            self.maze_status_label.text = f'Detenido ({reason})'
         else:
             result_text = "No se encontró camino para este laberinto."
             self.maze_status_label.text = 'Sin solución'
@@ -300,12 +338,47 @@ class MazeApp(App):
         popup = ResultPopup("Resultado del Laberinto", result_text)
         popup.open()
     
-    def _show_maze_error(self, error_msg):
+    def _show_maze_error(self, error_msg, budget):
+        if budget is not self.budget:
+            return
+        self.budget = None
         self.maze_progress_bar.value = 0
         self.maze_status_label.text = 'Error al resolver'
         popup = ResultPopup("Error", f"Error: {error_msg}")
         popup.open()
     
+    def show_comparison(self, instance):
+        # Como en PuzzleApp: todas las combinaciones en paralelo, con resultados en directo
+        self.cancel_comparison()
+        grid = self.maze_grid
+        jobs = list(comparison_jobs({'maze': [row[:] for row in grid.maze],
+                                     'start': list(grid.start_pos), 'goal': list(grid.goal_pos)}))
+        comparison = Comparison(
+            jobs,
+            on_result=lambda job, result: Clock.schedule_once(lambda dt: view.add(job, result)),
+            on_done=lambda done: Clock.schedule_once(lambda dt: self._comparison_done(view, done))
+        )
+        view = ComparisonView("COMPARACIÓN DE ALGORITMOS (LABERINTO)", len(jobs), on_close=comparison.cancel)
+        self.comparison = comparison
+        self.maze_status_label.text = f'Comparando {len(jobs)} combinaciones...'
+        view.open()
+        comparison.start()
+    
+    def cancel_comparison(self):
+        if self.comparison is not None:
+            self.comparison.cancel()
+            self.comparison = None
+    
+    def _comparison_done(self, view, comparison):
+        view.finish(comparison)
+        if comparison is self.comparison:
+            self.comparison = None
+            self.maze_status_label.text = f'Comparación terminada en {comparison.elapsed:.1f} s'
+    
+    def on_stop(self):
+        self.cancel_solve()
+        self.cancel_comparison()
+    
     def clear_solution(self, instance):
         self.maze_grid.clear_solution()
         self.maze_status_label.text = 'Solución eliminada'
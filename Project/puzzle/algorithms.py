@@ -1,228 +1,543 @@
-import time
-from utils import Stack, Queue, MinHeap
-from puzzle.heuristics import manhattan_distance, misplaced_tiles, linear_conflict
+import sys
+import copy
+import functools
+from utils import Stack, Queue, IndexedMinHeap, SearchBudget, SearchStats, make_open_list, budget_checkpoint
+from puzzle.ranking import SearchTables
+from puzzle.distance_table import DistanceTable
+from puzzle.ida import ida_star_search, parallel_ida_star_search
+from puzzle.state import LAYOUT_3, PuzzleState, is_solvable
+
+def requires_solvable(search):
+    # Un tablero de la otra clase de paridad agotaría todo el espacio antes de
+    # devolver None (o no terminaría con IDA*): se rechaza antes de buscar.
+    @functools.wraps(search)
+    def wrapper(initial_state, goal_state, *args, **kwargs):
+        if not is_solvable(initial_state, goal_state):
+            return SearchStats().finish(None)
+        return search(initial_state, goal_state, *args, **kwargs)
+    return wrapper
 
 # Algoritmos de búsqueda
-def bfs(initial_state, goal_state):
+# bfs, a_star, dfs, ucs y greedy guardan lista cerrada y tabla de padres en
+# SearchTables (puzzle/ranking.py): en el 8-puzzle son de 1 bit y 4 bytes por estado
+# sobre el ranking denso; los estados del open list no guardan cadena de padres.
+#
+# Todas devuelven un SearchStats (utils.py), que se desempaqueta como
+# (path, nodes_expanded, tiempo). Los contadores son variables locales que se copian
+# en el bloque finally con stats.count(), así que solo cuestan sumas de enteros.
+#
+# Todas aceptan budget=SearchBudget (utils.py): límites de nodos, tiempo y memoria,
+# cancelación desde otro hilo y aviso de progreso. Se consulta solo cuando
+# nodes_expanded llega a check_at, pasándole el tamaño de la lista abierta, la f que
+# se expande y la menor h vista; al agotarse el camino es None y stats.stopped dice
+# por qué.
+#
+# bfs, a_star e ida_star aceptan una SolutionCache (puzzle/solution_cache.py): si el
+# inicio está en la caché se devuelve sin buscar, la búsqueda para al llegar a un
+# estado conocido y la solución óptima encontrada se guarda para las siguientes.
+# a_star e ida_star solo la guardan con admissible=True: con una heurística no
+# admisible el camino puede no ser óptimo y envenenaría la caché para todos.
+def _cached_solution(cache, initial_state, goal_state, stats):
+    path = cache.path_from(initial_state, goal_state) if cache is not None else None
+    if path is None:
+        return None
+    return stats.finish(path)
+
+def _join_cached(prefix, cache, goal_state):
+    # Completa un camino que termina en un estado de la caché
+    suffix = cache.path_from(prefix[-1], goal_state)
+    return None if suffix is None else prefix + suffix[1:]
+
+@requires_solvable
+def bfs(initial_state, goal_state, cache=None, budget=None):
+    stats = SearchStats(budget)
+    cached = _cached_solution(cache, initial_state, goal_state, stats)
+    if cached is not None:
+        return cached
+
     queue = Queue()
-    visited = set()
-    nodes_expanded = 0
-    
-    queue.enqueue(initial_state)
-    visited.add(hash(str(initial_state.board)))
-    
-    start_time = time.time()
-    
-    while not queue.is_empty():
-        current = queue.dequeue()
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_path(current), nodes_expanded, end_time - start_time
-        
-        for neighbor in current.get_neighbors():
-            state_hash = hash(str(neighbor.board))
-            if state_hash not in visited:
-                visited.add(state_hash)
-                queue.enqueue(neighbor)
-    
-    return None, nodes_expanded, time.time() - start_time
-
-def a_star(initial_state, goal_state, heuristic):
-    heap = MinHeap()
-    visited = set()
-    nodes_expanded = 0
-    
+    tables = SearchTables(initial_state)
+    visited, parents, child_key = tables.visited, tables.parents, tables.child_key
+    nodes_expanded = generated = duplicates = peak_open = 0
+    # Mejor solución a través de un estado de la caché: (longitud, clave del estado)
+    best_cost, best_key = float('inf'), None
+    check_at = budget_checkpoint(budget)
+
+    root = tables.key(initial_state)
+    queue.enqueue((initial_state, root))
+    visited.add(root)
+    parents.set(root, root)
+
+    try:
+        while not queue.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(queue)):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(queue) > peak_open:
+                peak_open = len(queue)
+            current, current_key = queue.dequeue()
+            # Ningún estado a esta profundidad o más puede mejorar la solución por la caché
+            if current.moves >= best_cost:
+                break
+            nodes_expanded += 1
+
+            if current == goal_state:
+                path = parents.path(current_key)
+                if cache is not None:
+                    cache.record(path, goal_state)
+                return stats.finish(path)
+
+            for neighbor in current.get_neighbors(link_parent=False):
+                generated += 1
+                key = child_key(current_key, current.blank, neighbor)
+                if key not in visited:
+                    visited.add(key)
+                    parents.set(key, current_key)
+                    queue.enqueue((neighbor, key))
+                    if cache is not None:
+                        distance = cache.distance(neighbor, goal_state)
+                        if distance is not None and neighbor.moves + distance < best_cost:
+                            best_cost, best_key = neighbor.moves + distance, key
+                else:
+                    duplicates += 1
+
+        if best_key is not None:
+            path = _join_cached(parents.path(best_key), cache, goal_state)
+            if path is not None:
+                cache.record(path, goal_state)
+                return stats.finish(path)
+        return stats.finish(None)
+    finally:
+        # La lista cerrada son todos los estados descubiertos
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open,
+                    peak_closed=generated - duplicates + 1)
+
+@requires_solvable
+def a_star(initial_state, goal_state, heuristic, open_list="bucket", cache=None, admissible=False,
+           budget=None):
+    # Lista abierta indexada por estado: un hijo ya abierto solo se actualiza si mejora su g.
+    # open_list="bucket" usa buckets por f entera (utils.BucketQueue); "heap", un montículo.
+    # Con caché, los estados conocidos usan su distancia exacta como h y al sacar uno
+    # de la lista abierta su f es el coste óptimo: se completa con la caché y se para.
+    stats = SearchStats(budget, heuristic)
+    cached = _cached_solution(cache, initial_state, goal_state, stats)
+    if cached is not None:
+        return cached
+
+    tables = SearchTables(initial_state)
+    visited, parents, child_key = tables.visited, tables.parents, tables.child_key
+    nodes_expanded = generated = duplicates = peak_open = 0
+
+    root = tables.key(initial_state)
     initial_f = heuristic(initial_state, goal_state)
-    heap.push((initial_f, 0, initial_state))
-    
-    start_time = time.time()
-    
-    while not heap.is_empty():
-        f_score, g_score, current = heap.pop()
-        
-        if hash(str(current.board)) in visited:
-            continue
-            
-        visited.add(hash(str(current.board)))
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_path(current), nodes_expanded, end_time - start_time
-        
-        for neighbor in current.get_neighbors():
-            state_hash = hash(str(neighbor.board))
-            if state_hash not in visited:
-                g = current.moves + 1
-                h = heuristic(neighbor, goal_state)
-                f = g + h
-                heap.push((f, g, neighbor))
-    
-    return None, nodes_expanded, time.time() - start_time
-
-def dfs(initial_state, goal_state, max_depth=50):
+    heap = make_open_list(open_list, isinstance(initial_f, int))
+    heap.push(root, (initial_state, root), initial_f, 0)
+    f_score = best_h = initial_f
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while not heap.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(heap), f_score, best_h):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(heap) > peak_open:
+                peak_open = len(heap)
+            current_key, (current, parent_key), f_score, g_score = heap.pop()
+
+            visited.add(current_key)
+            parents.set(current_key, parent_key)
+            nodes_expanded += 1
+
+            if current == goal_state:
+                path = parents.path(current_key)
+                if cache is not None and admissible:
+                    cache.record(path, goal_state)
+                return stats.finish(path)
+
+            if cache is not None and cache.distance(current, goal_state) is not None:
+                path = _join_cached(parents.path(current_key), cache, goal_state)
+                if path is not None:
+                    if admissible:
+                        cache.record(path, goal_state)
+                    return stats.finish(path)
+
+            for neighbor in current.get_neighbors(link_parent=False):
+                generated += 1
+                key = child_key(current_key, current.blank, neighbor)
+                if key not in visited:
+                    g = current.moves + 1
+                    opened = heap.get(key)
+                    if opened is not None and opened[2] <= g:
+                        duplicates += 1
+                        continue
+                    h = heuristic(neighbor, goal_state)
+                    if cache is not None:
+                        distance = cache.distance(neighbor, goal_state)
+                        if distance is not None:
+                            h = distance
+                    if h < best_h:
+                        best_h = h
+                    f = g + h
+                    heap.push(key, (neighbor, current_key), f, g)
+                else:
+                    duplicates += 1
+
+        return stats.finish(None)
+    finally:
+        # Cada hijo no descartado evalúa la heurística una vez, más la raíz
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open, nodes_expanded,
+                    heuristic_calls=generated - duplicates + 1)
+
+@requires_solvable
+def dfs(initial_state, goal_state, max_depth=50, budget=None):
+    stats = SearchStats(budget)
     stack = Stack()
-    visited = set()
-    nodes_expanded = 0
-    
-    stack.push((initial_state, 0))  # (estado, profundidad)
-    visited.add(hash(str(initial_state.board)))
-    
-    start_time = time.time()
-    
-    while not stack.is_empty():
-        current, depth = stack.pop()
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_path(current), nodes_expanded, end_time - start_time
-        
-        if depth < max_depth:  # límite para evitar ciclos infinitos
-            for neighbor in current.get_neighbors():
-                state_hash = hash(str(neighbor.board))
-                if state_hash not in visited:
-                    visited.add(state_hash)
-                    stack.push((neighbor, depth + 1))
-    
-    return None, nodes_expanded, time.time() - start_time
-
-def ucs(initial_state, goal_state):
-    heap = MinHeap()
-    visited = set()
-    nodes_expanded = 0
-    
-    heap.push((0, initial_state))  # (costo acumulado, estado)
-    
-    start_time = time.time()
-    
-    while not heap.is_empty():
-        g, current = heap.pop()
-        
-        if hash(str(current.board)) in visited:
-            continue
-        
-        visited.add(hash(str(current.board)))
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_path(current), nodes_expanded, end_time - start_time
-        
-        for neighbor in current.get_neighbors():
-            state_hash = hash(str(neighbor.board))
-            if state_hash not in visited:
-                heap.push((g + 1, neighbor))
-    
-    return None, nodes_expanded, time.time() - start_time
-
-def greedy(initial_state, goal_state, heuristic):
-    heap = MinHeap()
-    visited = set()
-    nodes_expanded = 0
-    
-    h = heuristic(initial_state, goal_state)
-    heap.push((h, initial_state))
-    
-    start_time = time.time()
-    
-    while not heap.is_empty():
-        h, current = heap.pop()
-        
-        if hash(str(current.board)) in visited:
-            continue
-        
-        visited.add(hash(str(current.board)))
-        nodes_expanded += 1
-        
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_path(current), nodes_expanded, end_time - start_time
-        
-        for neighbor in current.get_neighbors():
-            state_hash = hash(str(neighbor.board))
-            if state_hash not in visited:
-                h = heuristic(neighbor, goal_state)
-                heap.push((h, neighbor))
-    
-    return None, nodes_expanded, time.time() - start_time
-
-def ida_star(initial_state, goal_state, heuristic):
-    start_time = time.time()
-    bound = heuristic(initial_state, goal_state)
-    path = [initial_state]
-    
-    def search(path, g, bound):
-        current = path[-1]
-        f = g + heuristic(current, goal_state)
-        
-        if f > bound:
-            return f
-        if current == goal_state:
-            return "FOUND"
-        
-        min_bound = float('inf')
-        for neighbor in current.get_neighbors():
-            if neighbor not in path:  # evitar ciclos
-                path.append(neighbor)
-                t = search(path, g + 1, bound)
-                if t == "FOUND":
-                    return "FOUND"
-                if t < min_bound:
-                    min_bound = t
-                path.pop()
-        return min_bound
-    
-    nodes_expanded = 0
-    while True:
-        t = search(path, 0, bound)
-        nodes_expanded += 1
-        if t == "FOUND":
-            end_time = time.time()
-            return path[:], nodes_expanded, end_time - start_time
-        if t == float('inf'):
-            return None, nodes_expanded, time.time() - start_time
-        bound = t
-
-def weighted_a_star(initial_state, goal_state, heuristic, weight=1.5):
-    heap = MinHeap()
-    # best_g guarda el mejor costo g visto para un estado; evita re-expandir peores caminos
+    tables = SearchTables(initial_state)
+    visited, parents, child_key = tables.visited, tables.parents, tables.child_key
+    nodes_expanded = generated = duplicates = peak_open = 0
+
+    root = tables.key(initial_state)
+    stack.push((initial_state, 0, root))  # (estado, profundidad, clave)
+    visited.add(root)
+    parents.set(root, root)
+
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while not stack.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(stack)):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(stack) > peak_open:
+                peak_open = len(stack)
+            current, depth, current_key = stack.pop()
+            nodes_expanded += 1
+
+            if current == goal_state:
+                return stats.finish(parents.path(current_key))
+
+            if depth < max_depth:  # límite para evitar ciclos infinitos
+                for neighbor in current.get_neighbors(link_parent=False):
+                    generated += 1
+                    key = child_key(current_key, current.blank, neighbor)
+                    if key not in visited:
+                        visited.add(key)
+                        parents.set(key, current_key)
+                        stack.push((neighbor, depth + 1, key))
+                    else:
+                        duplicates += 1
+
+        return stats.finish(None)
+    finally:
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open,
+                    peak_closed=generated - duplicates + 1)
+
+@requires_solvable
+def ucs(initial_state, goal_state, open_list="bucket", budget=None):
+    stats = SearchStats(budget)
+    heap = make_open_list(open_list)
+    tables = SearchTables(initial_state)
+    visited, parents, child_key = tables.visited, tables.parents, tables.child_key
+    nodes_expanded = generated = duplicates = peak_open = 0
+
+    root = tables.key(initial_state)
+    heap.push(root, (initial_state, root), 0, 0)  # clave -> (estado, clave del padre), prioridad g
+    g = 0
+
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while not heap.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(heap), g):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(heap) > peak_open:
+                peak_open = len(heap)
+            current_key, (current, parent_key), g, _ = heap.pop()
+
+            visited.add(current_key)
+            parents.set(current_key, parent_key)
+            nodes_expanded += 1
+
+            if current == goal_state:
+                return stats.finish(parents.path(current_key))
+
+            for neighbor in current.get_neighbors(link_parent=False):
+                generated += 1
+                key = child_key(current_key, current.blank, neighbor)
+                if key in visited or not heap.push(key, (neighbor, current_key), g + 1, g + 1):
+                    duplicates += 1
+
+        return stats.finish(None)
+    finally:
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open, nodes_expanded)
+
+@requires_solvable
+def greedy(initial_state, goal_state, heuristic, budget=None):
+    stats = SearchStats(budget, heuristic)
+    heap = IndexedMinHeap()
+    tables = SearchTables(initial_state)
+    visited, parents, child_key = tables.visited, tables.parents, tables.child_key
+    nodes_expanded = generated = duplicates = peak_open = 0
+
+    root = tables.key(initial_state)
+    h = best_h = heuristic(initial_state, goal_state)
+    heap.push(root, (initial_state, root), h, 0)
+
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while not heap.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(heap), None, best_h):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(heap) > peak_open:
+                peak_open = len(heap)
+            current_key, (current, parent_key), h, _ = heap.pop()
+
+            visited.add(current_key)
+            parents.set(current_key, parent_key)
+            nodes_expanded += 1
+
+            if current == goal_state:
+                return stats.finish(parents.path(current_key))
+
+            for neighbor in current.get_neighbors(link_parent=False):
+                generated += 1
+                key = child_key(current_key, current.blank, neighbor)
+                # h no depende del camino: un estado ya abierto se deja como está
+                if key not in visited and key not in heap:
+                    h = heuristic(neighbor, goal_state)
+                    if h < best_h:
+                        best_h = h
+                    heap.push(key, (neighbor, current_key), h, neighbor.moves)
+                else:
+                    duplicates += 1
+
+        return stats.finish(None)
+    finally:
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open, nodes_expanded,
+                    heuristic_calls=generated - duplicates + 1)
+
+@requires_solvable
+def ida_star(initial_state, goal_state, heuristic, tt_size=0, cache=None, admissible=False, budget=None):
+    # Motor iterativo en sitio (puzzle/ida.py); nodes_expanded cuenta expansiones reales
+    # de todas las iteraciones, no el número de iteraciones
+    stats = SearchStats(budget, heuristic)
+    cached = _cached_solution(cache, initial_state, goal_state, stats)
+    if cached is not None:
+        return cached
+    path, ida_stats = ida_star_search(initial_state, goal_state, heuristic, tt_size, cache, budget)
+    if path is not None and cache is not None and admissible:
+        cache.record(path, goal_state)
+    # La heurística se evalúa entera en la raíz y de forma incremental en cada hijo
+    stats.count(ida_stats.expanded, ida_stats.generated, heuristic_calls=ida_stats.generated + 1,
+                iterations=ida_stats.iterations)
+    return stats.finish(path)
+
+@requires_solvable
+def parallel_ida_star(initial_state, goal_state, heuristic, workers=None, split_depth=None, tt_size=0,
+                      budget=None):
+    # IDA* repartido entre procesos; nodes_expanded suma las expansiones de todos
+    stats = SearchStats(budget)
+    path, ida_stats = parallel_ida_star_search(initial_state, goal_state, heuristic,
+                                               workers, split_depth, tt_size, budget=budget)
+    stats.count(ida_stats.expanded, ida_stats.generated, iterations=ida_stats.iterations)
+    return stats.finish(path)
+
+@requires_solvable
+def weighted_a_star(initial_state, goal_state, heuristic, weight=1.5, budget=None):
+    stats = SearchStats(budget, heuristic)
+    heap = IndexedMinHeap()
+    # best_g guarda el mejor costo g visto para un estado; evita re-expandir peores caminos.
+    # Un estado abierto con mejor g se actualiza en sitio; uno ya expandido vuelve a entrar.
     best_g = {}
-    nodes_expanded = 0
+    nodes_expanded = generated = duplicates = reopened = peak_open = 0
 
     g0 = 0
     h0 = heuristic(initial_state, goal_state)
     f0 = g0 + weight * h0
-    heap.push((f0, g0, initial_state))
-    best_g[hash(str(initial_state.board))] = 0
-
-    start_time = time.time()
-
-    while not heap.is_empty():
-        f, g, current = heap.pop()
-        nodes_expanded += 1
-
-        if current == goal_state:
-            end_time = time.time()
-            return reconstruct_path(current), nodes_expanded, end_time - start_time
-
-        for neighbor in current.get_neighbors():
-            state_hash = hash(str(neighbor.board))
-            g2 = g + 1
-            # solo considerar si mejora el mejor g conocido
-            if state_hash not in best_g or g2 < best_g[state_hash]:
-                best_g[state_hash] = g2
-                h2 = heuristic(neighbor, goal_state)
-                f2 = g2 + weight * h2
-                heap.push((f2, g2, neighbor))
+    heap.push(initial_state.packed, initial_state, f0, g0)
+    best_g[initial_state.packed] = 0
+    f, best_h = f0, h0
+
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while not heap.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(heap), f, best_h):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(heap) > peak_open:
+                peak_open = len(heap)
+            _, current, f, g = heap.pop()
+            nodes_expanded += 1
 
-    return None, nodes_expanded, time.time() - start_time
+            if current == goal_state:
+                return stats.finish(reconstruct_path(current))
 
-def rbfs(initial_state, goal_state, heuristic):
-    start_time = time.time()
-    nodes_expanded = [0]  # lista para poder mutar dentro de la función anidada
+            for neighbor in current.get_neighbors():
+                generated += 1
+                key = neighbor.packed
+                g2 = g + 1
+                # solo considerar si mejora el mejor g conocido
+                if key not in best_g or g2 < best_g[key]:
+                    # conocido y fuera de la lista abierta: ya se expandió y se reabre
+                    if key in best_g and key not in heap:
+                        reopened += 1
+                    best_g[key] = g2
+                    h2 = heuristic(neighbor, goal_state)
+                    if h2 < best_h:
+                        best_h = h2
+                    f2 = g2 + weight * h2
+                    heap.update(key, neighbor, f2, g2)
+                else:
+                    duplicates += 1
+
+        return stats.finish(None)
+    finally:
+        # Las reaperturas cuentan como reexpansiones; cerrados = conocidos fuera de la lista abierta
+        stats.count(nodes_expanded, generated, duplicates, reopened, peak_open,
+                    len(best_g) - len(heap), heuristic_calls=generated - duplicates + 1)
+
+# ARA* (Anytime Repairing A*)
+# Una primera fase de A* ponderado con peso alto encuentra una solución enseguida. Luego
+# se baja el peso y se sigue con las mismas listas: la abierta se reordena con el peso
+# nuevo y los estados que mejoraron su g después de expandirse en la fase (inconsistentes)
+# esperan a la siguiente en lugar de reabrirse. Al terminar cada fase,
+# coste / min(g + h) sobre la lista abierta y los inconsistentes es una cota probada de
+# suboptimalidad (con heurística admisible); se para cuando llega a 1 o se agota el
+# presupuesto, y la última solución es la mejor disponible.
+def _ara_star(stats, initial_state, goal_state, heuristic, weight, step, budget):
+    # Genera (camino, cota) al final de cada fase con solución; cuenta en stats
+    if weight < 1 or step <= 0:
+        raise ValueError("ARA* necesita weight >= 1 y step > 0")
+    if not is_solvable(initial_state, goal_state):
+        return
+    heap = IndexedMinHeap()
+    root = initial_state.packed
+    best_g = {root: 0}
+    h_values = {root: heuristic(initial_state, goal_state)}
+    closed = {}  # clave -> fase en que se expandió
+    incons = {}  # clave -> estado que mejoró su g estando cerrado en esta fase
+    goal_key = goal_state.packed
+    goal_node = initial_state if root == goal_key else None
+    nodes_expanded = generated = duplicates = reexpansions = peak_open = phase = 0
+
+    heap.push(root, initial_state, weight * h_values[root], 0)
+    f, best_h = weight * h_values[root], h_values[root]
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while True:
+            phase += 1
+            goal_g = best_g.get(goal_key, sys.maxsize)
+            # El objetivo tiene h = 0: la fase acaba cuando nada abierto puede mejorarlo
+            while not heap.is_empty() and heap.peek()[2] < goal_g:
+                if nodes_expanded >= check_at:
+                    if budget.check(nodes_expanded, len(heap), f, best_h):
+                        return
+                    check_at = budget.next_check(nodes_expanded)
+                if len(heap) > peak_open:
+                    peak_open = len(heap)
+                key, current, f, g = heap.pop()
+                if key in closed:
+                    reexpansions += 1
+                closed[key] = phase
+                nodes_expanded += 1
+
+                for neighbor in current.get_neighbors():
+                    generated += 1
+                    child = neighbor.packed
+                    g2 = g + 1
+                    if g2 >= best_g.get(child, sys.maxsize):
+                        duplicates += 1
+                        continue
+                    best_g[child] = g2
+                    if child == goal_key:
+                        goal_node, goal_g = neighbor, g2
+                    h2 = h_values.get(child)
+                    if h2 is None:
+                        h2 = h_values[child] = heuristic(neighbor, goal_state)
+                        if h2 < best_h:
+                            best_h = h2
+                    if closed.get(child) == phase:
+                        incons[child] = neighbor
+                    else:
+                        heap.update(child, neighbor, g2 + weight * h2, g2)
+
+            if goal_node is None:
+                return
+            opened = heap.items()
+            lower = min([g + h_values[key] for key, _, _, g in opened] +
+                        [best_g[key] + h_values[key] for key in incons], default=goal_g)
+            bound = max(1.0, min(weight, goal_g / lower)) if lower else 1.0
+            stats.count(nodes_expanded, generated, duplicates, reexpansions, peak_open, len(closed),
+                        heuristic_calls=len(h_values), iterations=phase)
+            yield reconstruct_path(goal_node), bound
+            if bound <= 1:
+                return
+
+            # Siguiente fase: abierta e inconsistentes con el peso nuevo, cerrada vacía
+            weight = max(1.0, min(weight - step, bound))
+            heap = IndexedMinHeap()
+            for key, state, _, g in opened:
+                heap.push(key, state, g + weight * h_values[key], g)
+            for key, state in incons.items():
+                heap.push(key, state, best_g[key] + weight * h_values[key], best_g[key])
+            incons.clear()
+    finally:
+        # closed guarda cada estado expandido alguna vez; una heurística por estado conocido
+        stats.count(nodes_expanded, generated, duplicates, reexpansions, peak_open, len(closed),
+                    heuristic_calls=len(h_values), iterations=phase)
+
+def _deadline_budget(deadline, budget):
+    # deadline (segundos) es un atajo para budget=SearchBudget(max_seconds=deadline)
+    if deadline is None:
+        return budget
+    if budget is not None:
+        raise ValueError("Indica deadline o budget, no los dos")
+    return SearchBudget(max_seconds=deadline)
+
+def ara_star_solutions(initial_state, goal_state, heuristic, weight=3.0, step=0.5, deadline=None, budget=None):
+    # Generador: un SearchStats por fase con solución, con la cota en suboptimality.
+    # Quien lo recorre puede quedarse con la última solución en cualquier momento.
+    budget = _deadline_budget(deadline, budget)
+    stats = SearchStats(budget, heuristic)
+    for path, bound in _ara_star(stats, initial_state, goal_state, heuristic, weight, step, budget):
+        stats.finish(path).suboptimality = bound
+        yield copy.copy(stats)
+
+def ara_star(initial_state, goal_state, heuristic, weight=3.0, step=0.5, deadline=None, budget=None):
+    # La mejor solución al probar que es óptima o al agotarse el presupuesto; en ese
+    # caso stopped dice el motivo aunque haya camino
+    budget = _deadline_budget(deadline, budget)
+    stats = SearchStats(budget, heuristic)
+    path = bound = None
+    for path, bound in _ara_star(stats, initial_state, goal_state, heuristic, weight, step, budget):
+        pass
+    stats.finish(path).suboptimality = bound
+    if path is not None and budget is not None:
+        stats.stopped = budget.reason
+    return stats
+
+class _BudgetExhausted(Exception):
+    # Corta la recursión de rbfs cuando se agota el presupuesto
+    pass
+
+@requires_solvable
+def rbfs(initial_state, goal_state, heuristic, budget=None):
+    stats = SearchStats(budget, heuristic)
+    nodes_expanded = [0]  # listas para poder mutar dentro de la función anidada
+    generated = [0]
+    check_at = [budget_checkpoint(budget)]
+    best_h = [float('inf')]  # menor h vista, para el progreso
 
     # Nodo auxiliar que transporta (estado, g, f)
     class Node:
@@ -234,10 +549,15 @@ def rbfs(initial_state, goal_state, heuristic):
 
     def make_node(state, g):
         h = heuristic(state, goal_state)
+        best_h[0] = min(best_h[0], h)
         f = g + h
         return Node(state, g, f)
 
     def _rbfs(node, f_limit):
+        if nodes_expanded[0] >= check_at[0]:
+            if budget.check(nodes_expanded[0], None, f_limit, best_h[0]):
+                raise _BudgetExhausted()
+            check_at[0] = budget.next_check(nodes_expanded[0])
         nodes_expanded[0] += 1
         # Objetivo
         if node.state == goal_state:
@@ -246,9 +566,12 @@ def rbfs(initial_state, goal_state, heuristic):
         # Generar sucesores
         successors = []
         for child_state in node.state.get_neighbors():
+            generated[0] += 1
             g2 = node.g + 1
             # f del hijo = max(g2 + h, f del padre) (truco de RBFS para monotonicidad)
             h2 = heuristic(child_state, goal_state)
+            if h2 < best_h[0]:
+                best_h[0] = h2
             f2 = max(g2 + h2, node.f)
             successors.append(Node(child_state, g2, f2))
 
@@ -275,86 +598,393 @@ def rbfs(initial_state, goal_state, heuristic):
             # Si no hubo solución, el mejor vuelve con su f actualizada; se repite
 
     root = make_node(initial_state, 0)
-    result_state, _ = _rbfs(root, float('inf'))
+    try:
+        result_state, _ = _rbfs(root, float('inf'))
+    except _BudgetExhausted:
+        result_state = None
+    stats.count(nodes_expanded[0], generated[0], heuristic_calls=generated[0] + 1)
 
     if result_state is not None:
-        end_time = time.time()
         # reconstrucción de path usando los parent ya mantenidos por PuzzleState
         # Nota: get_neighbors() ya asigna parent=self; el recorrido recursivo respetó esa cadena
-        path = reconstruct_path(result_state)
-        return path, nodes_expanded[0], end_time - start_time
-
-    return None, nodes_expanded[0], time.time() - start_time
-
-def bidirectional_search(initial_state, goal_state):
+        return stats.finish(reconstruct_path(result_state))
+
+    return stats.finish(None)
+
+
+class _SMANode:
+    # Nodo de SMA*: children son los hijos en memoria; forgotten guarda la f respaldada
+    # de cada hijo olvidado (tablero empaquetado -> f) y forgotten_f es la menor (inf si
+    # no hay). Un hijo olvidado con f inf no tiene solución que quepa en memoria.
+    __slots__ = ("state", "g", "f", "parent", "children", "forgotten", "forgotten_f", "expanded")
+
+    def __init__(self, state, g, f, parent):
+        self.state = state
+        self.g = g
+        self.f = f
+        self.parent = parent
+        self.children = []
+        self.forgotten = None
+        self.forgotten_f = float('inf')
+        self.expanded = False
+
+
+def sma_node_bytes(state):
+    # Estimación de memoria por nodo de SMA* (nodo, estado y tablero empaquetado)
+    node = _SMANode(state, 0, 0, None)
+    return (sys.getsizeof(node) + sys.getsizeof(node.children) +
+            sys.getsizeof(state) + sys.getsizeof(state.packed))
+
+
+@requires_solvable
+def sma_star(initial_state, goal_state, heuristic, max_nodes=None, max_bytes=None, budget=None):
+    # SMA*: A* con memoria acotada a max_nodes nodos (o max_bytes, estimado con
+    # sma_node_bytes). Al llenarse se olvida la hoja peor (mayor f, menos profunda) y
+    # su f se guarda en el padre, que vuelve a la lista abierta para regenerarla si
+    # llega a ser la mejor. Devuelve la solución óptima si su camino cabe en memoria y
+    # None cuando la raíz llega a f inf (ningún camino cabe en max_nodes nodos).
+    # max_nodes y max_bytes acotan los nodos en memoria; budget, las expansiones.
+    stats = SearchStats(budget, heuristic)
+    if max_bytes is not None:
+        limit = max(2, max_bytes // sma_node_bytes(initial_state))
+        max_nodes = limit if max_nodes is None else min(max_nodes, limit)
+    elif max_nodes is None:
+        max_nodes = 100000
+    inf = float('inf')
+
+    # Montículos indexados por nodo: abiertos (menor f y, a igualdad, más profundo) y
+    # hojas olvidables (mayor f y, a igualdad, menos profunda)
+    open_heap = IndexedMinHeap()
+    prune_heap = IndexedMinHeap(prefer_high_g=False)
+    in_memory = {}    # tablero empaquetado -> nodo con menor g en memoria
+
+    def touch(node):
+        # Registrar el nuevo estado del nodo en los montículos que correspondan
+        if not node.expanded:
+            open_heap.update(node, node, node.f, node.g)
+        elif node.forgotten_f < inf:
+            open_heap.update(node, node, node.forgotten_f, node.g)
+        else:
+            open_heap.remove(node)
+        if not node.children and node.parent is not None:
+            prune_heap.update(node, node, -node.f, node.g)
+        else:
+            prune_heap.remove(node)
+
+    def backup(node):
+        # f de un nodo expandido = menor f entre sus hijos en memoria y los olvidados;
+        # el inf de las hojas sin salida sube hasta la raíz
+        while node is not None and node.expanded:
+            new_f = min([child.f for child in node.children], default=node.forgotten_f)
+            new_f = min(new_f, node.forgotten_f)
+            if new_f == node.f:
+                break
+            node.f = new_f
+            touch(node)
+            node = node.parent
+
+    root = _SMANode(initial_state, 0, heuristic(initial_state, goal_state), None)
+    in_memory[initial_state.packed] = root
+    touch(root)
+    used = peak_used = 1
+    nodes_expanded = generated = duplicates = reexpanded = peak_open = 0
+    h_calls = 1
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while not open_heap.is_empty():
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(open_heap)):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(open_heap) > peak_open:
+                peak_open = len(open_heap)
+            _, node, key, _ = open_heap.pop()
+            if key == inf or root.f == inf:
+                break
+
+            if not node.expanded and node.state == goal_state:
+                path = []
+                while node is not None:
+                    path.append(node.state)
+                    node = node.parent
+                return stats.finish(path[::-1])
+
+            # Generar los hijos que no están en memoria; al reexpandir, cada olvidado
+            # recupera la f que se guardó de él y los que valían inf no se regeneran
+            nodes_expanded += 1
+            if node.expanded:
+                reexpanded += 1
+            forgotten = node.forgotten or {}
+            present = {child.state.packed for child in node.children}
+            skip = node.parent.state.packed if node.parent is not None else None
+            g = node.g + 1
+            for neighbor in node.state.get_neighbors(link_parent=False):
+                generated += 1
+                key = neighbor.packed
+                if key == skip or key in present or forgotten.get(key) == inf:
+                    continue
+                existing = in_memory.get(key)
+                if existing is not None and existing.g <= g:
+                    duplicates += 1
+                    continue
+                if g + 1 >= max_nodes and neighbor != goal_state:
+                    f = inf  # el camino ya no cabe en memoria
+                else:
+                    f = max(g + heuristic(neighbor, goal_state), node.f, forgotten.pop(key, 0))
+                    h_calls += 1
+                child = _SMANode(neighbor, g, f, node)
+                node.children.append(child)
+                in_memory[key] = child
+                used += 1
+                touch(child)
+            if used > peak_used:
+                peak_used = used
+
+            # Los olvidados que no se regeneraron (duplicados) ya están en otra rama
+            node.forgotten = {key: f for key, f in forgotten.items() if f == inf} or None
+            node.forgotten_f = inf
+            node.expanded = True
+            touch(node)
+            backup(node)
+
+            # Olvidar las peores hojas hasta volver al presupuesto
+            while used > max_nodes and not prune_heap.is_empty():
+                _, leaf, _, _ = prune_heap.pop()
+                open_heap.remove(leaf)
+                parent = leaf.parent
+                parent.children.remove(leaf)
+                if in_memory.get(leaf.state.packed) is leaf:
+                    del in_memory[leaf.state.packed]
+                used -= 1
+                if parent.forgotten is None:
+                    parent.forgotten = {}
+                parent.forgotten[leaf.state.packed] = leaf.f
+                if leaf.f < parent.forgotten_f:
+                    parent.forgotten_f = leaf.f
+                touch(parent)
+                backup(parent)
+
+        return stats.finish(None)
+    finally:
+        # Cerrados = pico de nodos en memoria; las reexpansiones regeneran hijos olvidados
+        stats.count(nodes_expanded, generated, duplicates, reexpanded, peak_open, peak_used,
+                    heuristic_calls=h_calls)
+
+@requires_solvable
+def bidirectional_search(initial_state, goal_state, budget=None):
     from collections import deque
-    start_time = time.time()
+    stats = SearchStats(budget)
 
     # Colas de BFS desde ambos lados
     queue_start = deque([initial_state])
     queue_goal = deque([goal_state])
 
     # Visitados desde ambos lados
-    visited_start = {hash(str(initial_state.board)): initial_state}
-    visited_goal = {hash(str(goal_state.board)): goal_state}
-
-    nodes_expanded = 0
-
-    while queue_start and queue_goal:
-        # Expandir desde el inicio
-        if queue_start:
-            current_start = queue_start.popleft()
-            nodes_expanded += 1
-
-            for neighbor in current_start.get_neighbors():
-                hsh = hash(str(neighbor.board))
-                if hsh not in visited_start:
-                    visited_start[hsh] = neighbor
-                    queue_start.append(neighbor)
-
-                    # ¿Se encuentra con búsqueda desde goal?
-                    if hsh in visited_goal:
-                        # Reconstrucción de path
-                        path_from_start = reconstruct_path(neighbor)
-                        path_from_goal = reconstruct_path(visited_goal[hsh])
-                        # unir (evitar repetir nodo de encuentro)
-                        full_path = path_from_start[:-1] + path_from_goal[::-1]
-                        return full_path, nodes_expanded, time.time() - start_time
-
-        # Expandir desde el objetivo
-        if queue_goal:
-            current_goal = queue_goal.popleft()
+    visited_start = {initial_state.packed: initial_state}
+    visited_goal = {goal_state.packed: goal_state}
+
+    nodes_expanded = generated = duplicates = peak_open = 0
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while queue_start and queue_goal:
+            if len(queue_start) + len(queue_goal) > peak_open:
+                peak_open = len(queue_start) + len(queue_goal)
+            # Expandir desde el inicio
+            if queue_start:
+                if nodes_expanded >= check_at:
+                    if budget.check(nodes_expanded, len(queue_start) + len(queue_goal)):
+                        return stats.finish(None)
+                    check_at = budget.next_check(nodes_expanded)
+                current_start = queue_start.popleft()
+                nodes_expanded += 1
+
+                for neighbor in current_start.get_neighbors():
+                    generated += 1
+                    key = neighbor.packed
+                    if key not in visited_start:
+                        visited_start[key] = neighbor
+                        queue_start.append(neighbor)
+
+                        # ¿Se encuentra con búsqueda desde goal?
+                        if key in visited_goal:
+                            # Reconstrucción de path
+                            path_from_start = reconstruct_path(neighbor)
+                            path_from_goal = reconstruct_path(visited_goal[key])
+                            # unir (evitar repetir nodo de encuentro)
+                            full_path = path_from_start[:-1] + path_from_goal[::-1]
+                            return stats.finish(full_path)
+                    else:
+                        duplicates += 1
+
+            # Expandir desde el objetivo
+            if queue_goal:
+                if nodes_expanded >= check_at:
+                    if budget.check(nodes_expanded, len(queue_start) + len(queue_goal)):
+                        return stats.finish(None)
+                    check_at = budget.next_check(nodes_expanded)
+                current_goal = queue_goal.popleft()
+                nodes_expanded += 1
+
+                for neighbor in current_goal.get_neighbors():
+                    generated += 1
+                    key = neighbor.packed
+                    if key not in visited_goal:
+                        visited_goal[key] = neighbor
+                        queue_goal.append(neighbor)
+
+                        # ¿Se encuentra con búsqueda desde inicio?
+                        if key in visited_start:
+                            path_from_start = reconstruct_path(visited_start[key])
+                            path_from_goal = reconstruct_path(neighbor)
+                            full_path = path_from_start[:-1] + path_from_goal[::-1]
+                            return stats.finish(full_path)
+                    else:
+                        duplicates += 1
+
+        return stats.finish(None)
+    finally:
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open,
+                    len(visited_start) + len(visited_goal))
+
+class _MMSide:
+    # Un sentido de la búsqueda MM: listas compactas por tablero empaquetado
+    def __init__(self, root, target, heuristic):
+        self.target = target
+        self.heuristic = heuristic
+        self.g = {root.packed: 0}        # mejor g conocido (abiertos y cerrados)
+        self.parents = {root.packed: None}
+        # Abiertos indexados por tablero, ordenados por prioridad max(f, 2g), por f y por g
+        self.open = IndexedMinHeap()
+        self.by_f = IndexedMinHeap()
+        self.by_g = IndexedMinHeap()
+        self.push(root, 0)
+
+    def push(self, state, g):
+        f = g + self.heuristic(state, self.target)
+        self.open.update(state.packed, state, max(f, 2 * g), g)
+        self.by_f.update(state.packed, None, f, g)
+        self.by_g.update(state.packed, None, g, g)
+
+    def _min(self, heap):
+        top = heap.peek()
+        return top[2] if top else float('inf')
+
+    def min_priority(self):
+        return self._min(self.open)
+
+    def min_f(self):
+        return self._min(self.by_f)
+
+    def min_g(self):
+        return self._min(self.by_g)
+
+    def pop(self):
+        packed, state, _, g = self.open.pop()
+        self.by_f.remove(packed)
+        self.by_g.remove(packed)
+        return state, g
+
+    def path_to(self, packed):
+        keys = []
+        while packed is not None:
+            keys.append(packed)
+            packed = self.parents[packed]
+        return keys
+
+
+@requires_solvable
+def bidirectional_a_star(initial_state, goal_state, heuristic, budget=None):
+    # MM (Holte et al.): dos A* que se encuentran en el medio. Cada lado expande por
+    # prioridad max(f, 2g), de modo que ninguno pasa de la mitad del camino óptimo, y
+    # la búsqueda termina cuando el mejor camino encontrado U no supera
+    # max(C, fmin_adelante, fmin_atrás, gmin_adelante + gmin_atrás + 1).
+    # El sentido inverso usa heuristic(estado, initial_state), así que la heurística
+    # debe admitir cualquier objetivo (Manhattan, Misplaced, Linear Conflict).
+    # No siempre expande menos que A*: con Manhattan solo gana en 8-puzzles a más de
+    # ~22 movimientos; por debajo, y en los 15-puzzles cortos, A* con desempate por g
+    # alta llega antes (python benchmark.py run --sets depths8 depths15, y summary).
+    stats = SearchStats(budget, heuristic)
+    forward = _MMSide(initial_state, goal_state, heuristic)
+    backward = _MMSide(goal_state, initial_state, heuristic)
+    best_cost = 0 if initial_state == goal_state else float('inf')
+    meeting = initial_state.packed
+    nodes_expanded = generated = duplicates = peak_open = 0
+    check_at = budget_checkpoint(budget)
+
+    try:
+        while forward.open and backward.open:
+            if nodes_expanded >= check_at:
+                if budget.check(nodes_expanded, len(forward.open) + len(backward.open)):
+                    return stats.finish(None)
+                check_at = budget.next_check(nodes_expanded)
+            if len(forward.open) + len(backward.open) > peak_open:
+                peak_open = len(forward.open) + len(backward.open)
+            priority_f = forward.min_priority()
+            priority_b = backward.min_priority()
+            c = min(priority_f, priority_b)
+            if best_cost <= max(c, forward.min_f(), backward.min_f(),
+                                forward.min_g() + backward.min_g() + 1):
+                break
+
+            side, other = (forward, backward) if priority_f <= priority_b else (backward, forward)
+            current, g = side.pop()
             nodes_expanded += 1
 
-            for neighbor in current_goal.get_neighbors():
-                hsh = hash(str(neighbor.board))
-                if hsh not in visited_goal:
-                    visited_goal[hsh] = neighbor
-                    queue_goal.append(neighbor)
-
-                    # ¿Se encuentra con búsqueda desde inicio?
-                    if hsh in visited_start:
-                        path_from_start = reconstruct_path(visited_start[hsh])
-                        path_from_goal = reconstruct_path(neighbor)
-                        full_path = path_from_start[:-1] + path_from_goal[::-1]
-                        return full_path, nodes_expanded, time.time() - start_time
-
-    return None, nodes_expanded, time.time() - start_time
-
-def compare_heuristics(initial_state, goal_state):
-    heuristics = {
-        "Manhattan": manhattan_distance,
-        "Misplaced Tiles": misplaced_tiles,
-        "Linear Conflict": linear_conflict
-    }
-
-    results = []
-    for name, h in heuristics.items():
-        path, nodes, exec_time = a_star(initial_state, goal_state, h)
-        steps = len(path) - 1 if path else None
-        results.append((name, nodes, exec_time, steps))
-
-    return results
+            for neighbor in current.get_neighbors(link_parent=False):
+                generated += 1
+                key = neighbor.packed
+                child_g = g + 1
+                known = side.g.get(key)
+                if known is not None and known <= child_g:
+                    duplicates += 1
+                    continue
+                side.g[key] = child_g
+                side.parents[key] = current.packed
+                side.push(neighbor, child_g)
+
+                # ¿Lo alcanzó el otro sentido? Cualquier camino por aquí cuesta child_g + g_otro
+                other_g = other.g.get(key)
+                if other_g is not None and child_g + other_g < best_cost:
+                    best_cost = child_g + other_g
+                    meeting = key
+    finally:
+        # Cada lado evalúa la heurística en su raíz y en cada hijo que mejora su g
+        stats.count(nodes_expanded, generated, duplicates, 0, peak_open,
+                    len(forward.g) + len(backward.g), heuristic_calls=generated - duplicates + 2)
+
+    if best_cost == float('inf'):
+        return stats.finish(None)
+
+    # Unir ambas mitades en el tablero de encuentro
+    layout = initial_state.layout
+    keys = forward.path_to(meeting)[::-1] + backward.path_to(meeting)[1:]
+    path = [PuzzleState.from_packed(packed, layout.blank_index(packed), moves, layout=layout)
+            for moves, packed in enumerate(keys)]
+    return stats.finish(path)
+
+# Tablas de distancias abiertas, una por objetivo
+_distance_tables = {}
+
+@requires_solvable
+def table_search(initial_state, goal_state, budget=None):
+    if goal_state.layout is not LAYOUT_3:
+        raise ValueError("La tabla de distancias solo está disponible para el 8-puzzle")
+
+    stats = SearchStats(budget)
+    # La consulta es inmediata: el presupuesto solo se mira antes (p. ej. ya cancelado)
+    if budget is not None and budget.check(0):
+        return stats.finish(None)
+
+    table = _distance_tables.get(goal_state.packed)
+    if table is None:
+        # La primera vez se abre (o construye) la tabla; luego queda mapeada en memoria
+        table = DistanceTable(goal_state)
+        _distance_tables[goal_state.packed] = table
+
+    path, lookups = table.solve(initial_state)
+    return stats.count(lookups).finish(path)
 
 def reconstruct_path(state):
     path = []
@@ -0,0 +1,148 @@
+# Tabla completa de distancias al objetivo para el 8-puzzle
+# Se genera una sola vez con un BFS hacia atrás desde el objetivo y se guarda como
+# un byte por estado (indexado por ranking). Las búsquedas posteriores abren el
+# archivo con mmap y bajan por la tabla: una consulta por paso de la solución.
+import os
+import mmap
+import struct
+import zlib
+from puzzle.state import SIZE, BITS, MASK, MOVES, PuzzleState
+from puzzle.ranking import NUM_STATES, HALF, rank, parity
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+MAGIC = b"8PDT"
+VERSION = 1
+# magic, versión, lado del tablero, objetivo empaquetado, número de estados, crc32
+HEADER = struct.Struct("<4sHHQII")
+UNREACHABLE = 0xFF
+
+
+def build_distances(goal_state):
+    distances = bytearray([UNREACHABLE]) * NUM_STATES
+    goal_rank = rank(goal_state.packed)
+    distances[goal_rank] = 0
+
+    # BFS por capas sobre (tablero empaquetado, blanco, ranking)
+    frontier = [(goal_state.packed, goal_state.blank, goal_rank)]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for packed, blank, state_rank in frontier:
+            blank_shift = blank * BITS
+            for target in MOVES[blank]:
+                shift = target * BITS
+                tile = (packed >> shift) & MASK
+                child = packed - (tile << shift) + (tile << blank_shift)
+                if blank // SIZE == target // SIZE:
+                    key = state_rank + (target - blank) * HALF
+                else:
+                    key = rank(child)
+                if distances[key] == UNREACHABLE:
+                    distances[key] = depth
+                    next_frontier.append((child, target, key))
+        frontier = next_frontier
+
+    return distances
+
+
+def table_path(goal_state, directory=TABLE_DIR):
+    return os.path.join(directory, "distances_%x.bin" % goal_state.packed)
+
+
+def write_table(path, goal_state, distances):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    header = HEADER.pack(MAGIC, VERSION, SIZE, goal_state.packed, NUM_STATES, zlib.crc32(distances))
+    # Escribir a un temporal y renombrar para no dejar tablas a medias
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(distances)
+    os.replace(tmp_path, path)
+
+
+def _valid_table(data, goal_state):
+    if len(data) != HEADER.size + NUM_STATES:
+        return False
+    magic, version, size, goal, count, checksum = HEADER.unpack_from(data, 0)
+    return (magic == MAGIC and version == VERSION and size == SIZE and
+            goal == goal_state.packed and count == NUM_STATES and
+            zlib.crc32(data[HEADER.size:]) == checksum)
+
+
+class DistanceTable:
+    def __init__(self, goal_state, path=None):
+        self.goal_state = goal_state
+        self.path = path or table_path(goal_state)
+        self.goal_parity = parity(goal_state.packed)
+        self._file = None
+        self.data = self._open()
+        if self.data is None:
+            # Tabla ausente, de otra versión o corrupta: se reconstruye
+            write_table(self.path, goal_state, build_distances(goal_state))
+            self.data = self._open()
+
+    def _open(self):
+        if not os.path.exists(self.path):
+            return None
+        f = open(self.path, "rb")
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            f.close()
+            return None
+        if not _valid_table(data, self.goal_state):
+            data.close()
+            f.close()
+            return None
+        self._file = f
+        return data
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def distance(self, state):
+        # None si el estado pertenece a la otra clase de paridad (sin solución)
+        if parity(state.packed) != self.goal_parity:
+            return None
+        distance = self.data[HEADER.size + rank(state.packed)]
+        return None if distance == UNREACHABLE else distance
+
+    def solve(self, initial_state):
+        # Devuelve (camino, consultas a la tabla)
+        distance = self.distance(initial_state)
+        if distance is None:
+            return None, 1
+
+        lookups = 1
+        data = self.data
+        current = initial_state
+        path = [current]
+        while distance > 0:
+            # Algún vecino está exactamente un paso más cerca del objetivo
+            for neighbor in current.get_neighbors():
+                lookups += 1
+                if data[HEADER.size + rank(neighbor.packed)] == distance - 1:
+                    break
+            current = neighbor
+            distance -= 1
+            path.append(current)
+        return path, lookups
+
+
+if __name__ == "__main__":
+    import time
+    goal = PuzzleState([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+    start_time = time.perf_counter()
+    table = DistanceTable(goal)
+    print(f"Tabla lista en {time.perf_counter() - start_time:.2f} s: {table.path}")
+    print(f"Distancia máxima: {max(table.data[HEADER.size:])}")
+    table.close()
@@ -0,0 +1,172 @@
+# Generador de tableros resolubles del puzzle N x N
+# uniform: permutación uniforme de las fichas del objetivo (Fisher-Yates). Si cae en la
+# otra clase de paridad se intercambian dos fichas: eso empareja uno a uno los tableros
+# de las dos clases, así que el resultado es uniforme entre los resolubles. Todo en O(n).
+# at_depth: tablero uniforme entre los que están exactamente a esa distancia óptima del
+# objetivo. En 3x3 sale de la tabla de distancias (puzzle/distance_table.py); en otros
+# tamaños, de un BFS por capas desde el objetivo (solo viable a poca profundidad).
+#
+#   python -m puzzle.generator --count 1000 --seed 1 --output boards.jsonl
+#   python -m puzzle.generator --size 4 --depth 12 --count 100 --format csv > boards.csv
+#
+# La salida son trabajos de jobs.py ({"id", "board"} y "optimal" con --depth), listos
+# para batch.py.
+import sys
+import json
+import random
+from puzzle.state import PuzzleState, goal_board, get_layout, unpack_board
+
+# Estados que puede tener una capa del BFS antes de rendirse
+MAX_LAYER_STATES = 2000000
+
+
+def permutation_parity(tiles, size):
+    # La misma invariante que state.inversion_parity, pero en O(n): la paridad de las
+    # inversiones entre fichas es la de su permutación, (fichas - ciclos) mod 2; con
+    # lado par se suma la fila del blanco. Las fichas son 1..n-1 en cualquier orden.
+    numbers = [tile for tile in tiles if tile != 0]
+    seen = [False] * len(numbers)
+    cycles = 0
+    for start in range(len(numbers)):
+        if not seen[start]:
+            cycles += 1
+            index = start
+            while not seen[index]:
+                seen[index] = True
+                index = numbers[index] - 1
+    parity = (len(numbers) - cycles) & 1
+    if size % 2 == 0:
+        parity ^= (tiles.index(0) // size) & 1
+    return parity
+
+
+class BoardGenerator:
+    def __init__(self, size=3, seed=None, goal=None):
+        self.size = size
+        self.goal = goal or goal_board(size)
+        self.goal_tiles = [tile for row in self.goal for tile in row]
+        self.goal_parity = permutation_parity(self.goal_tiles, size)
+        self.rng = random.Random(seed)
+        self._table = None
+        self._layers = None  # capas del BFS: empaquetado -> posición del blanco
+        self._depths = {}    # profundidad -> candidatos (rankings o empaquetados)
+
+    def close(self):
+        if self._table is not None:
+            self._table.close()
+            self._table = None
+
+    def _board(self, tiles):
+        size = self.size
+        return [tiles[row * size:(row + 1) * size] for row in range(size)]
+
+    def uniform(self):
+        tiles = list(self.goal_tiles)
+        self.rng.shuffle(tiles)
+        if permutation_parity(tiles, self.size) != self.goal_parity:
+            # Intercambiar las dos primeras fichas (sin tocar el blanco) cambia la paridad
+            first = 0 if tiles[0] else 1
+            second = first + 1 if tiles[first + 1] else first + 2
+            tiles[first], tiles[second] = tiles[second], tiles[first]
+        return self._board(tiles)
+
+    def at_depth(self, depth):
+        candidates = self._depths.get(depth)
+        if candidates is None:
+            if self.size == 3:
+                candidates = self._table_depth(depth)
+            else:
+                candidates = list(self._bfs_layer(depth))
+            if not candidates:
+                raise ValueError(f"No hay tableros {self.size}x{self.size} a distancia {depth}")
+            self._depths[depth] = candidates
+        if self.size == 3:
+            from puzzle.ranking import unrank
+            packed, _ = unrank(self.rng.choice(candidates), self._table.goal_parity)
+            return unpack_board(packed)
+        return unpack_board(self.rng.choice(candidates), get_layout(self.size))
+
+    def _table_depth(self, depth):
+        # Rankings de todos los estados con esa distancia (un byte por estado en la tabla)
+        from puzzle.distance_table import DistanceTable, HEADER
+        if not 0 <= depth < 0xFF:
+            return []
+        if self._table is None:
+            self._table = DistanceTable(PuzzleState(self.goal))
+        data = self._table.data
+        target = bytes([depth])
+        ranks = []
+        offset = data.find(target, HEADER.size)
+        while offset >= 0:
+            ranks.append(offset - HEADER.size)
+            offset = data.find(target, offset + 1)
+        return ranks
+
+    def _bfs_layer(self, depth):
+        # El grafo del puzzle es bipartito: los vecinos de la capa d están en d - 1 o d + 1
+        layout = get_layout(self.size)
+        if self._layers is None:
+            goal = PuzzleState(self.goal)
+            self._layers = [{goal.packed: goal.blank}]
+        layers = self._layers
+        while len(layers) <= depth and layers[-1]:
+            previous = layers[-2] if len(layers) > 1 else {}
+            layer = {}
+            for packed, blank in layers[-1].items():
+                state = PuzzleState.from_packed(packed, blank, layout=layout)
+                for neighbor in state.get_neighbors(link_parent=False):
+                    if neighbor.packed not in previous:
+                        layer[neighbor.packed] = neighbor.blank
+            if len(layer) > MAX_LAYER_STATES:
+                raise ValueError(f"La capa {len(layers)} del BFS supera {MAX_LAYER_STATES} estados; "
+                                 f"usa una profundidad menor")
+            layers.append(layer)
+        return layers[depth] if depth < len(layers) else {}
+
+    def boards(self, count, depth=None):
+        for _ in range(count):
+            yield self.uniform() if depth is None else self.at_depth(depth)
+
+
+def write_boards(stream, boards, fmt="jsonl", depth=None):
+    if fmt == "csv":
+        stream.write("id,board\n")
+    for number, board in enumerate(boards, 1):
+        job_id = "board-%06d" % number
+        if fmt == "csv":
+            stream.write("%s,%s\n" % (job_id, " ".join(str(tile) for row in board for tile in row)))
+        else:
+            job = {"id": job_id, "board": board}
+            if depth is not None:
+                job["optimal"] = depth
+            stream.write(json.dumps(job) + "\n")
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Genera tableros resolubles uniformes o a una distancia exacta")
+    parser.add_argument("--size", type=int, default=3, help="lado del tablero")
+    parser.add_argument("--count", type=int, default=1, help="número de tableros")
+    parser.add_argument("--depth", type=int, default=None,
+                        help="distancia óptima exacta al objetivo (por defecto: uniforme)")
+    parser.add_argument("--seed", type=int, default=None, help="semilla para repetir la salida")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--output", default="-", help="archivo de salida (- = stdout)")
+    args = parser.parse_args(argv)
+    if args.size < 2:
+        parser.error("el lado del tablero debe ser al menos 2")
+
+    generator = BoardGenerator(args.size, args.seed)
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        write_boards(stream, generator.boards(args.count, args.depth), args.format, args.depth)
+    except ValueError as e:
+        parser.exit(1, f"{e}\n")
+    finally:
+        generator.close()
+        if stream is not sys.stdout:
+            stream.close()
+
+
+if __name__ == "__main__":
+    main()
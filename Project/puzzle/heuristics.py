@@ -1,63 +1,198 @@
 from puzzle.state import PuzzleState
 
 # Heurísticas
+# Cada heurística guarda su valor en el estado (h_ctx, h_value). Un hijo hereda el
+# valor del padre junto con la celda del blanco del padre (h_from) y, al evaluarlo,
+# solo se corrige la ficha movida: ±1 en Manhattan y las dos líneas afectadas en
+# los conflictos lineales. Las tablas del objetivo se calculan una vez por objetivo.
+#
+# delta(tiles, cell_of, table, tile, source, target) da el mismo ajuste sobre un
+# tablero plano ya modificado (la ficha pasó de source a target); lo usan los motores
+# que mueven fichas en sitio, como IDA* (puzzle/ida.py).
+
+class GoalTable:
+    __slots__ = ("size", "cells", "goal_cell", "goal_row", "goal_col", "distance")
+
+    def __init__(self, goal):
+        layout = goal.layout
+        size = self.size = layout.size
+        cells = self.cells = layout.cells
+
+        goal_cell = [0] * cells
+        for cell, tile in enumerate(goal.tiles()):
+            goal_cell[tile] = cell
+        self.goal_cell = goal_cell
+        self.goal_row = [cell // size for cell in goal_cell]
+        self.goal_col = [cell % size for cell in goal_cell]
+
+        # distance[ficha][celda]: distancia Manhattan de la ficha en esa celda (0 para el blanco)
+        self.distance = [
+            [0] * cells if tile == 0 else
+            [abs(cell // size - self.goal_row[tile]) + abs(cell % size - self.goal_col[tile])
+             for cell in range(cells)]
+            for tile in range(cells)
+        ]
+
+
+_goal_tables = {}
+
+
+def goal_table(goal):
+    key = (goal.layout.size, goal.packed)
+    table = _goal_tables.get(key)
+    if table is None:
+        table = _goal_tables[key] = GoalTable(goal)
+    return table
+
+
+class _Context:
+    # Identifica (heurística, objetivo) en los estados que guardan su valor
+    __slots__ = ("table",)
+
+    def __init__(self, table):
+        self.table = table
+
+
+class IncrementalHeuristic:
+    def __init__(self):
+        self._contexts = {}
+        self._last = (None, None, None)
+
+    def context(self, goal):
+        packed, layout, ctx = self._last
+        if packed == goal.packed and layout is goal.layout:
+            return ctx
+        key = (goal.layout.size, goal.packed)
+        ctx = self._contexts.get(key)
+        if ctx is None:
+            ctx = self._contexts[key] = _Context(goal_table(goal))
+        self._last = (goal.packed, goal.layout, ctx)
+        return ctx
+
+    def evaluate(self, state, goal):
+        ctx = self.context(goal)
+        if state.h_ctx is ctx:
+            if state.h_from >= 0:
+                state.h_value = self.update(state, ctx.table)
+                state.h_from = -1
+            return state.h_value
+
+        value = self.full(state.tiles(), ctx.table)
+        state.h_ctx = ctx
+        state.h_value = value
+        state.h_from = -1
+        return value
+
+    def moved_tile(self, state):
+        # La ficha que pasó de la celda del blanco actual a la del blanco del padre
+        layout = state.layout
+        return (state.packed >> (state.h_from * layout.bits)) & layout.mask
+
+
+class ManhattanHeuristic(IncrementalHeuristic):
+    def full(self, tiles, table):
+        distance = table.distance
+        total = 0
+        for cell, tile in enumerate(tiles):
+            total += distance[tile][cell]
+        return total
+
+    def update(self, state, table):
+        row = table.distance[self.moved_tile(state)]
+        return state.h_value + row[state.h_from] - row[state.blank]
+
+    def delta(self, tiles, cell_of, table, tile, source, target):
+        row = table.distance[tile]
+        return row[target] - row[source]
+
+
+class MisplacedTilesHeuristic(IncrementalHeuristic):
+    def full(self, tiles, table):
+        goal_cell = table.goal_cell
+        count = 0
+        for cell, tile in enumerate(tiles):
+            if tile != 0 and goal_cell[tile] != cell:
+                count += 1
+        return count
+
+    def update(self, state, table):
+        target = table.goal_cell[self.moved_tile(state)]
+        return state.h_value + (target != state.h_from) - (target != state.blank)
+
+    def delta(self, tiles, cell_of, table, tile, source, target):
+        goal = table.goal_cell[tile]
+        return (goal != target) - (goal != source)
+
+
+def _line_conflicts(line_tiles, line, goal_line, goal_order):
+    # Pares de fichas de esta línea que en el objetivo también están en ella pero en orden inverso
+    tiles_in_line = [tile for tile in line_tiles if tile != 0 and goal_line[tile] == line]
+    conflicts = 0
+    for i in range(len(tiles_in_line)):
+        order = goal_order[tiles_in_line[i]]
+        for j in range(i + 1, len(tiles_in_line)):
+            if order > goal_order[tiles_in_line[j]]:
+                conflicts += 1
+    return conflicts
+
+
+class LinearConflictHeuristic(IncrementalHeuristic):
+    def __init__(self):
+        super().__init__()
+        self.manhattan = ManhattanHeuristic()
+
+    def conflicts(self, tiles, table, rows, cols):
+        size, cells = table.size, table.cells
+        total = 0
+        for row in rows:
+            total += _line_conflicts(tiles[row * size:(row + 1) * size], row, table.goal_row, table.goal_col)
+        for col in cols:
+            total += _line_conflicts(tiles[col:cells:size], col, table.goal_col, table.goal_row)
+        return total
+
+    def full(self, tiles, table):
+        # Primero: distancia Manhattan; luego +2 por cada conflicto en filas y columnas
+        size = table.size
+        distance = self.manhattan.full(tiles, table)
+        return distance + 2 * self.conflicts(tiles, table, range(size), range(size))
+
+    def update(self, state, table):
+        tile = self.moved_tile(state)
+        return state.h_value + self.delta(state.tiles(), None, table, tile, state.blank, state.h_from)
+
+    def delta(self, tiles, cell_of, table, tile, source, target):
+        size = table.size
+        row = table.distance[tile]
+        distance_delta = row[target] - row[source]
+
+        # Solo cambian las dos columnas (movimiento horizontal) o las dos filas (vertical)
+        # entre las que se movió la ficha; el orden dentro de la otra línea se mantiene
+        if source // size == target // size:
+            rows, cols = (), (source % size, target % size)
+        else:
+            rows, cols = (source // size, target // size), ()
+        after = self.conflicts(tiles, table, rows, cols)
+        tiles[source], tiles[target] = tile, 0
+        before = self.conflicts(tiles, table, rows, cols)
+        tiles[source], tiles[target] = 0, tile
+
+        return distance_delta + 2 * (after - before)
+
+
+_manhattan = ManhattanHeuristic()
+_misplaced = MisplacedTilesHeuristic()
+_linear_conflict = LinearConflictHeuristic()
+
+
 def manhattan_distance(state, goal):
-    distance = 0
-    goal_positions = {}
-    
-    # Mapear posiciones objetivo
-    for i in range(3):
-        for j in range(3):
-            goal_positions[goal.board[i][j]] = (i, j)
-    
-    # Calcular distancia Manhattan
-    for i in range(3):
-        for j in range(3):
-            if state.board[i][j] != 0:
-                goal_i, goal_j = goal_positions[state.board[i][j]]
-                distance += abs(i - goal_i) + abs(j - goal_j)
-    
-    return distance
+    return _manhattan.evaluate(state, goal)
 
 def misplaced_tiles(state, goal):
-    count = 0
-    for i in range(3):
-        for j in range(3):
-            if state.board[i][j] != 0 and state.board[i][j] != goal.board[i][j]:
-                count += 1
-    return count
+    return _misplaced.evaluate(state, goal)
 
 def linear_conflict(state, goal):
-    # Primero: distancia Manhattan
-    distance = manhattan_distance(state, goal)
-    
-    # Construir mapa de posiciones objetivo
-    goal_positions = {}
-    for i in range(3):
-        for j in range(3):
-            goal_positions[goal.board[i][j]] = (i, j)
-    
-    # Revisar conflictos lineales en filas
-    for row in range(3):
-        tiles_in_row = [tile for tile in state.board[row] if tile != 0]
-        for i in range(len(tiles_in_row)):
-            for j in range(i + 1, len(tiles_in_row)):
-                tile1, tile2 = tiles_in_row[i], tiles_in_row[j]
-                goal_row1, goal_col1 = goal_positions[tile1]
-                goal_row2, goal_col2 = goal_positions[tile2]
-                if goal_row1 == row and goal_row2 == row and goal_col1 > goal_col2:
-                    distance += 2  # Conflicto en fila
-    
-    # Revisar conflictos lineales en columnas
-    for col in range(3):
-        tiles_in_col = [state.board[row][col] for row in range(3) if state.board[row][col] != 0]
-        for i in range(len(tiles_in_col)):
-            for j in range(i + 1, len(tiles_in_col)):
-                tile1, tile2 = tiles_in_col[i], tiles_in_col[j]
-                goal_row1, goal_col1 = goal_positions[tile1]
-                goal_row2, goal_col2 = goal_positions[tile2]
-                if goal_col1 == col and goal_col2 == col and goal_row1 > goal_row2:
-                    distance += 2  # Conflicto en columna
-    
-    return distance
+    return _linear_conflict.evaluate(state, goal)
 
+manhattan_distance.evaluator = _manhattan
+misplaced_tiles.evaluator = _misplaced
+linear_conflict.evaluator = _linear_conflict
@@ -0,0 +1,406 @@
+# Motor IDA* iterativo sin asignaciones por nodo
+# Un único tablero plano se modifica en sitio (hacer/deshacer movimiento) y la
+# recursión se sustituye por pilas explícitas indexadas por profundidad. En lugar de
+# buscar el estado en el camino se poda el movimiento inverso al anterior, y se
+# puede activar una tabla de transposición acotada (entero empaquetado -> g).
+import os
+import sys
+from puzzle.state import PuzzleState, get_layout
+
+INF = float("inf")
+
+
+class _FunctionEvaluator:
+    # Para heurísticas sin evaluador incremental: construye un estado por evaluación
+    def __init__(self, heuristic, layout):
+        self.heuristic = heuristic
+        self.layout = layout
+
+    def context(self, goal):
+        self.goal = goal
+        return self
+
+    @property
+    def table(self):
+        return None
+
+    def full(self, tiles, table):
+        layout = self.layout
+        packed = layout.pack(tiles)
+        state = PuzzleState.from_packed(packed, tiles.index(0), layout=layout)
+        return self.heuristic(state, self.goal)
+
+    def delta(self, tiles, cell_of, table, tile, source, target):
+        after = self.full(tiles, table)
+        tiles[source], tiles[target] = tile, 0
+        before = self.full(tiles, table)
+        tiles[source], tiles[target] = 0, tile
+        return after - before
+
+
+class IDAStats:
+    __slots__ = ("expanded", "generated", "iterations", "bound")
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.iterations = 0
+        self.bound = 0
+
+
+class IDAEngine:
+    def __init__(self, goal_state, heuristic, tt_size=0, cache=None):
+        layout = goal_state.layout
+        self.layout = layout
+        self.goal_state = goal_state
+        self.moves = layout.moves
+        self.bits = layout.bits
+        self.goal_packed = goal_state.packed
+
+        evaluator = getattr(heuristic, "evaluator", None)
+        if evaluator is None:
+            evaluator = _FunctionEvaluator(heuristic, layout)
+        self.evaluator = evaluator
+        self.table = evaluator.context(goal_state).table
+
+        # Tabla de transposición: se vacía en cada iteración y deja de crecer al llenarse
+        self.tt_size = tt_size
+        self.tt = {} if tt_size > 0 else None
+        # Evento de cancelación (IDA* paralelo); se consulta cada 4096 expansiones
+        self.stop = None
+        # Caché de soluciones (puzzle/solution_cache.py): distancia exacta de estados conocidos
+        self.cache = cache
+        # Presupuesto (utils.SearchBudget): se consulta en las expansiones que indica.
+        # best_h es la menor h expandida, que se informa como progreso.
+        self.budget = None
+        self.best_h = INF
+
+    def heuristic(self, tiles):
+        return self.evaluator.full(tiles, self.table)
+
+    def search(self, tiles, blank, g0, h0, prev_blank, bound, stats):
+        # DFS acotado por f <= bound desde (tiles, blank) con coste acumulado g0.
+        # Devuelve (celdas del blanco a lo largo de la solución o None, siguiente cota);
+        # la cota es None si la búsqueda se canceló o agotó el presupuesto. Con caché, la
+        # solución puede acabar en un estado conocido en lugar del objetivo (el resto sale
+        # de la caché).
+        moves = self.moves
+        bits = self.bits
+        delta = self.evaluator.delta
+        table = self.table
+        goal_packed = self.goal_packed
+        tt = self.tt
+        tt_size = self.tt_size
+        stop = self.stop
+        cache = self.cache
+        goal_state = self.goal_state
+        budget = self.budget
+        # Expansiones de esta llamada en que consultar el presupuesto (la primera, antes
+        # de expandir, para que la cancelación se note también entre iteraciones)
+        check_at = 0 if budget is not None else sys.maxsize
+        best_h = self.best_h
+        if tt is not None:
+            tt.clear()
+
+        tiles = list(tiles)
+        cell_of = [0] * len(tiles)
+        for cell, tile in enumerate(tiles):
+            cell_of[tile] = cell
+        packed = self.layout.pack(tiles)
+
+        # Pilas por profundidad: blanco, h, siguiente movimiento a probar, blanco anterior
+        blanks = [blank]
+        hs = [h0]
+        nexts = [0]
+        prevs = [prev_blank]
+        next_bound = INF
+        expanded = generated = 0
+        depth = 0
+
+        while True:
+            b = blanks[depth]
+            i = nexts[depth]
+            backtrack = False
+
+            if i == 0:
+                g = g0 + depth
+                f = g + hs[depth]
+                if cache is not None:
+                    distance = cache.distance_packed(packed, goal_state)
+                    if distance is not None:
+                        f = g + distance
+                        if f <= bound:
+                            stats.expanded += expanded
+                            stats.generated += generated
+                            return blanks[:depth + 1], bound
+                if f > bound:
+                    if f < next_bound:
+                        next_bound = f
+                    backtrack = True
+                elif packed == goal_packed:
+                    stats.expanded += expanded
+                    stats.generated += generated
+                    return blanks[:depth + 1], bound
+                elif tt is not None:
+                    seen_g = tt.get(packed)
+                    if seen_g is not None and seen_g <= g:
+                        backtrack = True
+                    elif seen_g is not None or len(tt) < tt_size:
+                        tt[packed] = g
+                if not backtrack:
+                    if hs[depth] < best_h:
+                        best_h = hs[depth]
+                    if expanded >= check_at:
+                        # El progreso informa de la profundidad como tamaño de la lista abierta
+                        self.best_h = best_h
+                        if budget.check(stats.expanded + expanded, depth + 1, bound, best_h):
+                            stats.expanded += expanded
+                            stats.generated += generated
+                            return None, None
+                        check_at = budget.next_check(stats.expanded + expanded) - stats.expanded
+                    expanded += 1
+                    if stop is not None and not expanded & 4095 and stop.is_set():
+                        stats.expanded += expanded
+                        stats.generated += generated
+                        return None, None
+
+            if not backtrack:
+                targets = moves[b]
+                while i < len(targets) and targets[i] == prevs[depth]:
+                    i += 1
+                if i < len(targets):
+                    nexts[depth] = i + 1
+                    t = targets[i]
+                    # Hacer movimiento: la ficha en t pasa a la celda del blanco
+                    tile = tiles[t]
+                    tiles[b] = tile
+                    tiles[t] = 0
+                    cell_of[tile] = b
+                    cell_of[0] = t
+                    packed += (tile << (b * bits)) - (tile << (t * bits))
+                    generated += 1
+
+                    h = hs[depth] + delta(tiles, cell_of, table, tile, t, b)
+                    depth += 1
+                    if depth == len(blanks):
+                        blanks.append(t)
+                        hs.append(h)
+                        nexts.append(0)
+                        prevs.append(b)
+                    else:
+                        blanks[depth] = t
+                        hs[depth] = h
+                        nexts[depth] = 0
+                        prevs[depth] = b
+                    continue
+
+            # Deshacer el movimiento que llevó a este nodo
+            if depth == 0:
+                stats.expanded += expanded
+                stats.generated += generated
+                return None, next_bound
+            depth -= 1
+            pb = blanks[depth]
+            tile = tiles[pb]
+            tiles[b] = tile
+            tiles[pb] = 0
+            cell_of[tile] = b
+            cell_of[0] = pb
+            packed += (tile << (b * bits)) - (tile << (pb * bits))
+
+
+def path_from_blanks(initial_state, blanks):
+    # Reconstruye los estados siguiendo las celdas sucesivas del blanco
+    path = [initial_state]
+    current = initial_state
+    for blank in blanks[1:]:
+        for neighbor in current.get_neighbors():
+            if neighbor.blank == blank:
+                current = neighbor
+                break
+        path.append(current)
+    return path
+
+
+def ida_star_search(initial_state, goal_state, heuristic, tt_size=0, cache=None, budget=None):
+    # Devuelve (camino o None, IDAStats)
+    stats = IDAStats()
+    engine = IDAEngine(goal_state, heuristic, tt_size, cache)
+    engine.budget = budget
+
+    tiles = initial_state.tiles()
+    h0 = engine.heuristic(tiles)
+    bound = h0
+    while True:
+        stats.iterations += 1
+        stats.bound = bound
+        blanks, next_bound = engine.search(tiles, initial_state.blank, 0, h0, -1, bound, stats)
+        if blanks is not None:
+            path = path_from_blanks(initial_state, blanks)
+            if path[-1] != goal_state:
+                path += cache.path_from(path[-1], goal_state)[1:]
+            return path, stats
+        if next_bound is None or next_bound == INF:
+            return None, stats
+        bound = next_bound
+
+
+# IDA* paralelo
+# Para cada cota f, el árbol se corta a poca profundidad y cada nodo de esa frontera
+# es una unidad de trabajo. Las unidades se envían en lotes pequeños a un
+# ProcessPoolExecutor: los procesos que terminan antes toman los lotes siguientes,
+# lo que reparte los subárboles desiguales. La primera solución a la cota actual es
+# óptima, así que al encontrarla se activa el evento compartido y se cancela el resto.
+_worker_engine = None
+
+
+def _init_worker(size, goal_packed, goal_blank, heuristic, tt_size, stop):
+    # El objetivo se reconstruye en el proceso para usar su propio BoardLayout
+    global _worker_engine
+    goal_state = PuzzleState.from_packed(goal_packed, goal_blank, layout=get_layout(size))
+    _worker_engine = IDAEngine(goal_state, heuristic, tt_size)
+    _worker_engine.stop = stop
+
+
+def _search_units(units, bound):
+    engine = _worker_engine
+    stats = IDAStats()
+    next_bound = INF
+    for tiles, blank, g, h, prev_blank, prefix in units:
+        if engine.stop.is_set():
+            break
+        blanks, unit_bound = engine.search(tiles, blank, g, h, prev_blank, bound, stats)
+        if blanks is not None:
+            return prefix[:-1] + tuple(blanks), bound, stats.expanded, stats.generated
+        if unit_bound is None:
+            break
+        if unit_bound < next_bound:
+            next_bound = unit_bound
+    return None, next_bound, stats.expanded, stats.generated
+
+
+def split_frontier(initial_state, goal_state, heuristic, depth, stats):
+    # Nodos a la profundidad indicada (sin deshacer el movimiento anterior) con las f de
+    # sus ancestros, más las soluciones encontradas antes de llegar a esa profundidad
+    frontier = []
+    goals = []
+
+    def expand(state, g, prev_blank, blanks, ancestor_fs):
+        h = heuristic(state, goal_state)
+        if state.packed == goal_state.packed:
+            goals.append((g, blanks, ancestor_fs))
+            return
+        if g == depth:
+            frontier.append((tuple(state.tiles()), state.blank, g, h, prev_blank, blanks, ancestor_fs))
+            return
+        stats.expanded += 1
+        for child in state.get_neighbors():
+            if child.blank != prev_blank:
+                stats.generated += 1
+                expand(child, g + 1, state.blank, blanks + (child.blank,), ancestor_fs + (g + h,))
+
+    expand(initial_state, 0, -1, (initial_state.blank,), ())
+    return frontier, goals
+
+
+def _first_exceeding(values, bound):
+    for value in values:
+        if value > bound:
+            return value
+    return None
+
+
+def _stop_pending(stop, pending, stats):
+    # Detiene a los procesos que siguen buscando y suma lo que llegaron a expandir
+    stop.set()
+    for future in pending:
+        future.cancel()
+    for future in pending:
+        if not future.cancelled():
+            _, _, expanded, generated = future.result()
+            stats.expanded += expanded
+            stats.generated += generated
+
+
+def parallel_ida_star_search(initial_state, goal_state, heuristic, workers=None,
+                             split_depth=None, tt_size=0, chunks_per_worker=8, budget=None):
+    # Devuelve (camino o None, IDAStats). La heurística debe poder enviarse a otros
+    # procesos (funciones de módulo o PatternDatabaseHeuristic, no lambdas).
+    # El presupuesto (y el progreso, con los lotes pendientes como lista abierta) se
+    # consulta en este proceso cada vez que termina un lote o cada 0,1 s: las
+    # expansiones cuentan al volver cada lote, no dentro de los procesos.
+    # multiprocessing y concurrent.futures cuestan más que el resto del motor en importarse
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    workers = workers or os.cpu_count() or 1
+    stats = IDAStats()
+
+    # Profundidad de corte: la menor que da suficientes unidades para repartir
+    min_units = workers * chunks_per_worker * 2
+    depth = split_depth or 1
+    while True:
+        split_stats = IDAStats()
+        frontier, goals = split_frontier(initial_state, goal_state, heuristic, depth, split_stats)
+        if split_depth or len(frontier) >= min_units or not frontier or depth >= 20:
+            break
+        depth += 1
+    stats.expanded += split_stats.expanded
+    stats.generated += split_stats.generated
+
+    bound = heuristic(initial_state, goal_state)
+    stop = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(goal_state.size, goal_state.packed, goal_state.blank,
+                                       heuristic, tt_size, stop)) as executor:
+        while True:
+            stats.iterations += 1
+            stats.bound = bound
+            next_bound = INF
+
+            # Soluciones más cortas que la profundidad de corte
+            best_goal = None
+            for g, blanks, ancestor_fs in goals:
+                if g <= bound and _first_exceeding(ancestor_fs, bound) is None:
+                    if best_goal is None or g < best_goal[0]:
+                        best_goal = (g, blanks)
+                elif g > bound:
+                    next_bound = min(next_bound, g)
+            if best_goal is not None:
+                return path_from_blanks(initial_state, best_goal[1]), stats
+
+            # Unidades cuyo camino desde la raíz no supera la cota
+            units = []
+            for tiles, blank, g, h, prev_blank, blanks, ancestor_fs in frontier:
+                exceeded = _first_exceeding(ancestor_fs, bound)
+                if exceeded is not None:
+                    next_bound = min(next_bound, exceeded)
+                else:
+                    units.append((tiles, blank, g, h, prev_blank, blanks))
+
+            chunk_size = max(1, len(units) // (workers * chunks_per_worker))
+            pending = {executor.submit(_search_units, units[i:i + chunk_size], bound)
+                       for i in range(0, len(units), chunk_size)}
+            solution = None
+            while pending and solution is None:
+                timeout = 0.1 if budget is not None else None
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if budget is not None and budget.check(stats.expanded, len(pending), bound):
+                    _stop_pending(stop, pending | done, stats)
+                    return None, stats
+                for future in done:
+                    blanks, unit_bound, expanded, generated = future.result()
+                    stats.expanded += expanded
+                    stats.generated += generated
+                    if blanks is not None:
+                        solution = blanks
+                    elif unit_bound is not None and unit_bound < next_bound:
+                        next_bound = unit_bound
+
+            if solution is not None:
+                # Cancelar lo pendiente y detener a los procesos que siguen buscando
+                _stop_pending(stop, pending, stats)
+                return path_from_blanks(initial_state, solution), stats
+
+            if next_bound == INF:
+                return None, stats
+            bound = next_bound
@@ -0,0 +1,349 @@
+# Bases de datos de patrones (PDB) aditivas y disjuntas
+# Cada patrón es un subconjunto de fichas; su tabla guarda, para cada colocación de
+# esas fichas, el mínimo de movimientos *de fichas del patrón* necesarios para
+# llevarlas a su celda objetivo. Como los patrones son disjuntos y solo se cuentan
+# sus propios movimientos, la suma de las tablas sigue siendo admisible.
+#
+# Las tablas se construyen con un BFS hacia atrás desde el objetivo sobre
+# (colocación, región del blanco): mover el blanco entre celdas libres cuesta 0,
+# así que cada expansión recorre toda la región alcanzable del blanco de una vez.
+# Se guardan como un byte por colocación y se abren con mmap.
+import os
+import mmap
+import struct
+import time
+import zlib
+from puzzle.state import get_layout
+from puzzle.heuristics import IncrementalHeuristic
+
+TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+MAGIC = b"NPDB"
+VERSION = 1
+# magic, versión, lado, número de fichas del patrón, número de entradas, crc32
+HEADER = struct.Struct("<4sHBBII")
+UNSEEN = 0xFF
+
+# Particiones predefinidas por lado del tablero (objetivo estándar, blanco al final)
+PARTITIONS = {
+    3: {
+        "44": ((1, 2, 4, 5), (3, 6, 7, 8)),
+    },
+    4: {
+        "555": ((1, 2, 5, 6, 9), (3, 4, 7, 8, 12), (10, 11, 13, 14, 15)),
+        "663": ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+        "78": ((1, 2, 3, 4, 5, 6, 7), (8, 9, 10, 11, 12, 13, 14, 15)),
+    },
+    5: {
+        "444444": ((1, 2, 6, 7), (3, 4, 5, 8), (9, 10, 14, 15), (11, 12, 16, 17),
+                   (13, 18, 19, 20), (21, 22, 23, 24)),
+        "6666": ((1, 2, 6, 7, 11, 12), (3, 4, 5, 8, 9, 10), (13, 14, 15, 18, 19, 20),
+                 (16, 17, 21, 22, 23, 24)),
+    },
+}
+DEFAULT_PARTITION = {3: "44", 4: "555", 5: "444444"}
+
+_POPCOUNT = bytes(bin(mask).count("1") for mask in range(1 << 16))
+
+
+def _popcount(mask):
+    return _POPCOUNT[mask & 0xFFFF] + _POPCOUNT[mask >> 16]
+
+
+def _placement_weights(cells, k):
+    # Pesos del ranking de k-permutaciones: la cifra i tiene base (cells - i)
+    weights = []
+    for i in range(k):
+        weight = 1
+        for j in range(i + 1, k):
+            weight *= cells - j
+        weights.append(weight)
+    return tuple(weights)
+
+
+def _placement_count(cells, k):
+    count = 1
+    for i in range(k):
+        count *= cells - i
+    return count
+
+
+def placement_rank(positions, weights):
+    index = 0
+    used = 0
+    for position, weight in zip(positions, weights):
+        index += (position - _popcount(used & ((1 << position) - 1))) * weight
+        used |= 1 << position
+    return index
+
+
+def build_pattern(layout, pattern, goal_tiles):
+    cells = layout.cells
+    moves = layout.moves
+    weights = _placement_weights(cells, len(pattern))
+    count = _placement_count(cells, len(pattern))
+
+    table = bytearray([UNSEEN]) * count
+    # Un bit por (colocación, celda del blanco) ya cubierta por alguna región expandida
+    seen = bytearray((count * cells + 7) >> 3)
+
+    goal_cell = [0] * cells
+    for cell, tile in enumerate(goal_tiles):
+        goal_cell[tile] = cell
+    frontier = [(tuple(goal_cell[tile] for tile in pattern), goal_cell[0])]
+    depth = 0
+
+    while frontier:
+        next_frontier = []
+        for positions, blank in frontier:
+            state_rank = placement_rank(positions, weights)
+            base = state_rank * cells
+            bit = base + blank
+            if seen[bit >> 3] & (1 << (bit & 7)):
+                continue
+            if table[state_rank] == UNSEEN:
+                table[state_rank] = depth
+
+            occupied = 0
+            where = {}
+            for index, position in enumerate(positions):
+                occupied |= 1 << position
+                where[position] = index
+
+            # Región del blanco: celdas libres conectadas (movimientos de coste 0)
+            region = [blank]
+            bit = base + blank
+            seen[bit >> 3] |= 1 << (bit & 7)
+            for cell in region:
+                for neighbor in moves[cell]:
+                    if occupied & (1 << neighbor):
+                        continue
+                    bit = base + neighbor
+                    if not seen[bit >> 3] & (1 << (bit & 7)):
+                        seen[bit >> 3] |= 1 << (bit & 7)
+                        region.append(neighbor)
+
+            # Movimientos de coste 1: una ficha del patrón entra en la región
+            for cell in region:
+                for neighbor in moves[cell]:
+                    if occupied & (1 << neighbor):
+                        index = where[neighbor]
+                        moved = positions[:index] + (cell,) + positions[index + 1:]
+                        bit = placement_rank(moved, weights) * cells + neighbor
+                        if not seen[bit >> 3] & (1 << (bit & 7)):
+                            next_frontier.append((moved, neighbor))
+        frontier = next_frontier
+        depth += 1
+
+    return table
+
+
+def pattern_path(size, pattern, goal_tiles, directory=TABLE_DIR):
+    goal_key = zlib.crc32(bytes(goal_tiles))
+    name = "pdb_%dx%d_%s_%08x.bin" % (size, size, "-".join(map(str, pattern)), goal_key)
+    return os.path.join(directory, name)
+
+
+def write_pattern(path, layout, pattern, goal_tiles, table):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    header = HEADER.pack(MAGIC, VERSION, layout.size, len(pattern), len(table), zlib.crc32(table))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(bytes(goal_tiles))
+        f.write(bytes(pattern))
+        f.write(table)
+    os.replace(tmp_path, path)
+
+
+class PatternDatabase:
+    def __init__(self, path, layout, pattern, goal_tiles):
+        self.path = path
+        self.layout = layout
+        self.pattern = tuple(pattern)
+        self.goal_tiles = tuple(goal_tiles)
+        self.weights = _placement_weights(layout.cells, len(pattern))
+        self.count = _placement_count(layout.cells, len(pattern))
+        self.offset = HEADER.size + layout.cells + len(pattern)
+        self._file = None
+        self.data = None
+
+    def open(self):
+        # Devuelve False si falta el archivo o no coincide (versión, objetivo, checksum)
+        if not os.path.exists(self.path):
+            return False
+        f = open(self.path, "rb")
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            f.close()
+            return False
+        if not self._valid(data):
+            data.close()
+            f.close()
+            return False
+        self._file = f
+        self.data = data
+        return True
+
+    def _valid(self, data):
+        if len(data) != self.offset + self.count:
+            return False
+        magic, version, size, k, count, checksum = HEADER.unpack_from(data, 0)
+        cells = self.layout.cells
+        return (magic == MAGIC and version == VERSION and size == self.layout.size and
+                k == len(self.pattern) and count == self.count and
+                data[HEADER.size:HEADER.size + cells] == bytes(self.goal_tiles) and
+                data[HEADER.size + cells:self.offset] == bytes(self.pattern) and
+                zlib.crc32(data[self.offset:]) == checksum)
+
+    def build(self):
+        start_time = time.perf_counter()
+        table = build_pattern(self.layout, self.pattern, self.goal_tiles)
+        write_pattern(self.path, self.layout, self.pattern, self.goal_tiles, table)
+        return time.perf_counter() - start_time
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def lookup(self, cell_of):
+        positions = [cell_of[tile] for tile in self.pattern]
+        return self.data[self.offset + placement_rank(positions, self.weights)]
+
+
+class PatternDatabaseHeuristic(IncrementalHeuristic):
+    # Heurística enchufable (mismo contrato que manhattan_distance): h(state, goal)
+    def __init__(self, size, partition, databases, directory):
+        super().__init__()
+        self.size = size
+        self.partition = partition
+        self.directory = directory
+        self.databases = databases
+        self.layout = databases[0].layout
+        self.goal_tiles = list(databases[0].goal_tiles)
+        self.evaluator = self
+        # Patrón al que pertenece cada ficha (None si no está en ninguno)
+        self.database_of = [None] * self.layout.cells
+        for database in databases:
+            for tile in database.pattern:
+                self.database_of[tile] = database
+
+    def __call__(self, state, goal):
+        return self.evaluate(state, goal)
+
+    def __reduce__(self):
+        # Los procesos hijos vuelven a abrir los archivos en lugar de copiar los mmap
+        return (load_pdb_heuristic, (self.size, self.partition, self.directory))
+
+    def context(self, goal):
+        packed, layout, ctx = self._last
+        if packed != goal.packed or layout is not goal.layout:
+            if goal.layout is not self.layout or goal.tiles() != self.goal_tiles:
+                raise ValueError("La PDB se construyó para otro objetivo")
+        return super().context(goal)
+
+    def full(self, tiles, table):
+        cell_of = [0] * len(tiles)
+        for cell, tile in enumerate(tiles):
+            cell_of[tile] = cell
+        total = 0
+        for database in self.databases:
+            total += database.lookup(cell_of)
+        return total
+
+    def update(self, state, table):
+        tile = self.moved_tile(state)
+        if self.database_of[tile] is None:
+            return state.h_value
+
+        cell_of = [0] * self.layout.cells
+        for cell, value in enumerate(state.tiles()):
+            cell_of[value] = cell
+        return state.h_value + self.delta(None, cell_of, table, tile, state.blank, state.h_from)
+
+    def delta(self, tiles, cell_of, table, tile, source, target):
+        # Solo cambia el patrón de la ficha movida
+        database = self.database_of[tile]
+        if database is None:
+            return 0
+        after = database.lookup(cell_of)
+        cell_of[tile] = source
+        before = database.lookup(cell_of)
+        cell_of[tile] = target
+        return after - before
+
+
+_loaded = {}
+
+
+def load_pdb_heuristic(size=4, partition=None, directory=TABLE_DIR, build=True):
+    partition = partition or DEFAULT_PARTITION[size]
+    key = (size, partition, directory)
+    heuristic = _loaded.get(key)
+    if heuristic is not None:
+        return heuristic
+
+    layout = get_layout(size)
+    goal_tiles = list(layout.goal_tiles)
+    databases = []
+    for pattern in PARTITIONS[size][partition]:
+        database = PatternDatabase(pattern_path(size, pattern, goal_tiles, directory),
+                                   layout, pattern, goal_tiles)
+        if not database.open():
+            if not build:
+                raise FileNotFoundError(f"Falta la PDB {database.path}")
+            database.build()
+            database.open()
+        databases.append(database)
+
+    heuristic = _loaded[key] = PatternDatabaseHeuristic(size, partition, databases, directory)
+    return heuristic
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Construye bases de datos de patrones aditivas")
+    parser.add_argument("--size", type=int, default=4, choices=sorted(PARTITIONS))
+    parser.add_argument("--partition", default=None,
+                        help="partición predefinida (por defecto: %s)" % DEFAULT_PARTITION)
+    parser.add_argument("--dir", default=TABLE_DIR, help="directorio de salida")
+    parser.add_argument("--force", action="store_true", help="reconstruir aunque ya existan")
+    args = parser.parse_args(argv)
+
+    partition = args.partition or DEFAULT_PARTITION[args.size]
+    if partition not in PARTITIONS[args.size]:
+        parser.error(f"particiones para {args.size}x{args.size}: {', '.join(PARTITIONS[args.size])}")
+
+    layout = get_layout(args.size)
+    goal_tiles = list(layout.goal_tiles)
+    total_bytes = 0
+    total_time = 0.0
+    for pattern in PARTITIONS[args.size][partition]:
+        database = PatternDatabase(pattern_path(args.size, pattern, goal_tiles, args.dir),
+                                   layout, pattern, goal_tiles)
+        if not args.force and database.open():
+            elapsed = 0.0
+            status = "existente"
+        else:
+            elapsed = database.build()
+            database.open()
+            status = "construida"
+        size_bytes = os.path.getsize(database.path)
+        max_value = max(database.data[database.offset:])
+        database.close()
+        total_bytes += size_bytes
+        total_time += elapsed
+        print(f"patrón {pattern}: {status} en {elapsed:.1f} s, {size_bytes / 1024:.1f} KiB, "
+              f"valor máximo {max_value}")
+    print(f"Total {args.size}x{args.size} ({partition}): {total_time:.1f} s, {total_bytes / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Ranking denso de los estados del 8-puzzle
+# índice = celda del blanco * 8!/2 + (código de Lehmer de las 8 fichas) // 2
+# Las dos últimas cifras del código de Lehmer quedan fijadas por la paridad de
+# la permutación, así que cada clase de paridad ocupa exactamente [0, 181440).
+# Un estado y todos los alcanzables desde él comparten clase, por lo que dentro
+# de una búsqueda el índice es único.
+from array import array
+from math import factorial
+from utils import BitSet
+from puzzle.state import SIZE, CELLS, BITS, MASK, PuzzleState
+
+TILES = CELLS - 1
+HALF = factorial(TILES) // 2
+NUM_STATES = CELLS * HALF
+
+# Peso de cada cifra del código de Lehmer (ya dividido entre 2)
+_WEIGHTS = tuple(factorial(TILES - 1 - i) // 2 for i in range(TILES - 2))
+# Número de bits encendidos de cada máscara de fichas vistas
+_POPCOUNT = bytes(bin(mask).count("1") for mask in range(1 << CELLS))
+
+
+def _lehmer_digits(packed):
+    # Devuelve (celda del blanco, cifras de Lehmer de las fichas sin el blanco)
+    digits = []
+    blank = 0
+    seen = 0
+    for index in range(CELLS):
+        tile = (packed >> (index * BITS)) & MASK
+        if tile == 0:
+            blank = index
+            continue
+        # fichas menores que aún no aparecieron = fichas menores a la derecha
+        digits.append(tile - 1 - _POPCOUNT[seen & ((1 << tile) - 1)])
+        seen |= 1 << tile
+    return blank, digits
+
+
+def parity(packed):
+    # Paridad de las inversiones entre fichas (sin contar el blanco)
+    _, digits = _lehmer_digits(packed)
+    return sum(digits) & 1
+
+
+def rank(packed):
+    blank, digits = _lehmer_digits(packed)
+    index = 0
+    for digit, weight in zip(digits, _WEIGHTS):
+        index += digit * weight
+    return blank * HALF + index
+
+
+def child_rank(parent_rank, parent_blank, child):
+    # Un movimiento horizontal no cambia el orden de las fichas: solo se desplaza
+    # la celda del blanco. Los verticales sí requieren recalcular el ranking.
+    if parent_blank // SIZE == child.blank // SIZE:
+        return parent_rank + (child.blank - parent_blank) * HALF
+    return rank(child.packed)
+
+
+def unrank(index, parity):
+    blank, rest = divmod(index, HALF)
+    digits = []
+    for weight in _WEIGHTS:
+        digit, rest = divmod(rest, weight)
+        digits.append(digit)
+    # La penúltima cifra completa la paridad pedida; la última siempre es 0
+    digits.append((parity - sum(digits)) & 1)
+    digits.append(0)
+
+    available = list(range(1, CELLS))
+    tiles = [available.pop(digit) for digit in digits]
+    tiles.insert(blank, 0)
+
+    packed = 0
+    for cell, tile in enumerate(tiles):
+        packed |= tile << (cell * BITS)
+    return packed, blank
+
+
+class ParentTable:
+    # Tabla de padres indexada por ranking; -1 = sin visitar, la raíz apunta a sí misma
+    def __init__(self, parity):
+        self.parity = parity
+        self.parents = array("i", [-1]) * NUM_STATES
+
+    def set(self, child_rank, parent_rank):
+        self.parents[child_rank] = parent_rank
+
+    def path(self, goal_rank):
+        ranks = [goal_rank]
+        current = goal_rank
+        while self.parents[current] != current:
+            current = self.parents[current]
+            ranks.append(current)
+        ranks.reverse()
+
+        path = []
+        parent = None
+        for moves, state_rank in enumerate(ranks):
+            packed, blank = unrank(state_rank, self.parity)
+            parent = PuzzleState.from_packed(packed, blank, moves, parent)
+            path.append(parent)
+        return path
+
+
+class PackedParentTable:
+    # Equivalente para tableros mayores (sin ranking denso): diccionario por entero empaquetado
+    def __init__(self, layout):
+        self.layout = layout
+        self.parents = {}
+
+    def set(self, child_key, parent_key):
+        self.parents[child_key] = parent_key
+
+    def path(self, goal_key):
+        keys = [goal_key]
+        current = goal_key
+        while self.parents[current] != current:
+            current = self.parents[current]
+            keys.append(current)
+        keys.reverse()
+
+        layout = self.layout
+        path = []
+        parent = None
+        for moves, packed in enumerate(keys):
+            parent = PuzzleState.from_packed(packed, layout.blank_index(packed), moves, parent, layout)
+            path.append(parent)
+        return path
+
+
+def state_rank(state):
+    return rank(state.packed)
+
+
+def state_packed(state):
+    return state.packed
+
+
+def child_packed(parent_key, parent_blank, child):
+    return child.packed
+
+
+class SearchTables:
+    # Lista cerrada, tabla de padres y funciones de clave para una búsqueda.
+    # 8-puzzle: bitset + array('i') sobre el ranking denso.
+    # Tableros mayores: conjunto y diccionario sobre el entero empaquetado.
+    def __init__(self, initial_state):
+        if initial_state.layout.cells == CELLS:
+            self.visited = BitSet(NUM_STATES)
+            self.parents = ParentTable(parity(initial_state.packed))
+            self.key = state_rank
+            self.child_key = child_rank
+        else:
+            self.visited = set()
+            self.parents = PackedParentTable(initial_state.layout)
+            self.key = state_packed
+            self.child_key = child_packed
@@ -0,0 +1,103 @@
+# Caché de soluciones óptimas
+# Todo sufijo de un camino óptimo es óptimo: tras resolver, cada estado del camino se
+# guarda con la celda del blanco tras su siguiente movimiento y su distancia al
+# objetivo. Las búsquedas consultan la caché para parar al llegar a un estado conocido
+# (a_star, bfs, ida_star en puzzle/algorithms.py).
+#
+# La memoria es un LRU acotado por número de entradas. Cada camino se inserta del
+# inicio al objetivo y path_from refresca la cadena en ese mismo orden, así que el
+# sucesor de una entrada siempre es más reciente que ella y nunca se desaloja antes:
+# las cadenas en memoria no se rompen. El nivel en disco (dbm) es opcional y no desaloja.
+import dbm
+from collections import OrderedDict
+
+
+class SolutionCache:
+    def __init__(self, max_entries=200000, path=None):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()   # (lado, objetivo, tablero) -> (blanco siguiente, distancia)
+        self.disk = dbm.open(path, "c") if path else None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+    @staticmethod
+    def _key(packed, goal):
+        return (goal.layout.size, goal.packed, packed)
+
+    @staticmethod
+    def _disk_key(key):
+        return ("%d:%x:%x" % key).encode("ascii")
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is None and self.disk is not None:
+            value = self.disk.get(self._disk_key(key))
+            if value is not None:
+                next_blank, distance = value.split()
+                entry = (int(next_blank), int(distance))
+                self._put(key, entry, write_disk=False)
+        return entry
+
+    def _put(self, key, entry, write_disk=True):
+        if self.max_entries > 0:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        if write_disk and self.disk is not None:
+            self.disk[self._disk_key(key)] = ("%d %d" % entry).encode("ascii")
+
+    def distance(self, state, goal):
+        # Distancia exacta al objetivo, o None si el estado no está en la caché
+        entry = self._get(self._key(state.packed, goal))
+        return None if entry is None else entry[1]
+
+    def distance_packed(self, packed, goal):
+        entry = self._get(self._key(packed, goal))
+        return None if entry is None else entry[1]
+
+    def record(self, path, goal):
+        # Guarda un camino óptimo (lista de estados que termina en el objetivo)
+        if not path or path[-1] != goal:
+            return
+        last = len(path) - 1
+        for i, state in enumerate(path):
+            next_blank = path[i + 1].blank if i < last else -1
+            self._put(self._key(state.packed, goal), (next_blank, last - i))
+
+    def path_from(self, state, goal):
+        # Camino óptimo desde state siguiendo la caché, o None si no está
+        keys = []
+        current = state
+        path = [current]
+        entry = self._get(self._key(current.packed, goal))
+        if entry is None:
+            self.misses += 1
+            return None
+        while entry[1] > 0:
+            keys.append(self._key(current.packed, goal))
+            for neighbor in current.get_neighbors():
+                if neighbor.blank == entry[0]:
+                    current = neighbor
+                    break
+            else:
+                return None
+            path.append(current)
+            entry = self._get(self._key(current.packed, goal))
+            if entry is None:
+                return None
+        keys.append(self._key(current.packed, goal))
+        # Refrescar la cadena del inicio al objetivo (ver arriba)
+        for key in keys:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+        self.hits += 1
+        return path
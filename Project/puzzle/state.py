@@ -1,39 +1,195 @@
-# Estado del 8-puzzle
+# Estado del N-puzzle (8, 15, 24...)
+# El tablero se guarda empaquetado en un solo entero: BITS bits por ficha,
+# la celda 0 (esquina superior izquierda) ocupa los bits menos significativos.
+
+
+class BoardLayout:
+    # Tablas precalculadas para un lado dado: bits por ficha, vecinos del blanco
+    # (arriba, abajo, izquierda, derecha) y el objetivo estándar con el blanco al final
+    __slots__ = ("size", "cells", "bits", "mask", "moves", "goal_tiles", "goal_positions")
+
+    def __init__(self, size):
+        self.size = size
+        self.cells = size * size
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+
+        moves = []
+        for index in range(self.cells):
+            row, col = divmod(index, size)
+            targets = []
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                new_row, new_col = row + dr, col + dc
+                if 0 <= new_row < size and 0 <= new_col < size:
+                    targets.append(new_row * size + new_col)
+            moves.append(tuple(targets))
+        self.moves = tuple(moves)
+
+        self.goal_tiles = tuple(list(range(1, self.cells)) + [0])
+        # goal_positions[ficha] = (fila, columna) en el objetivo estándar
+        positions = [None] * self.cells
+        for index, tile in enumerate(self.goal_tiles):
+            positions[tile] = divmod(index, size)
+        self.goal_positions = tuple(positions)
+
+    def pack(self, tiles):
+        packed = 0
+        bits = self.bits
+        for index, tile in enumerate(tiles):
+            packed |= tile << (index * bits)
+        return packed
+
+    def unpack(self, packed):
+        bits, mask = self.bits, self.mask
+        return [(packed >> (index * bits)) & mask for index in range(self.cells)]
+
+    def blank_index(self, packed):
+        bits, mask = self.bits, self.mask
+        for index in range(self.cells):
+            if (packed >> (index * bits)) & mask == 0:
+                return index
+        raise ValueError("El tablero no tiene espacio en blanco")
+
+
+_layouts = {}
+
+
+def get_layout(size):
+    layout = _layouts.get(size)
+    if layout is None:
+        layout = _layouts[size] = BoardLayout(size)
+    return layout
+
+
+def goal_board(size=3):
+    tiles = list(get_layout(size).goal_tiles)
+    return [tiles[row * size:(row + 1) * size] for row in range(size)]
+
+
+# Constantes del 8-puzzle (ranking denso y tabla de distancias)
+LAYOUT_3 = get_layout(3)
+SIZE = LAYOUT_3.size
+CELLS = LAYOUT_3.cells
+BITS = LAYOUT_3.bits
+MASK = LAYOUT_3.mask
+MOVES = LAYOUT_3.moves
+
+
+def pack_board(board):
+    return get_layout(len(board)).pack([tile for row in board for tile in row])
+
+
+def unpack_tiles(packed, layout=LAYOUT_3):
+    return layout.unpack(packed)
+
+
+def unpack_board(packed, layout=LAYOUT_3):
+    tiles = layout.unpack(packed)
+    size = layout.size
+    return [tiles[row * size:(row + 1) * size] for row in range(size)]
+
+
+def inversion_parity(tiles):
+    # Invariante de paridad de un tablero N x N dado como lista plana:
+    # inversiones entre fichas y, si el lado es par, también la fila del blanco
+    size = int(round(len(tiles) ** 0.5))
+    inversions = 0
+    numbers = [tile for tile in tiles if tile != 0]
+    for i in range(len(numbers)):
+        tile = numbers[i]
+        for j in range(i + 1, len(numbers)):
+            if numbers[j] < tile:
+                inversions += 1
+    if size % 2 == 0:
+        inversions += tiles.index(0) // size
+    return inversions & 1
+
+
+def is_solvable(state, goal_state):
+    tiles = state.tiles()
+    goal_tiles = goal_state.tiles()
+    if sorted(tiles) != sorted(goal_tiles):
+        return False
+    return inversion_parity(tiles) == inversion_parity(goal_tiles)
+
+
 class PuzzleState:
+    # h_ctx/h_value/h_from: valor de heurística guardado (ver puzzle/heuristics.py)
+    __slots__ = ("packed", "blank", "moves", "parent", "layout", "h_ctx", "h_value", "h_from")
+
     def __init__(self, board, moves=0, parent=None):
-        self.board = board
+        self.layout = get_layout(len(board))
+        self.packed = self.layout.pack([tile for row in board for tile in row])
         self.moves = moves
         self.parent = parent
-        self.blank_pos = self.find_blank()
-    
+        self.blank = self.layout.blank_index(self.packed)
+        self.h_ctx = None
+        self.h_value = 0
+        self.h_from = -1
+
+    @classmethod
+    def from_packed(cls, packed, blank, moves=0, parent=None, layout=LAYOUT_3):
+        state = cls.__new__(cls)
+        state.packed = packed
+        state.blank = blank
+        state.moves = moves
+        state.parent = parent
+        state.layout = layout
+        state.h_ctx = None
+        state.h_value = 0
+        state.h_from = -1
+        return state
+
+    @property
+    def size(self):
+        return self.layout.size
+
     def find_blank(self):
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == 0:
-                    return (i, j)
-    
-    def get_neighbors(self):
+        return divmod(self.blank, self.layout.size)
+
+    @property
+    def blank_pos(self):
+        return divmod(self.blank, self.layout.size)
+
+    @property
+    def board(self):
+        return unpack_board(self.packed, self.layout)
+
+    def tiles(self):
+        return self.layout.unpack(self.packed)
+
+    def get_neighbors(self, link_parent=True):
+        # link_parent=False evita la cadena de padres cuando la búsqueda guarda su propia tabla
         neighbors = []
-        row, col = self.blank_pos
-        
-        # Movimientos posibles: arriba, abajo, izquierda, derecha
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if 0 <= new_row < 3 and 0 <= new_col < 3:
-                new_board = [row[:] for row in self.board]
-                new_board[row][col], new_board[new_row][new_col] = \
-                    new_board[new_row][new_col], new_board[row][col]
-                neighbors.append(PuzzleState(new_board, self.moves + 1, self))
-        
+        parent = self if link_parent else None
+        layout = self.layout
+        bits, mask = layout.bits, layout.mask
+        packed = self.packed
+        blank_shift = self.blank * bits
+        moves = self.moves + 1
+        # Los hijos heredan la heurística ya evaluada para corregirla por delta
+        h_ctx = self.h_ctx if self.h_from < 0 else None
+
+        # Mover el blanco equivale a llevar la ficha destino a la celda del blanco
+        for target in layout.moves[self.blank]:
+            shift = target * bits
+            tile = (packed >> shift) & mask
+            child = PuzzleState.from_packed(packed - (tile << shift) + (tile << blank_shift),
+                                            target, moves, parent, layout)
+            if h_ctx is not None:
+                child.h_ctx = h_ctx
+                child.h_value = self.h_value
+                child.h_from = self.blank
+            neighbors.append(child)
+
         return neighbors
-    
+
     def __eq__(self, other):
-        return self.board == other.board
-    
+        return (isinstance(other, PuzzleState) and self.packed == other.packed
+                and self.layout is other.layout)
+
     def __hash__(self):
-        return hash(str(self.board))
-    
+        return hash(self.packed)
+
     def __lt__(self, other):
-        return self.moves < other.moves
\ No newline at end of file
+        return self.moves < other.moves
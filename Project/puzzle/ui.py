@@ -1,5 +1,4 @@
 import threading
-import random
 from kivy.app import App
 from kivy.uix.button import Button
 from kivy.uix.gridlayout import GridLayout
@@ -14,16 +13,48 @@ from kivy.graphics import Color, Rectangle, Line
 from kivy.metrics import dp
 from kivy.core.text import Label as CoreLabel
 
-# Importar las funciones de algoritmos y heurísticas desde tus otros módulos
-from puzzle.state import PuzzleState
-from puzzle.algorithms import (
-    bfs, dfs, ucs, greedy, ida_star, weighted_a_star, 
-    rbfs, a_star, bidirectional_search
-)
-from puzzle.heuristics import (
-    manhattan_distance, misplaced_tiles, linear_conflict
-)
-from puzzle.algorithms import compare_heuristics
+# Los algoritmos y heurísticas salen del registro (registry.py) y se importan al elegirlos
+from puzzle.state import PuzzleState, is_solvable, goal_board
+from puzzle.solution_cache import SolutionCache
+from puzzle.generator import BoardGenerator
+from registry import PUZZLE, MAZE, get_solver, get_heuristic, solver_pairs, pair_label
+from comparison import Comparison, comparison_jobs
+from utils import SearchBudget
+
+# Límite de tiempo de una resolución desde la interfaz (segundos)
+SOLVE_TIME_LIMIT = 120
+
+# Motivos por los que se detiene una búsqueda (SearchBudget.reason)
+STOP_REASONS = {
+    'nodes': 'límite de nodos',
+    'time': 'límite de tiempo',
+    'memory': 'límite de memoria',
+}
+
+# Intervalo mínimo entre redibujados del progreso (segundos)
+PROGRESS_INTERVAL = 0.25
+
+def progress_text(report):
+    # Resumen de un utils.SearchProgress para la etiqueta de estado
+    text = f"{report.nodes:,} nodos ({report.nodes_per_second:,.0f}/s)"
+    if report.open_size is not None:
+        text += f" · abiertos {report.open_size:,}"
+    if report.bound is not None:
+        text += f" · f {report.bound:g}"
+    if report.best_h is not None:
+        text += f" · mejor h {report.best_h:g}"
+    return text
+
+def solver_choices(kind, size=None):
+    # Etiqueta del selector -> (algoritmo, heurística o None) del registro
+    return {pair_label(solver, heuristic): (solver, heuristic)
+            for solver, heuristic in solver_pairs(kind, size=size)}
+
+def comparison_label(job):
+    # Nombre corto de un trabajo de comparación para los gráficos
+    kind = MAZE if 'maze' in job else PUZZLE
+    heuristic = get_heuristic(kind, job['heuristic']) if job.get('heuristic') else None
+    return pair_label(get_solver(kind, job['algorithm']), heuristic, short=True)
 
 class PuzzleTile(Button):
     def __init__(self, value, puzzle_grid, **kwargs):
@@ -46,24 +77,58 @@ class PuzzleTile(Button):
     def on_press(self):
         self.puzzle_grid.tile_pressed(self)
 
+def initial_board(size):
+    # Tablero inicial a dos movimientos del objetivo ([[1, 2, 3], [4, 0, 5], [7, 8, 6]] en 3x3)
+    board = goal_board(size)
+    last = size - 1
+    board[last][last], board[last - 1][last] = board[last - 1][last], board[last][last]
+    board[last - 1][last], board[last - 1][last - 1] = board[last - 1][last - 1], board[last - 1][last]
+    return board
+
+# Distancia óptima de los tableros mezclados por tamaño. Un 4x4 o 5x5 uniforme está a
+# 50-100 movimientos y no se resuelve dentro de SOLVE_TIME_LIMIT; el BFS de at_depth
+# hasta estas capas tarda menos de un segundo. El 3x3 se mezcla uniforme.
+RANDOM_DEPTHS = {4: 16, 5: 14}
+
+# Un generador por tamaño: las capas del BFS se calculan solo en la primera mezcla
+_generators = {}
+
+def random_board(size):
+    # Tablero resoluble (puzzle/generator.py), no una mezcla corta desde el objetivo
+    generator = _generators.get(size)
+    if generator is None:
+        generator = _generators[size] = BoardGenerator(size)
+    depth = RANDOM_DEPTHS.get(size)
+    return generator.uniform() if depth is None else generator.at_depth(depth)
+
 class PuzzleGrid(GridLayout):
-    def __init__(self, **kwargs):
+    def __init__(self, size=3, **kwargs):
         super().__init__(**kwargs)
-        self.cols = 3
-        self.rows = 3
         self.spacing = 5
         self.padding = 10
         self.tiles = []
-        self.board = [[1, 2, 3], [4, 0, 5], [7, 8, 6]]
+        self.on_change = None  # se llama cada vez que cambia el tablero
+        self.set_size(size)
+    
+    def changed(self):
+        if self.on_change:
+            self.on_change()
+    
+    def set_size(self, size):
+        self.size_n = size
+        self.cols = size
+        self.rows = size
+        self.board = initial_board(size)
         self.create_tiles()
+        self.changed()
         
     def create_tiles(self):
         self.clear_widgets()
         self.tiles = []
         
-        for i in range(3):
+        for i in range(self.size_n):
             row = []
-            for j in range(3):
+            for j in range(self.size_n):
                 tile = PuzzleTile(self.board[i][j], self)
                 tile.size_hint = (1, 1)
                 self.add_widget(tile)
@@ -75,8 +140,8 @@ class PuzzleGrid(GridLayout):
         tile_pos = None
         blank_pos = None
         
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.size_n):
+            for j in range(self.size_n):
                 if self.tiles[i][j] == pressed_tile:
                     tile_pos = (i, j)
                 if self.tiles[i][j].value == 0:
@@ -104,10 +169,14 @@ class PuzzleGrid(GridLayout):
         
         self.tiles[pos1[0]][pos1[1]].update_appearance()
         self.tiles[pos2[0]][pos2[1]].update_appearance()
+        self.changed()
     
     def set_board(self, new_board):
+        if len(new_board) != self.size_n:
+            self.size_n = self.cols = self.rows = len(new_board)
         self.board = [row[:] for row in new_board]
         self.create_tiles()
+        self.changed()
     
     def get_board(self):
         return [row[:] for row in self.board]
@@ -140,15 +209,22 @@ class ResultPopup(Popup):
         content.add_widget(close_btn)
         
         self.content = content
+        self.result_label = result_label
 
 class BarChart(Widget):
-    def __init__(self, data, title, y_label, **kwargs):
+    def __init__(self, data, title, y_label, value_format="{:.5f}", **kwargs):
         super().__init__(**kwargs)
         self.data = data
         self.title = title
         self.y_label = y_label
+        self.value_format = value_format
         self.bind(size=self.draw_chart, pos=self.draw_chart)
     
+    def add(self, label, value):
+        # Añade una barra y redibuja (resultados que llegan de uno en uno)
+        self.data.append((label, value))
+        self.draw_chart()
+    
     def draw_chart(self, *args):
         self.canvas.clear()
         if not self.data:
@@ -211,19 +287,22 @@ class BarChart(Widget):
 
                 # ---- TEXTO DE VALOR ENCIMA ----
                 if value is not None:
-                    label_val = CoreLabel(text=f"{value:.5f}", font_size=12)
+                    label_val = CoreLabel(text=self.value_format.format(value), font_size=12)
                     label_val.refresh()
                     texture = label_val.texture
-                    Rectangle(texture=texture, pos=(bar_x + bar_width/2 - texture.size[0]/2,
-                                                    bar_y + bar_height + 5),
-                              size=texture.size)
+                    # Con muchas barras el valor no cabe sobre la suya: se omite
+                    if texture.size[0] <= bar_width + spacing:
+                        Rectangle(texture=texture, pos=(bar_x + bar_width/2 - texture.size[0]/2,
+                                                        bar_y + bar_height + 5),
+                                  size=texture.size)
 
                 # ---- TEXTO DE ETIQUETA ABAJO ----
-                lbl = CoreLabel(text=label, font_size=12)
+                # (puede tener dos líneas; con muchas barras, letra más pequeña)
+                lbl = CoreLabel(text=label, font_size=12 if len(values) <= 8 else 9)
                 lbl.refresh()
                 texture = lbl.texture
                 Rectangle(texture=texture, pos=(bar_x + bar_width/2 - texture.size[0]/2,
-                                                self.y + margin_bottom - 30),
+                                                self.y + margin_bottom - 10 - texture.size[1]),
                           size=texture.size)
 
             # ---- Título arriba ----
@@ -241,6 +320,126 @@ class BarChart(Widget):
                       pos=(self.x + 10, self.center_y - y_label.texture.size[1]/2),
                       size=y_label.texture.size)
 
+class ComparisonView:
+    # Ventanas de una comparación (tabla, nodos y tiempos) que se rellenan a medida que
+    # llegan los resultados. Cerrar la tabla cancela la comparación.
+    def __init__(self, title, total, on_close=None):
+        self.title = title
+        self.total = total
+        self.rows = []
+        self.search_time = 0.0
+        self.elapsed = None
+        self.cancelled = False
+
+        self.table_popup = ResultPopup("Comparación", "")
+        self.table_popup.size_hint = (0.9, 0.9)
+        self.table_popup.result_label.font_size = '12sp'
+        if on_close is not None:
+            self.table_popup.bind(on_dismiss=lambda popup: on_close())
+
+        self.nodes_popup, self.nodes_chart, self.nodes_info = self._chart_popup(
+            "Gráfico: Nodos Expandidos", "Nodos Expandidos por Algoritmo",
+            "Nodos Expandidos", "Nodos", "{:,.0f}")
+        self.times_popup, self.times_chart, self.times_info = self._chart_popup(
+            "Gráfico: Tiempo de Ejecución", "Tiempo de Ejecución por Algoritmo",
+            "Tiempo de Ejecución", "Segundos", "{:.4f}")
+        self.refresh()
+
+    def _chart_popup(self, popup_title, heading, chart_title, y_label, value_format):
+        content = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(5))
+
+        # Título del gráfico
+        title = Label(
+            text=heading,
+            size_hint_y=None,
+            height=dp(40),
+            color=(0, 0, 0, 1),
+            font_size='18sp',
+            bold=True
+        )
+        content.add_widget(title)
+
+        # Gráfico vacío: las barras se añaden con cada resultado
+        chart = BarChart([], chart_title, y_label, value_format=value_format,
+                         size_hint_y=None, height=dp(300))
+        content.add_widget(chart)
+
+        info_label = Label(
+            text='',
+            color=(0, 0, 0, 1),
+            font_size='12sp',
+            size_hint_y=None,
+            height=dp(40),
+            text_size=(dp(400), None),
+            halign='left',
+            valign='top'
+        )
+        content.add_widget(info_label)
+
+        close_btn = Button(
+            text='Cerrar',
+            size_hint_y=None,
+            height=dp(40),
+            background_color=(0.8, 0.2, 0.2, 1)
+        )
+        content.add_widget(close_btn)
+
+        popup = Popup(
+            title=popup_title,
+            content=content,
+            size_hint=(0.95, 0.9)
+        )
+        close_btn.bind(on_press=popup.dismiss)
+        return popup, chart, info_label
+
+    def open(self):
+        self.table_popup.open()
+        self.nodes_popup.open()
+        self.times_popup.open()
+
+    def add(self, job, result):
+        label = comparison_label(job)
+        name = label.replace('\n', ' ')
+        if 'error' in result:
+            self.rows.append(f"{name:<20}{'error':<12}")
+        else:
+            nodes, exec_time = result['nodes'], result['time']
+            if result['solved']:
+                outcome = str(result['steps'])
+            elif result.get('stopped') in STOP_REASONS:
+                outcome = STOP_REASONS[result['stopped']]
+            else:
+                outcome = 'sin solución'
+            self.rows.append(f"{name:<20}{nodes if nodes is not None else '-':<12}"
+                             f"{exec_time:<12.4f}{outcome}")
+            self.search_time += exec_time
+            # Un trabajo dado por agotado no llegó a contar sus nodos
+            if nodes is not None:
+                self.nodes_chart.add(label, nodes)
+                self.times_chart.add(label, exec_time)
+        self.refresh()
+
+    def finish(self, comparison):
+        self.elapsed = comparison.elapsed
+        self.cancelled = comparison.cancelled
+        self.refresh()
+
+    def refresh(self):
+        table_text = f"{self.title}\n"
+        table_text += "=" * 60 + "\n\n"
+        table_text += f"{'ALGORITMO':<20}{'NODOS':<12}{'TIEMPO(s)':<12}{'PASOS':<10}\n"
+        table_text += "-" * 60 + "\n"
+        table_text += "\n".join(self.rows)
+
+        status = f"{len(self.rows)}/{self.total} terminados"
+        if self.elapsed is not None:
+            status += " (cancelada)" if self.cancelled else ""
+            status += (f" · tiempo total {self.elapsed:.2f} s"
+                       f" (suma de búsquedas {self.search_time:.2f} s)")
+        self.table_popup.result_label.text = table_text + "\n\n" + status
+        self.nodes_info.text = status
+        self.times_info.text = status
+
 class PuzzleApp(App):
     def build(self):
         self.title = "8-Puzzle Solver"
@@ -248,11 +447,21 @@ class PuzzleApp(App):
         self.current_step = 0
         self.anim_event = None
         self.animating = False
+        # Soluciones óptimas ya encontradas (BFS, A*, IDA*): repetir un tablero es inmediato
+        self.solution_cache = SolutionCache()
+        # Presupuesto de la resolución en curso: cancelarlo detiene su hilo
+        self.budget = None
+        # Comparación en curso (comparison.Comparison)
+        self.comparison = None
+        # Último progreso recibido, si hay un redibujado programado y la h inicial
+        self.latest_progress = None
+        self.progress_scheduled = False
+        self.progress_start_h = None
 
         main_layout = BoxLayout(orientation='vertical', padding=20, spacing=15)
         
         # Título
-        title = Label(
+        self.title_label = title = Label(
             text='8-Puzzle Solver',
             font_size='24sp',
             bold=True,
@@ -279,6 +488,8 @@ class PuzzleApp(App):
         
         # Grid del puzzle
         self.puzzle_grid = PuzzleGrid(size_hint_y=None, height='300dp')
+        # Si el tablero cambia, la resolución en curso ya no sirve
+        self.puzzle_grid.on_change = self.cancel_solve
         
         # Controles
         controls_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None, height='200dp')
@@ -286,34 +497,27 @@ class PuzzleApp(App):
         # Selector de algoritmo
         algorithm_layout = BoxLayout(orientation='horizontal', spacing=10, size_hint_y=None, height='40dp')
         algorithm_label = Label(text='Algoritmo:', size_hint_x=None, width='100dp')
+        self.solver_choices = solver_choices(PUZZLE, 3)
         self.algorithm_spinner = Spinner(
             text='BFS',
-            values=[
-                'BFS',
-                'DFS',
-                'UCS',
-                'Greedy Manhattan',
-                'Greedy Misplaced',
-                'Greedy Linear Conflict',
-                'IDA* Manhattan',
-                'IDA* Misplaced',
-                'IDA* Linear Conflict',
-                'Weighted A* Manhattan',
-                'Weighted A* Misplaced',
-                'Weighted A* Linear Conflict',
-                'RBFS Manhattan',
-                'RBFS Misplaced',
-                'RBFS Linear Conflict',
-                'A* Manhattan',
-                'A* Misplaced',
-                'A* Linear Conflict',
-                'Bidirectional Search'
-            ],
+            values=list(self.solver_choices),
             size_hint_x=None,
             width='250dp'
         )
         algorithm_layout.add_widget(algorithm_label)
         algorithm_layout.add_widget(self.algorithm_spinner)
+
+        # Selector de tamaño del tablero
+        size_label = Label(text='Tamaño:', size_hint_x=None, width='80dp')
+        self.size_spinner = Spinner(
+            text='3x3',
+            values=['3x3', '4x4', '5x5'],
+            size_hint_x=None,
+            width='90dp'
+        )
+        self.size_spinner.bind(text=self.on_size_change)
+        algorithm_layout.add_widget(size_label)
+        algorithm_layout.add_widget(self.size_spinner)
         algorithm_layout.add_widget(Widget())  # Spacer
         
         # Botones de control
@@ -378,71 +582,94 @@ class PuzzleApp(App):
         
         return main_layout
     
+    def on_size_change(self, spinner, text):
+        size = int(text.split('x')[0])
+        self.pause_animation(None)
+        self.solution_path = None
+        self.puzzle_grid.set_size(size)
+        # Solo los algoritmos que admiten este tamaño (p. ej. la tabla de distancias es 3x3)
+        self.solver_choices = solver_choices(PUZZLE, size)
+        self.algorithm_spinner.values = list(self.solver_choices)
+        if self.algorithm_spinner.text not in self.solver_choices:
+            self.algorithm_spinner.text = 'BFS'
+        self.title_label.text = f'{size * size - 1}-Puzzle Solver'
+        self.status_label.text = f'Tablero {text}'
+        self.progress_bar.value = 0
+
+    def goal_state(self):
+        return PuzzleState(goal_board(self.puzzle_grid.size_n))
+
+    def cancel_solve(self):
+        # Detiene la resolución en curso; su resultado ya no se mostrará
+        if self.budget is not None:
+            self.budget.cancel()
+            self.budget = None
+            self.progress_bar.value = 0
+            self.status_label.text = 'Resolución cancelada'
+
     def solve_puzzle(self, instance):
+        if not self._check_solvable():
+            return
+
+        # La animación cambia el tablero (y cancelaría esta resolución)
+        self.pause_animation(None)
+        self.cancel_solve()
+        self.budget = budget = SearchBudget(max_seconds=SOLVE_TIME_LIMIT)
+        budget.progress = lambda report: self._on_progress(budget, report)
+        self.progress_start_h = None
         self.status_label.text = 'Resolviendo...'
         self.progress_bar.value = 0
         
         # Ejecutar en hilo separado para no bloquear UI
-        thread = threading.Thread(target=self._solve_in_background)
+        thread = threading.Thread(target=self._solve_in_background, args=(budget,))
         thread.daemon = True
         thread.start()
     
-    def _solve_in_background(self):
+    def _solve_in_background(self, budget):
         initial_state = PuzzleState(self.puzzle_grid.get_board())
-        goal_state = PuzzleState([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
+        goal_state = self.goal_state()
         
         algorithm = self.algorithm_spinner.text
         
-        # Simular progreso
-        Clock.schedule_once(lambda dt: setattr(self.progress_bar, 'value', 25), 0.1)
-        
         try:
-            if algorithm == 'BFS':
-                path, nodes, exec_time = bfs(initial_state, goal_state)
-            elif algorithm == 'DFS':
-                path, nodes, exec_time = dfs(initial_state, goal_state)
-            elif algorithm == 'UCS':
-                path, nodes, exec_time = ucs(initial_state, goal_state)
-            elif algorithm == 'Greedy Manhattan':
-                path, nodes, exec_time = greedy(initial_state, goal_state, manhattan_distance)
-            elif algorithm == 'Greedy Misplaced':
-                path, nodes, exec_time = greedy(initial_state, goal_state, misplaced_tiles)
-            elif algorithm == 'IDA* Manhattan':
-                path, nodes, exec_time = ida_star(initial_state, goal_state, manhattan_distance)
-            elif algorithm == 'IDA* Misplaced':
-                path, nodes, exec_time = ida_star(initial_state, goal_state, misplaced_tiles)
-            elif algorithm == 'Weighted A* Manhattan':
-                path, nodes, exec_time = weighted_a_star(initial_state, goal_state, manhattan_distance, weight=1.5)
-            elif algorithm == 'Weighted A* Misplaced':
-                path, nodes, exec_time = weighted_a_star(initial_state, goal_state, misplaced_tiles, weight=1.5)
-            elif algorithm == 'RBFS Manhattan':
-                path, nodes, exec_time = rbfs(initial_state, goal_state, manhattan_distance)
-            elif algorithm == 'RBFS Misplaced':
-                path, nodes, exec_time = rbfs(initial_state, goal_state, misplaced_tiles)
-            elif algorithm == 'A* Manhattan':
-                path, nodes, exec_time = a_star(initial_state, goal_state, manhattan_distance)
-            elif algorithm == 'Greedy Linear Conflict':
-                path, nodes, exec_time = greedy(initial_state, goal_state, linear_conflict)
-            elif algorithm == 'IDA* Linear Conflict':
-                path, nodes, exec_time = ida_star(initial_state, goal_state, linear_conflict)
-            elif algorithm == 'Weighted A* Linear Conflict':
-                path, nodes, exec_time = weighted_a_star(initial_state, goal_state, linear_conflict, weight=1.5)
-            elif algorithm == 'RBFS Linear Conflict':
-                path, nodes, exec_time = rbfs(initial_state, goal_state, linear_conflict)
-            elif algorithm == 'A* Linear Conflict':
-                path, nodes, exec_time = a_star(initial_state, goal_state, linear_conflict)
-            elif algorithm == 'Bidirectional Search':
-                path, nodes, exec_time = bidirectional_search(initial_state, goal_state)
-            else:  # A* Misplaced
-                path, nodes, exec_time = a_star(initial_state, goal_state, misplaced_tiles)
+            solver, heuristic = self.solver_choices[algorithm]
+            path, nodes, exec_time = solver.solve(
+                initial_state, goal_state, heuristic.load(initial_state.size) if heuristic else None,
+                cache=self.solution_cache, budget=budget,
+                admissible=heuristic is not None and heuristic.admissible)
             
             # Mostrar resultados
-            Clock.schedule_once(lambda dt: self._show_results(algorithm, path, nodes, exec_time), 0.3)
+            Clock.schedule_once(lambda dt: self._show_results(algorithm, path, nodes, exec_time, budget), 0.3)
             
         except Exception as e:
-            Clock.schedule_once(lambda dt: self._show_error(str(e)), 0.1)
+            Clock.schedule_once(lambda dt: self._show_error(str(e), budget), 0.1)
     
-    def _show_results(self, algorithm, path, nodes, exec_time):
+    def _on_progress(self, budget, report):
+        # Se llama desde el hilo de la búsqueda cada check_every expansiones: solo guarda
+        # el último informe y programa un redibujado si no hay otro pendiente
+        if budget is self.budget and report.nodes == 0:
+            self.progress_start_h = report.best_h
+        self.latest_progress = (budget, report)
+        if not self.progress_scheduled:
+            self.progress_scheduled = True
+            Clock.schedule_once(self._draw_progress, PROGRESS_INTERVAL)
+
+    def _draw_progress(self, dt):
+        self.progress_scheduled = False
+        budget, report = self.latest_progress
+        if budget is not self.budget:
+            return
+        self.status_label.text = 'Resolviendo... ' + progress_text(report)
+        # La barra avanza según lo que ha bajado la mejor h desde la inicial
+        start_h = self.progress_start_h
+        if start_h and report.best_h is not None:
+            self.progress_bar.value = 100 * (1 - report.best_h / start_h)
+
+    def _show_results(self, algorithm, path, nodes, exec_time, budget):
+        # Resultado de una resolución cancelada o reemplazada por otra
+        if budget is not self.budget:
+            return
+        self.budget = None
         self.progress_bar.value = 0
 
         if path:
@@ -450,12 +677,21 @@ class PuzzleApp(App):
             result_text += f"Algoritmo: {algorithm}\n"
             result_text += f"Pasos necesarios: {len(path) - 1}\n"
             result_text += f"Nodos expandidos: {nodes}\n"
+            if exec_time > 0:
+                result_text += f"Nodos/s: {nodes / exec_time:,.0f}\n"
             result_text += f"Tiempo: {exec_time:.4f} segundos"
 
             self.status_label.text = f'Resuelto en {len(path) - 1} pasos'
             # Guardar path para animación
             self.solution_path = path
             self.current_step = 0
+        elif budget.reason in STOP_REASONS:
+            reason = STOP_REASONS[budget.reason]
+            result_text = f"Búsqueda detenida: {reason}.\n\n"
+            result_text += f"Algoritmo: {algorithm}\n"
+            result_text += f"Nodos expandidos: {nodes}\n"
+            result_text += f"Tiempo: {exec_time:.4f} segundos"
+            self.status_label.text = f'Detenido ({reason})'
         else:
             result_text = "No se encontró solución para este puzzle."
             self.status_label.text = 'Sin solución'
@@ -464,139 +700,42 @@ class PuzzleApp(App):
         popup.open()
 
     def show_comparison(self, instance):
-        # Use instance parameter to avoid warning
+        # Todas las combinaciones algoritmo/heurística en paralelo (comparison.py): los
+        # resultados llegan a la tabla y a los gráficos a medida que terminan
         _ = instance
-        
-        initial_state = PuzzleState(self.puzzle_grid.get_board())
-        goal_state = PuzzleState([[1, 2, 3], [4, 5, 6], [7, 8, 0]])
-
-        results = compare_heuristics(initial_state, goal_state)
 
-        # --- Texto comparativo con mejor formato ---
-        table_text = "COMPARACIÓN DE HEURÍSTICAS (A*)\n"
-        table_text += "=" * 60 + "\n\n"
-        table_text += f"{'HEURÍSTICA':<20}{'NODOS':<12}{'TIEMPO(s)':<15}{'PASOS':<10}\n"
-        table_text += "-" * 60 + "\n"
-
-        for name, nodes, exec_time, steps in results:
-            table_text += f"{name:<20}{nodes:<10}{exec_time:<12.4f}{steps or 'N/A':<8}\n"
-
-        popup = ResultPopup("Comparación", table_text)
-        popup.open()
-
-        # --- Datos para gráficos ---
-        nodes_data = [(r[0], r[1]) for r in results]
-        times_data = [(r[0], r[2]) for r in results]
-
-        # --- Popup con gráfico de nodos ---
-        content_nodes = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(5))
-        
-        # Título del gráfico
-        title_nodes = Label(
-            text="Nodos Expandidos por Heurística", 
-            size_hint_y=None, 
-            height=dp(40), 
-            color=(0, 0, 0, 1), 
-            font_size='18sp',
-            bold=True
-        )
-        content_nodes.add_widget(title_nodes)
-        
-        # Crear el gráfico
-        chart_nodes = BarChart(nodes_data, "Nodos Expandidos", "Nodos", 
-                            size_hint_y=None, height=dp(300))
-        content_nodes.add_widget(chart_nodes)
-        
-        # Información de las barras con valores
-        info_layout = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(80))
-        
-        # Mostrar valores de cada heurística
-        values_text = "Valores:\n"
-        for name, value in nodes_data:
-            values_text += f"• {name}: {value} nodos\n"
-        
-        values_label = Label(
-            text=values_text,
-            color=(0, 0, 0, 1), 
-            font_size='12sp',
-            text_size=(dp(400), None),
-            halign='left',
-            valign='top'
-        )
-        info_layout.add_widget(values_label)
-        content_nodes.add_widget(info_layout)
-
-        close_btn_nodes = Button(
-            text='Cerrar',
-            size_hint_y=None,
-            height=dp(40),
-            background_color=(0.8, 0.2, 0.2, 1)
-        )
-        content_nodes.add_widget(close_btn_nodes)
-
-        popup_nodes = Popup(
-            title="Gráfico: Nodos Expandidos",
-            content=content_nodes,
-            size_hint=(0.95, 0.9)
-        )
-        close_btn_nodes.bind(on_press=popup_nodes.dismiss)
-        popup_nodes.open()
-
-        # --- Popup con gráfico de tiempos ---
-        content_times = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(5))
-        
-        # Título del gráfico
-        title_times = Label(
-            text="Tiempo de Ejecución por Heurística", 
-            size_hint_y=None, 
-            height=dp(40), 
-            color=(0, 0, 0, 1), 
-            font_size='18sp',
-            bold=True
-        )
-        content_times.add_widget(title_times)
-        
-        # Crear el gráfico
-        chart_times = BarChart(times_data, "Tiempo de Ejecución", "Segundos", 
-                            size_hint_y=None, height=dp(300))
-        content_times.add_widget(chart_times)
-        
-        # Información de las barras con valores
-        info_layout_times = BoxLayout(orientation='vertical', size_hint_y=None, height=dp(80))
-        
-        # Mostrar valores de cada heurística
-        values_text_times = "Valores:\n"
-        for name, value in times_data:
-            values_text_times += f"• {name}: {value:.4f} segundos\n"
-        
-        values_label_times = Label(
-            text=values_text_times,
-            color=(0, 0, 0, 1), 
-            font_size='12sp',
-            text_size=(dp(400), None),
-            halign='left',
-            valign='top'
-        )
-        info_layout_times.add_widget(values_label_times)
-        content_times.add_widget(info_layout_times)
-
-        close_btn_times = Button(
-            text='Cerrar',
-            size_hint_y=None,
-            height=dp(40),
-            background_color=(0.8, 0.2, 0.2, 1)
-        )
-        content_times.add_widget(close_btn_times)
+        if not self._check_solvable():
+            return
 
-        popup_times = Popup(
-            title="Gráfico: Tiempo de Ejecución",
-            content=content_times,
-            size_hint=(0.95, 0.9)
+        self.cancel_comparison()
+        size = self.puzzle_grid.size_n
+        jobs = list(comparison_jobs({'board': self.puzzle_grid.get_board(), 'goal': goal_board(size)}))
+        comparison = Comparison(
+            jobs,
+            on_result=lambda job, result: Clock.schedule_once(lambda dt: view.add(job, result)),
+            on_done=lambda done: Clock.schedule_once(lambda dt: self._comparison_done(view, done))
         )
-        close_btn_times.bind(on_press=popup_times.dismiss)
-        popup_times.open()
+        view = ComparisonView("COMPARACIÓN DE ALGORITMOS", len(jobs), on_close=comparison.cancel)
+        self.comparison = comparison
+        self.status_label.text = f'Comparando {len(jobs)} combinaciones...'
+        view.open()
+        comparison.start()
+
+    def cancel_comparison(self):
+        if self.comparison is not None:
+            self.comparison.cancel()
+            self.comparison = None
+
+    def _comparison_done(self, view, comparison):
+        view.finish(comparison)
+        if comparison is self.comparison:
+            self.comparison = None
+            self.status_label.text = f'Comparación terminada en {comparison.elapsed:.1f} s'
+
+    def on_stop(self):
+        self.cancel_solve()
+        self.cancel_comparison()
 
-    
     def start_animation(self, instance):
         if not self.solution_path or self.animating:
             return
@@ -626,7 +765,22 @@ class PuzzleApp(App):
 
 
     
-    def _show_error(self, error_msg):
+    def _check_solvable(self):
+        # Rechazar de inmediato los tableros con paridad distinta a la del objetivo
+        initial_state = PuzzleState(self.puzzle_grid.get_board())
+        goal_state = self.goal_state()
+        if is_solvable(initial_state, goal_state):
+            return True
+
+        self.status_label.text = 'Sin solución'
+        popup = ResultPopup("Resultado", "Este puzzle no tiene solución:\nla paridad de sus inversiones no coincide con la del objetivo.")
+        popup.open()
+        return False
+
+    def _show_error(self, error_msg, budget):
+        if budget is not self.budget:
+            return
+        self.budget = None
         self.progress_bar.value = 0
         self.status_label.text = 'Error al resolver'
         popup = ResultPopup("Error", f"Error: {error_msg}")
@@ -646,23 +800,12 @@ class PuzzleApp(App):
         Clock.schedule_once(lambda dt: show_next_step(dt), 1.0)
     
     def reset_puzzle(self, instance):
-        initial_board = [[1, 2, 3], [4, 0, 5], [7, 8, 6]]
-        self.puzzle_grid.set_board(initial_board)
+        self.puzzle_grid.set_board(initial_board(self.puzzle_grid.size_n))
         self.status_label.text = 'Puzzle reiniciado'
         self.progress_bar.value = 0
     
     def randomize_puzzle(self, instance):
-        # Crear una mezcla válida del puzzle
-        board = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
-        flat = [item for row in board for item in row]
-        
-        # Realizar movimientos aleatorios válidos
-        current_state = PuzzleState(board)
-        for _ in range(50):
-            neighbors = current_state.get_neighbors()
-            if neighbors:
-                current_state = random.choice(neighbors)
-        
-        self.puzzle_grid.set_board(current_state.board)
+        # Crear una mezcla válida del puzzle del tamaño actual
+        self.puzzle_grid.set_board(random_board(self.puzzle_grid.size_n))
         self.status_label.text = 'Puzzle mezclado'
         self.progress_bar.value = 0
\ No newline at end of file
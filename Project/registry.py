@@ -0,0 +1,191 @@
+# Registro de algoritmos y heurísticas
+# Cada algoritmo se registra con un nombre, sus capacidades y un punto de entrada
+# "módulo:función" que solo se importa la primera vez que se usa: las interfaces,
+# jobs.py (batch, servicio), comparison.py y benchmark.py recorren esta misma tabla, y
+# los motores pesados (p. ej. las PDB) no se cargan hasta que alguien los elige.
+#
+# Capacidades de un algoritmo:
+#   optimal    devuelve un camino óptimo (con heurísticas admisibles)
+#   heuristic  necesita una heurística
+#   memory     "linear" (profundidad), "bounded" (límite fijo), "exponential"
+#              (listas abierta y cerrada completas) o "table" (tabla precalculada)
+#   sizes      lados de tablero admitidos (None = todos)
+#   cache      acepta cache=SolutionCache
+#   parallel   lanza sus propios procesos (no puede correr dentro de un multiprocessing.Pool)
+#   reverse    también busca hacia el inicio, así que su heurística debe admitir cualquier objetivo
+#   options    argumentos fijos con que se llama
+#
+# Un motor nuevo solo necesita register_solver("puzzle", "nombre", "Etiqueta", "modulo:funcion", ...).
+import importlib
+
+PUZZLE = "puzzle"
+MAZE = "maze"
+
+
+def _import(entry):
+    module_name, _, attribute = entry.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class Heuristic:
+    __slots__ = ("kind", "name", "label", "short", "entry", "factory", "any_goal", "admissible",
+                 "_function")
+
+    def __init__(self, kind, name, label, entry, short=None, factory=False, any_goal=True,
+                 admissible=False):
+        self.kind = kind
+        self.name = name
+        self.label = label
+        self.short = short or label
+        self.entry = entry
+        # factory: el punto de entrada construye la heurística para un lado de tablero
+        self.factory = factory
+        self.any_goal = any_goal
+        # admissible: nunca sobrestima, así que A* e IDA* pueden guardar su camino en la caché
+        self.admissible = admissible
+        self._function = None
+
+    def load(self, size=None):
+        if self._function is None:
+            self._function = _import(self.entry)
+        return self._function(size) if self.factory else self._function
+
+
+class Solver:
+    __slots__ = ("kind", "name", "label", "short", "entry", "optimal", "heuristic", "memory",
+                 "sizes", "cache", "parallel", "reverse", "options", "_function")
+
+    def __init__(self, kind, name, label, entry, short=None, optimal=False, heuristic=False,
+                 memory="exponential", sizes=None, cache=False, parallel=False, reverse=False,
+                 options=None):
+        self.kind = kind
+        self.name = name
+        self.label = label
+        self.short = short or label
+        self.entry = entry
+        self.optimal = optimal
+        self.heuristic = heuristic
+        self.memory = memory
+        self.sizes = sizes
+        self.cache = cache
+        self.parallel = parallel
+        self.reverse = reverse
+        self.options = options or {}
+        self._function = None
+
+    def load(self):
+        if self._function is None:
+            self._function = _import(self.entry)
+        return self._function
+
+    def supports(self, heuristic=None, size=None):
+        if size is not None and self.sizes is not None and size not in self.sizes:
+            return False
+        return heuristic is None or not self.reverse or heuristic.any_goal
+
+    def solve(self, initial_state, goal_state, heuristic=None, cache=None, budget=None, admissible=False):
+        # heuristic es la función ya cargada (Heuristic.load) y admissible su
+        # Heuristic.admissible; devuelve el SearchStats
+        options = dict(self.options, budget=budget)
+        if self.cache and cache is not None:
+            options["cache"] = cache
+            if self.heuristic:
+                options["admissible"] = admissible
+        if self.heuristic:
+            return self.load()(initial_state, goal_state, heuristic, **options)
+        return self.load()(initial_state, goal_state, **options)
+
+
+SOLVERS = {PUZZLE: {}, MAZE: {}}
+HEURISTICS = {PUZZLE: {}, MAZE: {}}
+
+
+def register_solver(kind, name, label, entry, **capabilities):
+    solver = SOLVERS[kind][name] = Solver(kind, name, label, entry, **capabilities)
+    return solver
+
+
+def register_heuristic(kind, name, label, entry, **options):
+    heuristic = HEURISTICS[kind][name] = Heuristic(kind, name, label, entry, **options)
+    return heuristic
+
+
+def _lookup(table, name, what):
+    if name not in table:
+        raise ValueError(f"{what} desconocido: {name} (opciones: {', '.join(sorted(table))})")
+    return table[name]
+
+
+def get_solver(kind, name):
+    return _lookup(SOLVERS[kind], name, "Algoritmo")
+
+
+def get_heuristic(kind, name):
+    return _lookup(HEURISTICS[kind], name, "Heurística")
+
+
+def solver_pairs(kind, algorithms=None, heuristics=None, size=None, parallel=True):
+    # (algoritmo, heurística o None) de todas las combinaciones válidas, o solo de los
+    # nombres pedidos; size descarta los que no admiten ese tablero
+    for solver in SOLVERS[kind].values():
+        if algorithms and solver.name not in algorithms:
+            continue
+        if solver.parallel and not parallel:
+            continue
+        if not solver.supports(size=size):
+            continue
+        if not solver.heuristic:
+            yield solver, None
+            continue
+        for heuristic in HEURISTICS[kind].values():
+            if (not heuristics or heuristic.name in heuristics) and solver.supports(heuristic):
+                yield solver, heuristic
+
+
+def pair_label(solver, heuristic, short=False):
+    if short:
+        return solver.short + ("\n" + heuristic.short if heuristic else "")
+    return solver.label + (" " + heuristic.label if heuristic else "")
+
+
+# Algoritmos del puzzle (puzzle/algorithms.py)
+register_solver(PUZZLE, "bfs", "BFS", "puzzle.algorithms:bfs", optimal=True, cache=True)
+register_solver(PUZZLE, "dfs", "DFS", "puzzle.algorithms:dfs", memory="linear")
+register_solver(PUZZLE, "ucs", "UCS", "puzzle.algorithms:ucs", optimal=True)
+register_solver(PUZZLE, "greedy", "Greedy", "puzzle.algorithms:greedy", heuristic=True)
+register_solver(PUZZLE, "a_star", "A*", "puzzle.algorithms:a_star", optimal=True, heuristic=True, cache=True)
+register_solver(PUZZLE, "ida_star", "IDA*", "puzzle.algorithms:ida_star", optimal=True, heuristic=True,
+                memory="linear", cache=True)
+register_solver(PUZZLE, "parallel_ida_star", "Parallel IDA*", "puzzle.algorithms:parallel_ida_star",
+                short="IDA* ||", optimal=True, heuristic=True, memory="linear", parallel=True)
+register_solver(PUZZLE, "weighted_a_star", "Weighted A*", "puzzle.algorithms:weighted_a_star", short="WA*",
+                heuristic=True, options={"weight": 1.5})
+register_solver(PUZZLE, "ara_star", "ARA*", "puzzle.algorithms:ara_star", heuristic=True)
+register_solver(PUZZLE, "rbfs", "RBFS", "puzzle.algorithms:rbfs", optimal=True, heuristic=True, memory="linear")
+register_solver(PUZZLE, "sma_star", "SMA*", "puzzle.algorithms:sma_star", optimal=True, heuristic=True,
+                memory="bounded", options={"max_nodes": 200000})
+register_solver(PUZZLE, "bidirectional", "Bidirectional Search", "puzzle.algorithms:bidirectional_search",
+                short="Bidir", optimal=True)
+register_solver(PUZZLE, "bidirectional_a_star", "Bidirectional A*", "puzzle.algorithms:bidirectional_a_star",
+                short="Bidir A*", optimal=True, heuristic=True, reverse=True)
+register_solver(PUZZLE, "distance_table", "Distance Table", "puzzle.algorithms:table_search", short="Tabla",
+                optimal=True, memory="table", sizes=(3,))
+
+register_heuristic(PUZZLE, "manhattan", "Manhattan", "puzzle.heuristics:manhattan_distance", short="MH",
+                   admissible=True)
+register_heuristic(PUZZLE, "misplaced", "Misplaced", "puzzle.heuristics:misplaced_tiles", short="MT",
+                   admissible=True)
+# Suma 2 por cada par en conflicto, también cuando una ficha está en varios: puede sobrestimar
+register_heuristic(PUZZLE, "linear_conflict", "Linear Conflict", "puzzle.heuristics:linear_conflict", short="LC")
+# Las PDB se construyen para el objetivo estándar: no sirven al sentido inverso
+register_heuristic(PUZZLE, "pdb", "PDB", "puzzle.pdb:load_pdb_heuristic", factory=True, any_goal=False,
+                   admissible=True)
+
+# Algoritmos del laberinto (maze/algorithms.py)
+register_solver(MAZE, "bfs", "BFS", "maze.algorithms:maze_bfs", optimal=True)
+register_solver(MAZE, "a_star", "A*", "maze.algorithms:maze_a_star", optimal=True, heuristic=True)
+register_solver(MAZE, "greedy", "Greedy", "maze.algorithms:maze_greedy", heuristic=True)
+
+register_heuristic(MAZE, "manhattan", "Manhattan", "maze.heuristics:maze_manhattan_distance", short="MH")
+register_heuristic(MAZE, "euclidean", "Euclidean", "maze.heuristics:maze_euclidean_distance", short="EU")
+register_heuristic(MAZE, "chebyshev", "Chebyshev", "maze.heuristics:maze_chebyshev_distance", short="CH")
@@ -0,0 +1,239 @@
+# Servicio local de resolución (HTTP sobre localhost o socket Unix)
+# Otros procesos piden soluciones sin cargar la interfaz:
+#
+#   python service.py --port 8765 --workers 4
+#   curl -s localhost:8765/solve -d '{"board": [[8, 6, 7], [2, 5, 4], [3, 0, 1]], "algorithm": "ida_star"}'
+#   curl -s localhost:8765/stats
+#
+# POST /solve recibe un trabajo de jobs.py y devuelve su resultado. Las peticiones
+# idénticas (mismo tablero/laberinto, objetivo, algoritmo y heurística) que llegan
+# mientras otra está en curso esperan a esa misma resolución, y las repetidas se
+# sirven desde una caché LRU. GET /stats da la cola, los aciertos y las latencias;
+# "computed" cuenta las búsquedas terminadas y "solved" solo las que encontraron camino.
+# Solo se guardan en la caché las búsquedas completas: las cortadas por un límite o
+# una cancelación se repiten en la siguiente petición.
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import ipaddress
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from jobs import solve_job
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def job_key(job):
+    # Identifica la resolución: todo el trabajo salvo su id
+    return json.dumps({k: v for k, v in job.items() if k != "id"}, sort_keys=True)
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def cacheable(result):
+    # Resuelta o sin solución demostrada; no un error ni una búsqueda detenida
+    return "error" not in result and "stopped" not in result
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.items = OrderedDict()
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key):
+        value = self.items.get(key)
+        if value is not None:
+            self.items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_size:
+            self.items.popitem(last=False)
+
+
+class SolverService:
+    def __init__(self, workers=None, cache_size=10000, latency_window=10000):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.cache = LRUCache(cache_size)
+        self.in_flight = {}     # clave -> tarea compartida por peticiones idénticas
+        self.latencies = deque(maxlen=latency_window)
+        self.counts = {"requests": 0, "computed": 0, "solved": 0, "cache_hits": 0, "coalesced": 0,
+                       "errors": 0}
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    async def solve(self, job):
+        # Devuelve (resultado, origen): "computed", "cache" o "coalesced"
+        key = job_key(job)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.counts["cache_hits"] += 1
+            return cached, "cache"
+
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.counts["coalesced"] += 1
+            source = "coalesced"
+        else:
+            # La resolución es una tarea propia: si quien la pidió se desconecta, las
+            # peticiones que esperan el mismo resultado no se cancelan
+            task = self.in_flight[key] = asyncio.ensure_future(self._run(key, job))
+            source = "computed"
+        return await asyncio.shield(task), source
+
+    async def _run(self, key, job):
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.executor, solve_job, job)
+        except Exception as e:
+            result = {"id": job.get("id"), "error": f"{type(e).__name__}: {e}"}
+        finally:
+            del self.in_flight[key]
+        if "error" in result:
+            self.counts["errors"] += 1
+        else:
+            self.counts["computed"] += 1
+            if result["solved"]:
+                self.counts["solved"] += 1
+            if cacheable(result):
+                self.cache.put(key, result)
+        return result
+
+    def stats(self):
+        latencies = sorted(self.latencies)
+        stats = dict(self.counts)
+        stats.update({
+            "queue_depth": len(self.in_flight),
+            "workers": self.workers,
+            "cache_size": len(self.cache),
+            "latency_ms": {
+                "p50": percentile(latencies, 0.50),
+                "p90": percentile(latencies, 0.90),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else None,
+            },
+        })
+        return stats
+
+    async def handle_request(self, method, path, body):
+        # Devuelve (estado HTTP, objeto JSON)
+        if path == "/stats":
+            return (200, self.stats()) if method == "GET" else (405, {"error": "Usa GET"})
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path != "/solve":
+            return 404, {"error": f"Ruta desconocida: {path}"}
+        if method != "POST":
+            return 405, {"error": "Usa POST"}
+
+        try:
+            job = json.loads(body or b"{}")
+        except ValueError as e:
+            return 400, {"error": f"JSON inválido: {e}"}
+        if not isinstance(job, dict):
+            return 400, {"error": "El trabajo debe ser un objeto JSON"}
+
+        self.counts["requests"] += 1
+        start_time = time.perf_counter()
+        result, source = await self.solve(job)
+        self.latencies.append((time.perf_counter() - start_time) * 1000)
+        # El resultado compartido lleva el id de quien lo resolvió; cada respuesta, el suyo
+        response = dict(result, id=job.get("id"), source=source)
+        return 200, response
+
+    async def handle_connection(self, reader, writer):
+        # HTTP/1.1 mínimo con keep-alive: línea de petición, cabeceras y Content-Length
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split(maxsplit=2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.handle_request(method.upper(), path.split("?")[0], body)
+                data = json.dumps(payload).encode("utf-8")
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and not version.strip().upper().endswith("1.0"))
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=8765, unix_path=None):
+    if unix_path:
+        server = await asyncio.start_unix_server(service.handle_connection, path=unix_path)
+        where = unix_path
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        where = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Servicio escuchando en {where} ({service.workers} procesos)", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio local de resolución de puzzles y laberintos")
+    parser.add_argument("--host", default="127.0.0.1", help="dirección local (por defecto 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, núcleos)")
+    parser.add_argument("--cache-size", type=int, default=10000, help="resultados en la caché LRU")
+    args = parser.parse_args(argv)
+    if not args.unix and not is_loopback(args.host):
+        parser.error(f"--host debe ser una dirección local (127.0.0.1, ::1 o localhost), no {args.host}")
+
+    service = SolverService(args.workers, args.cache_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+# Los módulos se importan desde Project/, como en la aplicación
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,73 @@
+import pytest
+
+from puzzle.state import PuzzleState, goal_board
+from puzzle.algorithms import ara_star, ara_star_solutions, bidirectional_a_star, ida_star, parallel_ida_star
+from puzzle.distance_table import DistanceTable
+from puzzle.generator import BoardGenerator
+from puzzle.heuristics import manhattan_distance
+
+GOAL = PuzzleState(goal_board(3))
+
+
+@pytest.fixture(scope="module")
+def table():
+    table = DistanceTable(GOAL)
+    yield table
+    table.close()
+
+
+def seeded_boards(seed, count=12):
+    generator = BoardGenerator(3, seed=seed)
+    try:
+        return [PuzzleState(board) for board in generator.boards(count)]
+    finally:
+        generator.close()
+
+
+def assert_optimal_path(path, initial, table):
+    # Camino válido (movimientos de una casilla del blanco) y de longitud óptima
+    assert path[0] == initial and path[-1] == GOAL
+    for previous, current in zip(path, path[1:]):
+        assert current in previous.get_neighbors(link_parent=False)
+    assert len(path) - 1 == table.distance(initial)
+
+
+def test_ida_star_is_optimal(table):
+    # Con y sin tabla de transposición
+    for initial in seeded_boards(8):
+        assert_optimal_path(ida_star(initial, GOAL, manhattan_distance).path, initial, table)
+        assert_optimal_path(ida_star(initial, GOAL, manhattan_distance, tt_size=4096).path, initial, table)
+
+
+def test_parallel_ida_star_is_optimal(table):
+    # Dos procesos y corte fijo y automático; el último tablero está a 31 movimientos
+    boards = seeded_boards(9, count=4) + [PuzzleState([[8, 6, 7], [2, 5, 4], [3, 0, 1]])]
+    for initial in boards:
+        for split_depth in (None, 3):
+            result = parallel_ida_star(initial, GOAL, manhattan_distance, workers=2, split_depth=split_depth)
+            assert_optimal_path(result.path, initial, table)
+
+
+def test_ara_star_final_iteration_is_optimal(table):
+    for initial in seeded_boards(11):
+        result = ara_star(initial, GOAL, manhattan_distance)
+        assert result.suboptimality == 1 and result.stopped is None
+        assert_optimal_path(result.path, initial, table)
+
+
+def test_ara_star_solutions_respect_their_bound(table):
+    # Cada mejora cuesta como mucho cota * óptimo, y ni el coste ni la cota suben
+    for initial in seeded_boards(12, count=6):
+        optimal = table.distance(initial)
+        costs, bounds = [], []
+        for result in ara_star_solutions(initial, GOAL, manhattan_distance, weight=5.0, step=1.0):
+            costs.append(len(result.path) - 1)
+            bounds.append(result.suboptimality)
+            assert costs[-1] <= bounds[-1] * optimal
+        assert costs == sorted(costs, reverse=True) and bounds == sorted(bounds, reverse=True)
+        assert costs[-1] == optimal and bounds[-1] == 1
+
+
+def test_bidirectional_a_star_is_optimal(table):
+    for initial in seeded_boards(10):
+        assert_optimal_path(bidirectional_a_star(initial, GOAL, manhattan_distance).path, initial, table)
@@ -0,0 +1,27 @@
+import io
+import json
+from batch import read_jobs, run_batch
+
+
+def _run(text, fmt):
+    results = []
+    run_batch(read_jobs(io.StringIO(text), fmt), results.append, workers=1, ordered=True)
+    return results
+
+
+def test_bad_jsonl_line_does_not_stop_the_batch():
+    good = json.dumps({"board": [[1, 2, 3], [4, 5, 6], [7, 0, 8]]})
+    text = "\n".join([good, "{not json", "[1, 2, 3]", good]) + "\n"
+    results = _run(text, "jsonl")
+    assert len(results) == 4
+    assert results[0]["solved"] and results[3]["solved"]
+    assert results[1]["id"] == 2 and results[1]["error"].startswith("Línea 2:")
+    assert results[2]["id"] == 3 and "error" in results[2]
+
+
+def test_bad_csv_row_does_not_stop_the_batch():
+    text = "id,board\na,1 2 3 4 5 6 7 0 8\nb,1 2 x\nc,1 2 3\nd,1 2 3 4 5 6 0 7 8\n"
+    results = _run(text, "csv")
+    assert [result["id"] for result in results] == ["a", 3, 4, "d"]
+    assert results[0]["solved"] and results[3]["steps"] == 2
+    assert "error" in results[1] and "error" in results[2]
@@ -0,0 +1,44 @@
+import os
+
+from puzzle.state import PuzzleState, goal_board
+from puzzle.distance_table import DistanceTable, HEADER
+
+GOAL = PuzzleState(goal_board(3))
+BOARD = [[8, 6, 7], [2, 5, 4], [3, 0, 1]]  # uno de los dos estados a 31 movimientos
+
+
+def test_rebuilds_after_crc_mismatch(tmp_path):
+    path = str(tmp_path / "distances.bin")
+    table = DistanceTable(GOAL, path)
+    assert table.distance(PuzzleState(BOARD)) == 31
+    table.close()
+
+    # Un byte cambiado en los datos: la cabecera es válida pero el crc32 no coincide
+    with open(path, "r+b") as f:
+        f.seek(HEADER.size + 12345)
+        value = f.read(1)[0]
+        f.seek(HEADER.size + 12345)
+        f.write(bytes([value ^ 0x3F]))
+    modified = os.path.getmtime(path)
+    os.utime(path, (modified - 10, modified - 10))
+
+    table = DistanceTable(GOAL, path)
+    try:
+        assert os.path.getmtime(path) > modified - 10
+        assert table.data[HEADER.size + 12345] == value
+        assert table.distance(PuzzleState(BOARD)) == 31
+    finally:
+        table.close()
+
+
+def test_rebuilds_empty_or_truncated_file(tmp_path):
+    path = str(tmp_path / "distances.bin")
+    for content in (b"", b"8PDT"):
+        with open(path, "wb") as f:
+            f.write(content)
+        table = DistanceTable(GOAL, path)
+        try:
+            assert table.distance(GOAL) == 0
+            assert os.path.getsize(path) > HEADER.size
+        finally:
+            table.close()
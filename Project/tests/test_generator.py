@@ -0,0 +1,37 @@
+from puzzle.state import PuzzleState, goal_board
+from puzzle.algorithms import ida_star
+from puzzle.distance_table import DistanceTable
+from puzzle.generator import BoardGenerator, permutation_parity
+from puzzle.heuristics import manhattan_distance
+
+
+def test_at_depth_is_exact_distance_3x3():
+    generator = BoardGenerator(3, seed=7)
+    table = DistanceTable(PuzzleState(goal_board(3)))
+    try:
+        for depth in (0, 1, 5, 12, 20, 31):
+            for _ in range(5):
+                assert table.distance(PuzzleState(generator.at_depth(depth))) == depth
+    finally:
+        generator.close()
+        table.close()
+
+
+def test_at_depth_is_exact_distance_4x4():
+    # En 4x4 sale del BFS por capas; IDA* con Manhattan da la distancia óptima
+    generator = BoardGenerator(4, seed=7)
+    goal = PuzzleState(goal_board(4))
+    for depth in (3, 8, 12):
+        for _ in range(3):
+            path = ida_star(PuzzleState(generator.at_depth(depth)), goal, manhattan_distance).path
+            assert len(path) - 1 == depth
+
+
+def test_uniform_boards_are_solvable():
+    for size in (3, 4, 5):
+        generator = BoardGenerator(size, seed=size)
+        goal_parity = permutation_parity(generator.goal_tiles, size)
+        for _ in range(50):
+            tiles = [tile for row in generator.uniform() for tile in row]
+            assert sorted(tiles) == list(range(size * size))
+            assert permutation_parity(tiles, size) == goal_parity
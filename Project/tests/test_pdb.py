@@ -0,0 +1,30 @@
+from puzzle.state import PuzzleState, goal_board
+from puzzle.algorithms import ida_star
+from puzzle.distance_table import DistanceTable
+from puzzle.generator import BoardGenerator
+from puzzle.heuristics import manhattan_distance
+from puzzle.pdb import load_pdb_heuristic
+
+GOAL = PuzzleState(goal_board(3))
+
+
+def test_pdb_is_admissible_and_dominates_manhattan(tmp_path):
+    # Las PDB se construyen en un directorio temporal; la tabla da la distancia real
+    pdb = load_pdb_heuristic(3, directory=str(tmp_path))
+    table = DistanceTable(GOAL)
+    generator = BoardGenerator(3, seed=9)
+    try:
+        for board in generator.boards(500):
+            state = PuzzleState(board)
+            h = pdb(state, GOAL)
+            assert manhattan_distance(state, GOAL) <= h <= table.distance(state)
+            # Valor incremental en un hijo = valor calculado desde cero
+            for child in state.get_neighbors():
+                assert pdb(child, GOAL) == pdb(PuzzleState(child.board), GOAL)
+        for board in generator.boards(10):
+            state = PuzzleState(board)
+            path = ida_star(state, GOAL, pdb).path
+            assert len(path) - 1 == table.distance(state)
+    finally:
+        generator.close()
+        table.close()
@@ -0,0 +1,29 @@
+import random
+
+from puzzle.state import BITS, MASK, PuzzleState
+from puzzle.ranking import NUM_STATES, child_rank, parity, rank, unrank
+from puzzle.generator import BoardGenerator
+
+
+def test_unrank_rank_round_trip():
+    # Cada índice de las dos clases de paridad da un tablero de esa clase y vuelve a sí mismo
+    rng = random.Random(2)
+    indices = [0, NUM_STATES - 1] + rng.sample(range(NUM_STATES), 3000)
+    for wanted in (0, 1):
+        seen = set()
+        for index in indices:
+            packed, blank = unrank(index, wanted)
+            assert parity(packed) == wanted
+            assert (packed >> (blank * BITS)) & MASK == 0
+            assert rank(packed) == index
+            seen.add(packed)
+        assert len(seen) == len(set(indices))
+
+
+def test_child_rank_matches_rank():
+    generator = BoardGenerator(3, seed=5)
+    for board in generator.boards(200):
+        state = PuzzleState(board)
+        state_rank = rank(state.packed)
+        for child in state.get_neighbors(link_parent=False):
+            assert child_rank(state_rank, state.blank, child) == rank(child.packed)
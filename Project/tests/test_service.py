@@ -0,0 +1,35 @@
+import asyncio
+from service import SolverService, is_loopback
+
+HARD = [[8, 6, 7], [2, 5, 4], [3, 0, 1]]
+
+
+def _solve_twice(job):
+    async def run():
+        service = SolverService(workers=1)
+        try:
+            first = await service.solve(job)
+            second = await service.solve(job)
+        finally:
+            service.close()
+        return first, second, service.counts
+    return asyncio.run(run())
+
+
+def test_stopped_results_are_not_cached():
+    (first, _), (second, source), counts = _solve_twice({"board": HARD, "algorithm": "bfs", "max_nodes": 10})
+    assert first["stopped"] == "nodes" and not first["solved"]
+    assert source == "computed" and second["stopped"] == "nodes"
+    # Dos búsquedas terminadas, ninguna con camino
+    assert counts["computed"] == 2 and counts["solved"] == 0
+
+
+def test_completed_results_are_cached():
+    (first, _), (_, source), counts = _solve_twice({"board": HARD, "algorithm": "a_star"})
+    assert first["solved"] and source == "cache"
+    assert counts["computed"] == counts["solved"] == counts["cache_hits"] == 1
+
+
+def test_loopback_hosts():
+    assert is_loopback("127.0.0.1") and is_loopback("::1") and is_loopback("localhost")
+    assert not is_loopback("0.0.0.0") and not is_loopback("192.168.1.10")
@@ -0,0 +1,40 @@
+import pytest
+
+from puzzle.state import PuzzleState, goal_board
+from puzzle.algorithms import sma_star
+from puzzle.distance_table import DistanceTable
+from puzzle.generator import BoardGenerator
+from puzzle.heuristics import manhattan_distance
+from utils import SearchBudget
+
+GOAL = PuzzleState(goal_board(3))
+
+
+def boards(depth, count=3):
+    generator = BoardGenerator(3, seed=depth)
+    try:
+        return [PuzzleState(generator.at_depth(depth)) for _ in range(count)]
+    finally:
+        generator.close()
+
+
+@pytest.mark.parametrize("depth, max_nodes", [(4, 3), (4, 4), (6, 6), (8, 7), (8, 8), (10, 10)])
+def test_fails_when_the_path_does_not_fit(depth, max_nodes):
+    # Con max_nodes <= profundidad el camino no cabe: debe terminar sin solución, no
+    # agotar el presupuesto
+    for initial in boards(depth):
+        result = sma_star(initial, GOAL, manhattan_distance, max_nodes=max_nodes,
+                          budget=SearchBudget(max_nodes=50000))
+        assert result.path is None and result.stopped is None
+
+
+@pytest.mark.parametrize("depth, max_nodes", [(8, 9), (12, 13), (16, 40), (20, 2000)])
+def test_optimal_when_the_path_fits(depth, max_nodes):
+    table = DistanceTable(GOAL)
+    try:
+        for initial in boards(depth):
+            result = sma_star(initial, GOAL, manhattan_distance, max_nodes=max_nodes)
+            assert result.path[0] == initial and result.path[-1] == GOAL
+            assert len(result.path) - 1 == table.distance(initial) == depth
+    finally:
+        table.close()
@@ -0,0 +1,29 @@
+import jobs
+from puzzle.state import PuzzleState, goal_board
+from puzzle.algorithms import a_star, bfs, ida_star
+from puzzle.heuristics import linear_conflict, manhattan_distance
+from puzzle.solution_cache import SolutionCache
+
+# linear_conflict sobrestima aquí: A* da 23 movimientos y el óptimo es 21
+BOARD = [[8, 5, 3], [1, 6, 7], [4, 0, 2]]
+OPTIMAL = 21
+
+
+def test_inadmissible_run_does_not_poison_the_cache():
+    cache = SolutionCache()
+    initial, goal = PuzzleState(BOARD), PuzzleState(goal_board(3))
+    first = a_star(initial, goal, linear_conflict, cache=cache)
+    assert len(first.path) - 1 > OPTIMAL
+    assert cache.path_from(initial, goal) is None
+    assert len(bfs(initial, goal, cache=cache).path) - 1 == OPTIMAL
+    cached = ida_star(initial, goal, manhattan_distance, cache=cache, admissible=True)
+    assert len(cached.path) - 1 == OPTIMAL and cached.nodes_expanded == 0
+
+
+def test_jobs_cache_after_inadmissible_heuristic():
+    jobs.SOLUTION_CACHE = SolutionCache()
+    first = jobs.solve_job({"board": BOARD, "algorithm": "a_star", "heuristic": "linear_conflict"})
+    assert first["steps"] > OPTIMAL
+    assert jobs.solve_job({"board": BOARD, "algorithm": "bfs"})["steps"] == OPTIMAL
+    again = jobs.solve_job({"board": BOARD, "algorithm": "ida_star", "heuristic": "manhattan"})
+    assert again["steps"] == OPTIMAL and again["nodes"] == 0
@@ -0,0 +1,56 @@
+import jobs
+import time
+import random
+from utils import BucketQueue, IndexedMinHeap
+
+
+def test_bucket_queue_matches_heap():
+    # Mismas prioridades que IndexedMinHeap con inserciones, mejoras y extracciones mezcladas
+    rng = random.Random(1)
+    for prefer_high_g in (True, False):
+        buckets = BucketQueue(prefer_high_g)
+        heap = IndexedMinHeap(prefer_high_g)
+        for step in range(5000):
+            if rng.random() < 0.6:
+                key = rng.randrange(500)
+                g = rng.randrange(40)
+                f = g + rng.randrange(10)
+                assert buckets.push(key, key, f, g) == heap.push(key, key, f, g)
+            elif not heap.is_empty():
+                # Con empates el orden puede variar: se saca del montículo la misma clave
+                _, _, f, g = heap.peek()
+                key, _, bucket_f, bucket_g = buckets.pop()
+                assert (bucket_f, bucket_g) == (f, g) == heap.get(key)[1:]
+                heap.remove(key)
+            assert len(buckets) == len(heap)
+
+
+def _pop_time(queue, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        queue.pop()
+    return time.perf_counter() - start
+
+
+def test_bucket_queue_deep_single_f_pops_stay_flat():
+    # BFS con f == g: un único f con g creciente. Los buckets vaciados no se vuelven a
+    # recorrer, así que las últimas extracciones cuestan lo mismo que las primeras.
+    depth, chunk = 20000, 1000
+    queue = BucketQueue(prefer_high_g=False)
+    for g in range(depth):
+        queue.push(g, g, 0, g)
+    first = _pop_time(queue, chunk)
+    _pop_time(queue, depth - 2 * chunk)
+    last = _pop_time(queue, chunk)
+    assert queue.is_empty()
+    assert last < 5 * first + 0.01
+
+
+def test_metered_heuristic_reports_time():
+    # El evaluador incremental de IDA* también cuenta; sin "metered" no se mide
+    board = [[8, 5, 3], [1, 6, 7], [4, 0, 2]]
+    for algorithm in ("a_star", "ida_star"):
+        job = {"board": board, "algorithm": algorithm, "cache": False}
+        assert jobs.solve_job(job)["stats"]["heuristic_time"] is None
+        stats = jobs.solve_job(dict(job, metered=True))["stats"]
+        assert stats["heuristic_time"] > 0 and stats["heuristic_calls"] > 0
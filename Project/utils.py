@@ -1,27 +1,17 @@
-import sys, traceback
-import heapq
+# Utilidades sin interfaz gráfica: los algoritmos, jobs.py y los procesos de trabajo las
+# importan sin cargar Kivy (el manejo de errores con Popup está en main.py)
+import os, sys, time
+import tracemalloc
 from collections import deque
-from kivy.uix.popup import Popup
-from kivy.uix.label import Label
-
-# Manejo de errores con Popup
-def excepthook(exc_type, exc_value, exc_traceback):
-    error_text = "".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
-    popup = Popup(
-        title="Error en la app",
-        content=Label(text=error_text, font_size="12sp"),
-        size_hint=(0.95, 0.95),
-        auto_dismiss=True
-    )
-    popup.open()
-
-sys.excepthook = excepthook
 
 # Estructuras de datos
 class Stack:
     def __init__(self):
         self.items = []
     
+    def __len__(self):
+        return len(self.items)
+    
     def push(self, item):
         self.items.append(item)
     
@@ -35,6 +25,9 @@ class Queue:
     def __init__(self):
         self.items = deque()
     
+    def __len__(self):
+        return len(self.items)
+    
     def enqueue(self, item):
         self.items.append(item)
     
@@ -44,15 +37,504 @@ class Queue:
     def is_empty(self):
         return len(self.items) == 0
 
-class MinHeap:
-    def __init__(self):
-        self.heap = []
+class BitSet:
+    # Conjunto de enteros en [0, size) con un bit por elemento
+    def __init__(self, size):
+        self.bits = bytearray((size + 7) >> 3)
     
-    def push(self, item):
-        heapq.heappush(self.heap, item)
-    
-    def pop(self):
-        return heapq.heappop(self.heap) if self.heap else None
+    def add(self, index):
+        self.bits[index >> 3] |= 1 << (index & 7)
     
+    def __contains__(self, index):
+        return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+class IndexedMinHeap:
+    # Montículo binario indexado por clave (p. ej. el tablero empaquetado) con
+    # decrease-key: cada clave aparece una sola vez. La prioridad es (f, g, orden de
+    # llegada), con g negado si prefer_high_g, así que nunca se comparan los elementos.
+    # Cada entrada es [f, g ordenado, orden, clave, elemento, g].
+    def __init__(self, prefer_high_g=True):
+        self.heap = []
+        self.index = {}
+        self.counter = 0
+        self.g_sign = -1 if prefer_high_g else 1
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, key):
+        return key in self.index
+
     def is_empty(self):
         return len(self.heap) == 0
+
+    def get(self, key):
+        # (elemento, f, g) de una clave en el montículo, o None
+        position = self.index.get(key)
+        if position is None:
+            return None
+        entry = self.heap[position]
+        return entry[4], entry[0], entry[5]
+
+    def push(self, key, item, f, g=0):
+        # Inserta la clave o, si ya está, baja su prioridad cuando la nueva es mejor.
+        # Devuelve True si el montículo cambió.
+        position = self.index.get(key)
+        if position is None:
+            entry = [f, self.g_sign * g, self.counter, key, item, g]
+            self.counter += 1
+            self.heap.append(entry)
+            self.index[key] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return True
+        entry = self.heap[position]
+        if (f, self.g_sign * g) >= (entry[0], entry[1]):
+            return False
+        entry[0], entry[1], entry[4], entry[5] = f, self.g_sign * g, item, g
+        self._sift_up(position)
+        return True
+
+    def update(self, key, item, f, g=0):
+        # Fija la prioridad de la clave aunque empeore (inserta si no está)
+        position = self.index.get(key)
+        if position is None:
+            self.push(key, item, f, g)
+            return
+        entry = self.heap[position]
+        entry[0], entry[1], entry[4], entry[5] = f, self.g_sign * g, item, g
+        self._sift_up(position)
+        self._sift_down(self.index[key])
+
+    def items(self):
+        # (clave, elemento, f, g) de todas las entradas, sin orden
+        return [(entry[3], entry[4], entry[0], entry[5]) for entry in self.heap]
+
+    def peek(self):
+        # (clave, elemento, f, g) de la entrada mínima sin sacarla, o None
+        if not self.heap:
+            return None
+        entry = self.heap[0]
+        return entry[3], entry[4], entry[0], entry[5]
+
+    def pop(self):
+        # Saca la entrada mínima como (clave, elemento, f, g), o None si está vacío
+        if not self.heap:
+            return None
+        entry = self.heap[0]
+        self._remove_at(0)
+        return entry[3], entry[4], entry[0], entry[5]
+
+    def remove(self, key):
+        position = self.index.get(key)
+        if position is not None:
+            self._remove_at(position)
+
+    def _remove_at(self, position):
+        heap = self.heap
+        del self.index[heap[position][3]]
+        last = heap.pop()
+        if position < len(heap):
+            heap[position] = last
+            self.index[last[3]] = position
+            self._sift_up(position)
+            self._sift_down(self.index[last[3]])
+
+    def _sift_up(self, position):
+        heap, index = self.heap, self.index
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            parent_entry = heap[parent]
+            if entry < parent_entry:
+                heap[position] = parent_entry
+                index[parent_entry[3]] = position
+                position = parent
+            else:
+                break
+        heap[position] = entry
+        index[entry[3]] = position
+
+    def _sift_down(self, position):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and heap[right] < heap[child]:
+                child = right
+            child_entry = heap[child]
+            if child_entry < entry:
+                heap[position] = child_entry
+                index[child_entry[3]] = position
+                position = child
+            else:
+                break
+        heap[position] = entry
+        index[entry[3]] = position
+
+
+class BucketQueue:
+    # Cola de prioridad para f y g enteras no negativas (costes unitarios, heurísticas
+    # enteras): buckets[f][g] es una cola de entradas, así que insertar es O(1) y sacar
+    # solo avanza el puntero min_f. Misma interfaz que IndexedMinHeap; al mejorar una
+    # clave la entrada vieja se marca como muerta y se descarta al llegar a ella.
+    # Cada entrada es [f, g, clave, elemento, viva].
+    # buckets[f][g] es None hasta que se usa. Con prefer_high_g, los buckets vacíos del
+    # final de buckets[f] se quitan; sin él, low_g[f] es el menor g que puede tener
+    # entradas, así que los vaciados no se vuelven a recorrer (en BFS, con f == g, cada
+    # f tiene un único bucket a profundidad f).
+    def __init__(self, prefer_high_g=True, lifo=False):
+        self.buckets = []
+        self.low_g = []
+        self.index = {}
+        self.min_f = 0
+        self.prefer_high_g = prefer_high_g
+        self.lifo = lifo
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def is_empty(self):
+        return not self.index
+
+    def _better(self, f, g, entry):
+        if f != entry[0]:
+            return f < entry[0]
+        return g > entry[1] if self.prefer_high_g else g < entry[1]
+
+    def get(self, key):
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        return entry[3], entry[0], entry[1]
+
+    def push(self, key, item, f, g=0):
+        entry = self.index.get(key)
+        if entry is not None:
+            if not self._better(f, g, entry):
+                return False
+            entry[4] = False
+        self._insert(key, item, f, g)
+        return True
+
+    def update(self, key, item, f, g=0):
+        entry = self.index.get(key)
+        if entry is not None:
+            entry[4] = False
+        self._insert(key, item, f, g)
+
+    def remove(self, key):
+        entry = self.index.pop(key, None)
+        if entry is not None:
+            entry[4] = False
+
+    def _insert(self, key, item, f, g):
+        buckets = self.buckets
+        while len(buckets) <= f:
+            buckets.append([])
+            self.low_g.append(sys.maxsize)
+        by_g = buckets[f]
+        if len(by_g) <= g:
+            by_g.extend([None] * (g + 1 - len(by_g)))
+        bucket = by_g[g]
+        if bucket is None:
+            bucket = by_g[g] = deque()
+        entry = [f, g, key, item, True]
+        bucket.append(entry)
+        self.index[key] = entry
+        if f < self.min_f:
+            self.min_f = f
+        if g < self.low_g[f]:
+            self.low_g[f] = g
+
+    def _first(self):
+        # Cola con la primera entrada viva (descartando muertas), o None si está vacío
+        if not self.index:
+            return None
+        buckets = self.buckets
+        while True:
+            f = self.min_f
+            by_g = buckets[f]
+            if self.prefer_high_g:
+                while by_g:
+                    bucket = by_g[-1]
+                    while bucket:
+                        entry = bucket[-1] if self.lifo else bucket[0]
+                        if entry[4]:
+                            return bucket
+                        if self.lifo:
+                            bucket.pop()
+                        else:
+                            bucket.popleft()
+                    by_g.pop()
+            else:
+                low_g = self.low_g
+                while low_g[f] < len(by_g):
+                    bucket = by_g[low_g[f]]
+                    while bucket:
+                        entry = bucket[-1] if self.lifo else bucket[0]
+                        if entry[4]:
+                            return bucket
+                        if self.lifo:
+                            bucket.pop()
+                        else:
+                            bucket.popleft()
+                    low_g[f] += 1
+            self.min_f += 1
+
+    def peek(self):
+        bucket = self._first()
+        if bucket is None:
+            return None
+        entry = bucket[-1] if self.lifo else bucket[0]
+        return entry[2], entry[3], entry[0], entry[1]
+
+    def pop(self):
+        bucket = self._first()
+        if bucket is None:
+            return None
+        entry = bucket.pop() if self.lifo else bucket.popleft()
+        del self.index[entry[2]]
+        return entry[2], entry[3], entry[0], entry[1]
+
+
+def make_open_list(kind="bucket", integer=True, prefer_high_g=True):
+    # "bucket" usa BucketQueue si las prioridades son enteras; si no (p. ej. la distancia
+    # euclídea) o con "heap" se usa IndexedMinHeap
+    if kind not in ("bucket", "heap"):
+        raise ValueError(f"Lista abierta desconocida: {kind}")
+    if kind == "bucket" and integer:
+        return BucketQueue(prefer_high_g)
+    return IndexedMinHeap(prefer_high_g)
+
+
+# Presupuestos de búsqueda
+def process_memory():
+    # Memoria residente del proceso en bytes (0 si el sistema no la expone)
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Sin /proc solo se conoce el máximo (KiB en Linux, bytes en macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class SearchProgress:
+    # Estado de una búsqueda en un punto de comprobación. bound es la cota o la f que se
+    # está expandiendo (None si no aplica) y best_h la menor h vista hasta ahora.
+    __slots__ = ("nodes", "elapsed", "open_size", "bound", "best_h")
+
+    def __init__(self, nodes, elapsed, open_size=None, bound=None, best_h=None):
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.open_size = open_size
+        self.bound = bound
+        self.best_h = best_h
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+class SearchBudget:
+    # Límites de una búsqueda (expansiones, segundos, bytes) y token de cancelación.
+    # Las búsquedas no lo consultan en cada nodo: llaman a check(nodos, ...) solo al
+    # llegar a la expansión que indica next_check (cada check_every, o justo en
+    # max_nodes). Si hay progress, check lo llama con un SearchProgress, así que el
+    # progreso llega cada check_every expansiones sin coste por nodo. Al agotarse el
+    # presupuesto, check devuelve True y la búsqueda devuelve un resultado parcial
+    # (camino None con los nodos y el tiempo hasta entonces); reason queda en
+    # "cancelled", "nodes", "time" o "memory". El reloj y la memoria de referencia se
+    # toman al crearlo: max_bytes limita cuánto crece la memoria del proceso desde entonces.
+    def __init__(self, max_nodes=None, max_seconds=None, max_bytes=None, check_every=1024,
+                 progress=None):
+        self.max_nodes = max_nodes
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.check_every = check_every
+        self.progress = progress
+        self.cancelled = False
+        self.reason = None
+        self.start_time = time.perf_counter()
+        self.base_bytes = process_memory() if max_bytes is not None else 0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def cancel(self):
+        # Se puede llamar desde otro hilo: la búsqueda para en la siguiente comprobación
+        self.cancelled = True
+
+    def next_check(self, nodes):
+        check = nodes + self.check_every
+        if self.max_nodes is not None and self.max_nodes < check:
+            return max(self.max_nodes, nodes)
+        return check
+
+    def check(self, nodes, open_size=None, bound=None, best_h=None):
+        # Informa del progreso y devuelve True si la búsqueda debe parar
+        if self.progress is not None:
+            inf = float('inf')
+            self.progress(SearchProgress(nodes, self.elapsed, open_size,
+                                         None if bound == inf else bound,
+                                         None if best_h == inf else best_h))
+        if self.cancelled:
+            self.reason = "cancelled"
+        elif self.max_nodes is not None and nodes >= self.max_nodes:
+            self.reason = "nodes"
+        elif self.max_seconds is not None and self.elapsed >= self.max_seconds:
+            self.reason = "time"
+        elif self.max_bytes is not None and process_memory() - self.base_bytes >= self.max_bytes:
+            self.reason = "memory"
+        else:
+            return False
+        return True
+
+def budget_checkpoint(budget):
+    # Primera expansión en que consultar el presupuesto: antes de la primera (así una
+    # búsqueda ya cancelada no expande nada), o nunca si no hay presupuesto
+    return 0 if budget is not None else sys.maxsize
+
+
+# Estadísticas de búsqueda
+class SearchStats:
+    # Resultado de una búsqueda: el camino y sus contadores. Se desempaqueta como la
+    # tupla de siempre, path, nodes, exec_time = a_star(...), con el tiempo de reloj.
+    # Las búsquedas cuentan en variables locales y las copian con count() al terminar;
+    # lo que un algoritmo no mide queda en None. heuristic_time solo se mide con un
+    # MeteredHeuristic y peak_memory solo si tracemalloc está activo. suboptimality es
+    # la cota probada coste / óptimo de las búsquedas anytime (ARA*).
+    __slots__ = ("path", "nodes_expanded", "nodes_generated", "duplicates", "reexpansions",
+                 "peak_open", "peak_closed", "heuristic_calls", "heuristic_time", "iterations",
+                 "wall_time", "cpu_time", "peak_memory", "suboptimality", "stopped",
+                 "_budget", "_heuristic", "_start", "_cpu_start", "_heuristic_start", "_memory_start")
+
+    def __init__(self, budget=None, heuristic=None):
+        self.path = None
+        self.nodes_expanded = 0
+        self.nodes_generated = None
+        self.duplicates = None
+        self.reexpansions = None
+        self.peak_open = None
+        self.peak_closed = None
+        self.heuristic_calls = None
+        self.heuristic_time = None
+        self.iterations = None
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_memory = None
+        self.suboptimality = None
+        self.stopped = None
+        self._budget = budget
+        self._heuristic = heuristic if isinstance(heuristic, MeteredHeuristic) else None
+        self._heuristic_start = self._heuristic.time if self._heuristic else 0.0
+        self._memory_start = None
+        if tracemalloc.is_tracing():
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def __iter__(self):
+        return iter((self.path, self.nodes_expanded, self.wall_time))
+
+    def __getitem__(self, index):
+        return (self.path, self.nodes_expanded, self.wall_time)[index]
+
+    def __repr__(self):
+        return f"SearchStats({self.as_dict()})"
+
+    def count(self, expanded, generated=None, duplicates=None, reexpansions=None, peak_open=None,
+              peak_closed=None, heuristic_calls=None, iterations=None):
+        self.nodes_expanded = expanded
+        self.nodes_generated = generated
+        self.duplicates = duplicates
+        self.reexpansions = reexpansions
+        self.peak_open = peak_open
+        self.peak_closed = peak_closed
+        self.heuristic_calls = heuristic_calls
+        self.iterations = iterations
+        return self
+
+    def finish(self, path):
+        # Cierra la medición y devuelve el propio objeto como resultado de la búsqueda
+        self.wall_time = time.perf_counter() - self._start
+        self.cpu_time = time.process_time() - self._cpu_start
+        self.path = path
+        if path is None and self._budget is not None:
+            self.stopped = self._budget.reason
+        if self._heuristic is not None:
+            self.heuristic_time = self._heuristic.time - self._heuristic_start
+        if self._memory_start is not None and tracemalloc.is_tracing():
+            self.peak_memory = max(0, tracemalloc.get_traced_memory()[1] - self._memory_start)
+        return self
+
+    def as_dict(self):
+        # Contadores en un dict (sin el camino), p. ej. para JSON
+        return {name: getattr(self, name) for name in self.__slots__
+                if name != "path" and not name.startswith("_")}
+
+class MeteredHeuristic:
+    # Envuelve una heurística para contar sus llamadas y el tiempo pasado en ella.
+    # Medir cada llamada cuesta más que la propia heurística del 8-puzzle, así que es
+    # para perfilar (benchmarks, "metered" en jobs.py) y no para dejarlo siempre activo.
+    # El evaluador incremental de IDA* se envuelve también, y el resto de atributos
+    # (PDB, tamaño...) se leen de la heurística original.
+    def __init__(self, heuristic):
+        self.heuristic = heuristic
+        self.calls = 0
+        self.time = 0.0
+        self.__name__ = getattr(heuristic, "__name__", type(heuristic).__name__)
+        evaluator = getattr(heuristic, "evaluator", None)
+        self.evaluator = _MeteredEvaluator(self, evaluator) if evaluator is not None else None
+
+    def __call__(self, state, goal):
+        self.calls += 1
+        start = time.perf_counter()
+        value = self.heuristic(state, goal)
+        self.time += time.perf_counter() - start
+        return value
+
+    def __getattr__(self, name):
+        # Solo llega aquí lo que el envoltorio no tiene; "heuristic" falta al deserializar
+        if name == "heuristic":
+            raise AttributeError(name)
+        return getattr(self.heuristic, name)
+
+
+class _MeteredEvaluator:
+    # Evaluador incremental (puzzle/ida.py) que cuenta en el MeteredHeuristic
+    def __init__(self, meter, evaluator):
+        self.meter = meter
+        self.evaluator = evaluator
+
+    def context(self, goal):
+        return self.evaluator.context(goal)
+
+    def full(self, tiles, table):
+        meter = self.meter
+        meter.calls += 1
+        start = time.perf_counter()
+        value = self.evaluator.full(tiles, table)
+        meter.time += time.perf_counter() - start
+        return value
+
+    def delta(self, tiles, cell_of, table, tile, source, target):
+        meter = self.meter
+        meter.calls += 1
+        start = time.perf_counter()
+        value = self.evaluator.delta(tiles, cell_of, table, tile, source, target)
+        meter.time += time.perf_counter() - start
+        return value